@@ -0,0 +1,218 @@
+"""
+Offline benchmark suite for the hot paths.
+
+    python -m benchmarks.run --out bench_results.json
+    python -m benchmarks.run --out new.json --compare bench_results.json --threshold 0.2
+
+Data is synthetic and seeded, exchanges are faked; nothing touches the network.
+Exits with status 1 when --compare finds a slowdown above the threshold.
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.fakes import FakeExchange, synthetic_frame, synthetic_ohlcv, to_rows
+from core.candles import CandleBuffer
+from core.exchange import BinanceClient
+from logic.backtest import run_backtest
+from logic.indicators import IndicatorEngine, IndicatorState, add_indicators
+from logic.resample import Resampler
+from logic.strategy import calculate_indicators, get_signal
+
+# No-spell-check: ZENVO
+
+SIZES = {'100': 100, '10k': 10_000, '1M': 1_000_000}
+
+
+def measure(func, number=1, repeat=5):
+    """Best-of-`repeat` seconds per call (the least noisy estimate)."""
+    func()  # warm caches / lazy imports
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def quiet_client(rows):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return BinanceClient(exchange=FakeExchange(rows))
+
+
+# --- BENCHMARKS ---
+
+def bench_indicators(quick):
+    results = {}
+    for label, n in SIZES.items():
+        if quick and n > 10_000:
+            continue
+        df = synthetic_frame(n)
+        number = 20 if n <= 10_000 else 1
+        results[f'add_indicators[{label}]'] = measure(lambda: add_indicators(df.copy()), number, 3)
+        results[f'calculate_indicators[{label}]'] = measure(lambda: calculate_indicators(df.copy()), number, 3)
+    return results
+
+
+def bench_signal(quick):
+    df = calculate_indicators(synthetic_frame(100))
+    return {'get_signal[100]': measure(lambda: get_signal(df), number=2000)}
+
+
+def bench_incremental(quick):
+    rows = to_rows(synthetic_ohlcv(2000))
+    state = IndicatorState()
+    state.feed(rows[:1000])
+    live = rows[1000]
+    return {'IndicatorState.update[tick]': measure(lambda: state.update(live), number=20_000)}
+
+
+def bench_resample(quick):
+    """One 1m tick fanned out to 1m/5m/15m/1h/4h buckets and their indicators."""
+    rows = to_rows(synthetic_ohlcv(3000))
+    resampler = Resampler(IndicatorEngine(), 'BTC/USDT', ['1m', '5m', '15m', '1h', '4h'])
+    resampler.feed(rows[:-1])
+    live = rows[-1]
+    return {'Resampler.update[5 tf tick]': measure(lambda: resampler.update(live), number=20_000)}
+
+
+def bench_candle_buffer(quick):
+    """The get_klines -> calculate_indicators -> get_signal path on a CandleBuffer instead of a DataFrame."""
+    rows = to_rows(synthetic_ohlcv(1000))
+    buffer = CandleBuffer(capacity=100)
+    calculate_indicators(buffer)
+    live = list(rows[-1])
+    buffer.extend(rows)
+    calculate_indicators(buffer)
+
+    def tick():
+        buffer.update(live)
+        calculate_indicators(buffer)
+        get_signal(buffer)
+
+    client = quiet_client(rows)
+    client_buffer = client.get_candles('BTC/USDT', '1m', CandleBuffer(capacity=100))
+    return {
+        'CandleBuffer.tick+signal[100]': measure(tick, number=2000),
+        'BinanceClient.get_candles[100]': measure(lambda: client.get_candles('BTC/USDT', '1m', client_buffer),
+                                                  number=200),
+    }
+
+
+def bench_get_klines(quick):
+    client = quiet_client(to_rows(synthetic_ohlcv(1000)))
+    return {'BinanceClient.get_klines[100]': measure(lambda: client.get_klines('BTC/USDT', '1m'), number=200)}
+
+
+def bench_run_bot(quick):
+    """Real run_bot loop, REST mode, zero poll interval, against the fake exchange."""
+    from main import run_bot
+
+    iterations = 500 if quick else 3000
+    rows = to_rows(synthetic_ohlcv(1000 + iterations))
+
+    class Instance:
+        bot_running = True
+
+    def once():
+        instance = Instance()
+        client = quiet_client(rows)
+        exchange = client.exchange
+        original = exchange.fetch_ohlcv
+
+        def fetch(*args, **kwargs):
+            if exchange.calls >= iterations:
+                instance.bot_running = False
+            return original(*args, **kwargs)
+
+        exchange.fetch_ohlcv = fetch
+        config = {'client': client, 'instance': instance, 'feed': 'rest', 'store_dir': None, 'journal_dir': None,
+                  'poll_interval': 0, 'symbol': 'BTC/USDT', 'timeframe': '1m'}
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_bot(config)
+
+    return {'run_bot.iteration': measure(once, number=1, repeat=3) / iterations}
+
+
+def bench_backtest(quick):
+    n = 100_000 if quick else 525_600
+    data = synthetic_ohlcv(n)
+    return {f'run_backtest[{n}]': measure(lambda: run_backtest(data), number=1, repeat=3)}
+
+
+BENCHMARKS = [bench_indicators, bench_signal, bench_incremental, bench_resample, bench_candle_buffer, bench_get_klines,
+              bench_run_bot, bench_backtest]
+
+
+# --- RUNNER ---
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+    }
+
+
+def compare(current, baseline, threshold):
+    """Prints the ratio per benchmark; returns the names slower than (1 + threshold)."""
+    regressions = []
+    for name, seconds in current.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        ratio = seconds / old
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  🐢 REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  🚀 FASTER"
+        print(f"   {name:<34} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zenvo hot-path benchmarks")
+    parser.add_argument('--out', default='bench_results.json', help="JSON file to write")
+    parser.add_argument('--compare', help="Previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown (0.2 = 20%%)")
+    parser.add_argument('--quick', action='store_true', help="Skip the largest inputs")
+    parser.add_argument('--filter', default='', help="Only run benchmarks whose function name contains this")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for bench in BENCHMARKS:
+        if args.filter not in bench.__name__:
+            continue
+        for name, seconds in bench(args.quick).items():
+            results[name] = seconds
+            print(f"⏱️ {name:<34} {seconds * 1e6:14.2f} µs")
+
+    with open(args.out, 'w') as f:
+        json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+    print(f"💾 Saved -> {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print(f"📊 Compared with {args.compare} (threshold {args.threshold:.0%})")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
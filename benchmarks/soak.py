@@ -0,0 +1,66 @@
+"""
+Soak test: the real run_bot loop over simulated days of candles on a virtual clock.
+
+    python -m benchmarks.soak --days 30 --decisions decisions.json
+    python -m benchmarks.soak --days 30 --compare decisions.json
+
+Reports throughput (iterations per second, speed-up vs real time) and the fills.
+--compare exits with status 1 when the fills differ from a previous run (same seed/options).
+"""
+import argparse
+import contextlib
+import io
+import json
+import sys
+
+from benchmarks.fakes import synthetic_ohlcv, to_rows
+from core.simulator import run_simulation
+
+# No-spell-check: ZENVO
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Zenvo soak test on the exchange simulator")
+    parser.add_argument('--days', type=float, default=30, help="Simulated days of 1m candles")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--poll-interval', type=float, help="Forming-candle cadence in virtual seconds")
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--partial-fills', type=float, default=0.0, help="Probability of a partial fill")
+    parser.add_argument('--sl', type=float, default=1.5)
+    parser.add_argument('--tp', type=float, default=3.0)
+    parser.add_argument('--decisions', help="Write the fills to this JSON file")
+    parser.add_argument('--compare', help="Fills JSON from a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    rows = to_rows(synthetic_ohlcv(1000 + int(args.days * 1440), seed=args.seed))
+    bot = {'sl': args.sl, 'tp': args.tp, 'poll_interval': args.poll_interval}
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = run_simulation(rows, bot, latency_ms=args.latency_ms, partial_fill_prob=args.partial_fills,
+                                seed=args.seed)
+
+    print(f"🧪 {report.virtual_seconds / 86400:.1f} simulated days in {report.wall_seconds:.1f} s "
+          f"({report.virtual_seconds / report.wall_seconds:,.0f}x real time)")
+    print(f"⚙️ {report.iterations:,} iterations | {report.iterations / report.wall_seconds:,.0f} it/s")
+    print(f"💼 {len(report.fills)} fills | balances {report.balances}")
+    print(report.metrics.summary_text())
+
+    fills = [list(fill) for fill in report.fills]
+    if args.decisions:
+        with open(args.decisions, 'w') as f:
+            json.dump(fills, f)
+        print(f"💾 Saved -> {args.decisions}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if fills != baseline:
+            diverged = next((i for i, (a, b) in enumerate(zip(fills, baseline)) if a != b),
+                            min(len(fills), len(baseline)))
+            print(f"🐢 DECISIONS CHANGED: first difference at fill #{diverged} "
+                  f"({len(fills)} fills vs {len(baseline)} in {args.compare})")
+            return 1
+        print(f"✅ Same {len(fills)} fills as {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
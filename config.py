@@ -8,10 +8,25 @@ load_dotenv()
 API_KEY = os.getenv('BINANCE_API_KEY') or ""
 SECRET_KEY = os.getenv('BINANCE_SECRET_KEY') or ""
 
+# Optional log file (terminal output is also appended here when set)
+LOG_FILE = os.getenv('ZENVO_LOG_FILE') or None
+
+# Metrics: local Prometheus endpoint port and summary dump interval (seconds), off when unset
+METRICS_PORT = int(os.getenv('ZENVO_METRICS_PORT') or 0) or None
+METRICS_SUMMARY_INTERVAL = int(os.getenv('ZENVO_METRICS_SUMMARY') or 0) or None
+
 # Market Parameters
 SYMBOL = 'BTC/USDT'
 TIMEFRAME = '1h'
 
+# Market Explorer pairs (high liquidity Binance Spot)
+MARKET_PAIRS = [
+    'BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'SOL/USDT', 'XRP/USDT',
+    'ADA/USDT', 'AVAX/USDT', 'DOGE/USDT', 'DOT/USDT', 'MATIC/USDT',
+    'LINK/USDT', 'SHIB/USDT', 'LTC/USDT', 'TRX/USDT', 'NEAR/USDT',
+    'ATOM/USDT', 'UNI/USDT', 'ICP/USDT', 'APT/USDT', 'OP/USDT'
+]
+
 # Strategy Parameters
 EMA_FAST = 50
 EMA_SLOW = 200
@@ -0,0 +1,137 @@
+import math
+
+import numpy as np
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+class CandleBuffer:
+    """
+    Fixed-capacity OHLCV buffer on preallocated NumPy columns.
+    The live candle is updated in place, a newer timestamp appends, and the oldest
+    candle drops out once `capacity` is reached. Columns are stored twice as long as
+    the capacity and compacted when the end is reached, so every window is a
+    contiguous zero-copy view (valid until the next update).
+    Indicator columns can be attached; each remembers how many leading rows are
+    still valid so indicator code only recomputes what changed.
+    It backs the DataFrame API (get_klines -> calculate_indicators -> get_signal) for
+    scripts and benchmarks; run_bot does not use it, its IndicatorState already costs
+    O(1) per tick without keeping candles.
+    """
+
+    def __init__(self, capacity=500):
+        self.capacity = capacity
+        self._data = {name: np.zeros(2 * capacity, dtype=np.int64 if name == 'timestamp' else np.float64)
+                      for name in COLUMNS}
+        self._valid = {}
+        self._inputs = {}
+        self.start = 0
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __contains__(self, name):
+        return name in self._data
+
+    def __getitem__(self, name):
+        return self._data[name][self.start:self.end]
+
+    @property
+    def live_ts(self):
+        return int(self._data['timestamp'][self.end - 1]) if self.end > self.start else None
+
+    # --- WRITE ---
+    def update(self, bar):
+        """
+        Feeds one OHLCV row. Same ts as the live candle -> in-place update,
+        newer ts -> append, older -> ignored. Returns True when a candle was appended.
+        """
+        live_ts = self.live_ts
+        ts = bar[0]
+        if live_ts is not None and ts < live_ts:
+            return False
+        appended = live_ts is None or ts > live_ts
+        if appended:
+            self._append_slot()
+        i = self.end - 1
+        for name, value in zip(COLUMNS, bar):
+            self._data[name][i] = value
+        if not appended:
+            live = len(self) - 1
+            for name, valid in self._valid.items():
+                if valid > live:
+                    self._valid[name] = live
+        return appended
+
+    def extend(self, bars):
+        """Feeds rows in order. Returns the number of candles appended."""
+        appended = 0
+        for bar in bars:
+            appended += self.update(bar)
+        return appended
+
+    def _append_slot(self):
+        if self.end == len(self._data['timestamp']):
+            # Compact: keep the newest capacity-1 rows at the front
+            keep = self.capacity - 1
+            for column in self._data.values():
+                column[:keep] = column[self.end - keep:self.end]
+            dropped = len(self) - keep
+            self.start, self.end = 0, keep
+            self._shift_valid(dropped)
+        self.end += 1
+        if len(self) > self.capacity:
+            self.start += 1
+            self._shift_valid(1)
+
+    def _shift_valid(self, dropped):
+        for name, valid in self._valid.items():
+            self._valid[name] = max(0, valid - dropped)
+
+    # --- INDICATOR COLUMNS ---
+    def column(self, name):
+        """Full-length view of an attached column, created (NaN, nothing valid) on first use."""
+        if name not in self._data:
+            self._data[name] = np.full(2 * self.capacity, math.nan)
+            self._valid[name] = 0
+        return self[name]
+
+    def valid(self, name):
+        """Number of leading rows of `name` that are still up to date."""
+        return self._valid.get(name, 0)
+
+    def bind(self, name, inputs):
+        """Records what `name` is computed from; different inputs than last time invalidate it."""
+        if self._inputs.get(name) != inputs:
+            self._inputs[name] = inputs
+            self._valid[name] = 0
+
+    def mark_valid(self, *names):
+        for name in names:
+            self._valid[name] = len(self)
+
+    # --- READ ---
+    def last(self, name, offset=1):
+        """Scalar from the `offset`-th newest row (1 = live candle)."""
+        return float(self._data[name][self.end - offset])
+
+    def window(self, n=None):
+        """Dict of zero-copy views over the last `n` rows (all columns)."""
+        lo = self.start if n is None else max(self.start, self.end - n)
+        return {name: column[lo:self.end] for name, column in self._data.items()}
+
+    def rows(self, n=None):
+        """Last `n` candles as ccxt-style rows."""
+        cols = self.window(n)
+        return [list(row) for row in zip(*(cols[name].tolist() for name in COLUMNS))]
+
+    def to_frame(self, n=None):
+        """get_klines()-style DataFrame (plus indicator columns); copies, so only build it on demand."""
+        import pandas as pd
+
+        cols = self.window(n)
+        df = pd.DataFrame({name: np.array(values) for name, values in cols.items() if not name.startswith('_')})
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        return df
@@ -1,5 +1,9 @@
+import time
+
 import ccxt
-import pandas as pd
+
+from core.markets import MarketCache
+from core.metrics import Metrics
 
 
 class BinanceClient:
@@ -8,50 +12,99 @@ class BinanceClient:
     Standardized for Testnet and Real accounts.
     """
 
-    def __init__(self, api_key="", secret_key="", mode="testnet"):
-        # adjustForTimeDifference prevents the common 'Timestamp for this request' error
-        self.exchange = ccxt.binance({
-            'apiKey': api_key,
-            'secret': secret_key,
-            'enableRateLimit': True,
-            'options': {
-                'defaultType': 'spot',
-                'adjustForTimeDifference': True
-            }
-        })
-
-        # Standardize mode check
-        if mode == "testnet":
-            self.exchange.set_sandbox_mode(True)
-            print("🌐 [SYSTEM] Connected to Binance TESTNET (Demo Mode)")
+    def __init__(self, api_key="", secret_key="", mode="testnet", markets_ttl=3600, metrics=None, exchange=None):
+        if exchange is not None:
+            # Pre-built ccxt-compatible exchange (fakes for benchmarks and simulations)
+            self.exchange = exchange
         else:
-            print("💰 [SYSTEM] Connected to Binance REAL ACCOUNT")
+            # adjustForTimeDifference prevents the common 'Timestamp for this request' error
+            self.exchange = ccxt.binance({
+                'apiKey': api_key,
+                'secret': secret_key,
+                'enableRateLimit': True,
+                'options': {
+                    'defaultType': 'spot',
+                    'adjustForTimeDifference': True
+                }
+            })
+
+            # Standardize mode check
+            if mode == "testnet":
+                self.exchange.set_sandbox_mode(True)
+                print("🌐 [SYSTEM] Connected to Binance TESTNET (Demo Mode)")
+            else:
+                print("💰 [SYSTEM] Connected to Binance REAL ACCOUNT")
+
+        # Per-stage timings; ccxt's own throttle sleep is recorded as rate-limit wait
+        self.metrics = metrics or Metrics()
+        if hasattr(self.exchange, 'throttle'):
+            self.exchange.throttle = self.metrics.wrap('ratelimit_wait', self.exchange.throttle)
+
+        # Market metadata is loaded once here and refreshed in the background,
+        # so the order path never waits on load_markets()
+        self.markets = MarketCache(self.exchange, ttl=markets_ttl)
+        try:
+            self.markets.start()
+        except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+            print(f"⚠️ [SYSTEM] Market metadata not loaded yet: {e}")
 
-    def create_order(self, symbol, side, amount_usd):
+    def close(self):
+        """Stops the market metadata refresh thread."""
+        self.markets.stop()
+
+    def create_order(self, symbol, side, amount_usd, price=None, signal_time=None, quantity=None):
         """
         Executes a market order by converting USD amount to crypto quantity.
         Uses exchange precision rules to avoid LOT_SIZE errors.
+        `quantity` (base asset) takes precedence over `amount_usd`, e.g. to sell exactly what was bought.
+        `price` is the latest price known to the engine; the ticker is only fetched without it.
+        `signal_time` (time.perf_counter()) enables the signal -> submit latency metric.
+        Blocking; run_bot goes through core.orders.OrderExecutor instead.
         """
         try:
-            self.exchange.load_markets()
-            ticker = self.exchange.fetch_ticker(symbol)
-            current_price = ticker['last']
+            current_price = price
+            if not current_price:
+                with self.metrics.timer('order_ticker'):
+                    current_price = self.exchange.fetch_ticker(symbol)['last']
 
-            if side == 'buy':
-                raw_amount = float(amount_usd) / current_price
-            else:
-                raw_amount = float(amount_usd)
+            raw_amount = quantity if quantity is not None else float(amount_usd) / current_price
 
-            # Normalizes amount according to Binance precision rules
-            precise_amount = self.exchange.amount_to_precision(symbol, raw_amount)
+            # Normalizes amount according to Binance precision rules (local, cached)
+            precise_amount = self.markets.normalize_amount(symbol, raw_amount, current_price)
 
-            self.exchange.create_order(symbol, 'market', side, precise_amount)
+            if signal_time is not None:
+                self.metrics.observe('signal_submit', time.perf_counter() - signal_time)
+            with self.metrics.timer('order_submit'):
+                self.exchange.create_order(symbol, 'market', side, precise_amount)
             return True
 
-        except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+        except (ccxt.NetworkError, ccxt.ExchangeError, ValueError) as e:
             print(f"\n❌ Order Error: {e}")
             return False
 
+    def place_market_order(self, symbol, side, quantity, client_order_id):
+        """
+        Submits a market order for an already normalized base `quantity` under a caller-chosen
+        newClientOrderId, so a retry can be matched to the first attempt. Returns the ccxt order.
+        """
+        with self.metrics.timer('order_submit'):
+            return self.exchange.create_order(symbol, 'market', side, quantity,
+                                              params={'newClientOrderId': client_order_id})
+
+    def find_order(self, symbol, client_order_id):
+        """Order placed under `client_order_id`, or None if the exchange never received it."""
+        try:
+            return self.exchange.fetch_order(None, symbol, params={'origClientOrderId': client_order_id})
+        except ccxt.OrderNotFound:
+            return None
+
+    def latency_summary(self, metrics=None):
+        """Signal -> submit latency in ms: (last, p50, worst) or None. `metrics`: a bot's own registry."""
+        hist = (metrics or self.metrics).histograms.get('signal_submit')
+        if hist is None or not hist.count:
+            return None
+        return hist.recent[-1] * 1000, hist.percentile(50) * 1000, hist.max * 1000
+
     def get_balance(self, asset="USDT"):
         """Fetches the free balance of a specific asset."""
         try:
@@ -60,10 +113,64 @@ class BinanceClient:
         except Exception as e:
             raise e
 
+    def get_ohlcv(self, symbol, timeframe, limit=100, since=None):
+        """Fetches raw OHLCV rows [ts, open, high, low, close, volume] (oldest first)."""
+        with self.metrics.timer('fetch_ohlcv'):
+            return self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+
+    def server_time_ms(self):
+        """Local clock corrected by the offset measured through adjustForTimeDifference."""
+        return self.exchange.milliseconds() - self.exchange.options.get('timeDifference', 0)
+
+    def used_weight(self):
+        """Request weight used in the current minute, from the last response header (None if unknown)."""
+        headers = getattr(self.exchange, 'last_response_headers', None) or {}
+        used = headers.get('x-mbx-used-weight-1m') or headers.get('X-MBX-USED-WEIGHT-1M')
+        return int(used) if used is not None else None
+
+    def sync_history(self, store, symbol, timeframe, since=None, limit=1000):
+        """
+        Downloads only the closed candles missing from `store` (paginated `since=` fetches).
+        An empty store is filled from `since`. Returns the number of candles appended.
+        """
+        tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        last = store.last_timestamp(symbol, timeframe)
+        cursor = last + tf_ms if last is not None else since
+        if cursor is None:
+            cursor = self.server_time_ms() - limit * tf_ms
+
+        added = 0
+        while True:
+            bars = self.get_ohlcv(symbol, timeframe, limit=limit, since=cursor)
+            now = self.server_time_ms()
+            closed = [bar for bar in bars or [] if bar[0] + tf_ms <= now]
+            if not closed:
+                break
+            added += store.append(symbol, timeframe, closed)
+            cursor = closed[-1][0] + tf_ms
+            if len(bars) < limit:
+                break
+        return added
+
+    def get_candles(self, symbol, timeframe, buffer):
+        """
+        Keeps a CandleBuffer current: fills it on first use, afterwards fetches only
+        from the live candle onwards. Returns the buffer (no DataFrame is built).
+        """
+        if buffer.live_ts is None:
+            bars = self.get_ohlcv(symbol, timeframe, limit=buffer.capacity)
+        else:
+            bars = self.get_ohlcv(symbol, timeframe, limit=None, since=buffer.live_ts)
+        buffer.extend(bars or [])
+        return buffer
+
     def get_klines(self, symbol, timeframe):
         """Fetches OHLCV data and returns a formatted DataFrame."""
-        bars = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=100)
-        df = pd.DataFrame(bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df.set_index('timestamp', inplace=True)
+        import pandas as pd  # Only this legacy path needs pandas; keeps engine start-up light
+
+        bars = self.get_ohlcv(symbol, timeframe, limit=100)
+        with self.metrics.timer('dataframe'):
+            df = pd.DataFrame(bars, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df.set_index('timestamp', inplace=True)
         return df
\ No newline at end of file
@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import namedtuple
+
+from core.scanner import kline_weight
+from logic.indicators import IndicatorState
+from logic.resample import bucket_start, timeframe_ms
+from logic.strategy import rebound_signal
+
+# One explorer row as the GUI shows it; numbers are None until known
+Quote = namedtuple('Quote', ['pair', 'last', 'change_pct', 'rsi', 'ema9', 'signal'])
+
+# Binance /api/v3/ticker/24hr request weight by number of symbols (1-20, 21-100, more)
+TICKER_WEIGHTS = ((20, 2), (100, 40))
+TICKER_WEIGHT_ALL = 80
+CANDLE_LIMIT = 100  # Candles read per (re)load: enough to warm RSI 14 / EMA 9
+
+
+def tickers_weight(count):
+    return next((weight for limit, weight in TICKER_WEIGHTS if count <= limit), TICKER_WEIGHT_ALL)
+
+
+def signal_state(rsi, price, ema9, rsi_threshold=40.0):
+    """'BUY' (run_bot's entry), 'OVERSOLD' (RSI low, price still under EMA 9) or ''."""
+    if rsi is None or ema9 is None or price is None or rsi != rsi:
+        return ''
+    if rebound_signal(rsi, price, ema9, rsi_threshold):
+        return 'BUY'
+    return 'OVERSOLD' if rsi <= rsi_threshold else ''
+
+
+class MarketExplorer:
+    """
+    Live prices, 24h change and the RSI / EMA 9 signal state of many pairs, kept
+    current by one background thread:
+    - One batched fetch_tickers() per cycle for every pair; the cycle is stretched so
+      the explorer stays within `weight_budget` request weight per minute (the rest is
+      left to the bots).
+    - Indicators: each pair is warmed once from its candles, then the ticker's last
+      price moves its live candle (a new candle starts at each timeframe boundary).
+      A few pairs per cycle are re-read from candles to cancel the drift; pairs in
+      focus() (the rows on screen) go first.
+    Readers call changes() from any thread: only rows that changed since their last call.
+    """
+
+    def __init__(self, pairs, timeframe='1m', interval=2.0, weight_budget=300, candles_per_cycle=2,
+                 resync_every=600, rsi_threshold=40.0, exchange=None):
+        self.pairs = list(pairs)
+        self.timeframe = timeframe
+        self.interval = interval
+        self.weight_budget = weight_budget
+        self.candles_per_cycle = candles_per_cycle
+        self.resync_every = resync_every
+        self.rsi_threshold = rsi_threshold
+        self.exchange = exchange
+        self.quotes = {pair: Quote(pair, None, None, None, None, '') for pair in self.pairs}
+        self.version = 0
+        self.errors = 0
+        self.last_error = None
+        self._listed = None
+        self._versions = dict.fromkeys(self.pairs, 0)
+        self._states = {}
+        self._synced = {}
+        self._focus = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- CONTROL (any thread) ---
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def focus(self, pairs):
+        """Pairs currently visible; their candles are loaded before the others."""
+        self._focus = list(pairs)
+
+    def set_timeframe(self, timeframe):
+        with self._lock:
+            if timeframe != self.timeframe:
+                self.timeframe = timeframe
+                self._states = {}
+                self._synced = {}
+
+    def changes(self, since):
+        """(version, {pair: Quote}) of the rows updated after `since` (a version from a previous call)."""
+        with self._lock:
+            return self.version, {pair: self.quotes[pair] for pair, version in self._versions.items()
+                                  if version > since}
+
+    @property
+    def cycle_seconds(self):
+        candles = self.candles_per_cycle * kline_weight(CANDLE_LIMIT)
+        weight = tickers_weight(len(self._listed or self.pairs)) + candles
+        return max(self.interval, weight * 60 / self.weight_budget)
+
+    # --- BACKGROUND THREAD ---
+    def _connect(self):
+        if self.exchange is None:
+            # Public market data only, no credentials needed
+            import ccxt
+            self.exchange = ccxt.binance({'enableRateLimit': True, 'options': {'defaultType': 'spot'}})
+        if self._listed is None:
+            # A delisted pair would fail the whole batch: ask only for listed ones
+            markets = self.exchange.load_markets() if hasattr(self.exchange, 'load_markets') else None
+            self._listed = [pair for pair in self.pairs if markets is None or pair in markets]
+        return self.exchange
+
+    def _loop(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.poll_once()
+                self.last_error = None
+            except Exception as e:
+                self.errors += 1
+                if str(e) != self.last_error:  # Once per outage, not every cycle
+                    print(f"\n⚠️ [EXPLORER] {e}")
+                self.last_error = str(e)
+            self._stop.wait(max(0.0, self.cycle_seconds - (time.monotonic() - started)))
+
+    def poll_once(self):
+        """One cycle: the batched tickers, then a few candle (re)loads."""
+        exchange = self._connect()
+        tickers = exchange.fetch_tickers(self._listed)
+        with self._lock:
+            tf = self.timeframe
+            # set_timeframe() replaces both: a reload finishing after it only touches the old ones
+            states, synced = self._states, self._synced
+        tf_ms = timeframe_ms(tf)
+        for pair in self._due(states, synced, tickers):
+            bars = exchange.fetch_ohlcv(pair, tf, limit=CANDLE_LIMIT)
+            if bars:
+                state = IndicatorState()
+                state.feed(bars)
+                states[pair] = state
+                synced[pair] = time.monotonic()
+
+        updates = {}
+        for pair in self.pairs:
+            ticker = tickers.get(pair)
+            if not ticker or ticker.get('last') is None:
+                continue
+            last = float(ticker['last'])
+            state = states.get(pair)
+            values = {}
+            if state is not None:
+                values = self._apply_tick(state, bucket_start(ticker.get('timestamp') or exchange.milliseconds(),
+                                                              tf_ms), last)
+            quote = Quote(pair, last, ticker.get('percentage'), values.get('rsi'), values.get('ema9'),
+                          signal_state(values.get('rsi'), last, values.get('ema9'), self.rsi_threshold))
+            updates[pair] = quote
+
+        with self._lock:
+            if self._states is not states:
+                return  # Timeframe changed meanwhile: these indicators are stale
+            self.version += 1
+            for pair, quote in updates.items():
+                if quote != self.quotes[pair]:
+                    self.quotes[pair] = quote
+                    self._versions[pair] = self.version
+
+    def _due(self, states, synced, tickers):
+        """Pairs whose candles should be (re)loaded this cycle: missing first, visible first."""
+        now = time.monotonic()
+        visible = set(self._focus)
+        order = sorted(tickers, key=lambda pair: (pair in states, pair not in visible, synced.get(pair, 0.0)))
+        due = [pair for pair in order if pair not in states or now - synced.get(pair, 0.0) >= self.resync_every]
+        return due[:self.candles_per_cycle]
+
+    @staticmethod
+    def _apply_tick(state, ts, last):
+        live = state.live_bar
+        if live is not None and live[0] == ts:
+            bar = [ts, live[1], max(live[2], last), min(live[3], last), last, live[5]]
+        else:
+            bar = [ts, last, last, last, last, 0.0]
+        return state.update(bar)
@@ -0,0 +1,283 @@
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.scheduler import PollScheduler
+from logic.resample import Resampler, timeframe_ms, timeframe_offset_ms
+
+# Row layout of the shared ring: candle + the indicator columns computed once by the feed
+FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'ema9', 'ema50', 'ema200', 'rsi', 'vol_avg')
+HEADER = 4  # int64 slots: seq, head, count, capacity
+
+
+class SharedCandleRing:
+    """
+    Fixed-capacity ring of candle + indicator rows in shared memory.
+    One writer, any number of readers in any process. A sequence counter
+    (odd while a write is in progress) lets readers detect torn reads.
+    """
+
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((HEADER,), dtype=np.int64, buffer=shm.buf)
+        capacity = int(self.header[3])
+        self.rows = np.ndarray((capacity, len(FIELDS)), dtype=np.float64, buffer=shm.buf, offset=HEADER * 8)
+
+    @classmethod
+    def create(cls, capacity=1024):
+        size = HEADER * 8 + capacity * len(FIELDS) * 8
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        header = np.ndarray((HEADER,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (0, -1, 0, capacity)
+        del header
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        return cls(shared_memory.SharedMemory(name=name))
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def seq(self):
+        return int(self.header[0])
+
+    # --- WRITER ---
+    def publish(self, bar, values):
+        """Updates the live row in place (same timestamp) or appends a new one."""
+        capacity = self.rows.shape[0]
+        head = int(self.header[1])
+        appended = head < 0 or bar[0] != self.rows[head, 0]
+        if appended:
+            head = (head + 1) % capacity
+
+        self.header[0] += 1  # odd: write in progress
+        row = self.rows[head]
+        row[:6] = bar[:6]
+        row[6] = values['ema9']
+        row[7] = values['ema50']
+        row[8] = values['ema200']
+        row[9] = values['rsi']
+        row[10] = values['vol_avg']
+        self.header[1] = head
+        if appended:
+            self.header[2] = min(capacity, int(self.header[2]) + 1)
+        self.header[0] += 1  # even: consistent
+
+    # --- READERS ---
+    def latest(self):
+        """(seq, dict of the newest row), consistent even while the writer is active."""
+        while True:
+            seq = int(self.header[0])
+            if seq % 2:
+                continue
+            head = int(self.header[1])
+            if head < 0:
+                return seq, None
+            row = self.rows[head].tolist()
+            if int(self.header[0]) == seq:
+                return seq, dict(zip(FIELDS, row))
+
+    def window(self, n):
+        """
+        Last `n` rows, oldest first. A zero-copy view when they are contiguous in the
+        ring; the newest row may still change under the reader (it is the live candle).
+        """
+        head = int(self.header[1])
+        count = min(n, int(self.header[2]))
+        if head < 0 or count == 0:
+            return self.rows[:0]
+        start = head - count + 1
+        if start >= 0:
+            return self.rows[start:head + 1]
+        return np.concatenate((self.rows[start:], self.rows[:head + 1]))
+
+    def close(self):
+        del self.header
+        del self.rows
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class FeedSubscriber:
+    """Strategy-side handle: waits for new publications of one shared feed."""
+
+    def __init__(self, name, poll=0.02):
+        self.ring = SharedCandleRing.attach(name)
+        self.poll = poll
+        self.last_seq = -1
+
+    def next_values(self, timeout=1.0):
+        """Newest row once it changed since the last call, or None after `timeout`."""
+        deadline = time.monotonic() + timeout
+        while True:
+            seq, values = self.ring.latest()
+            if values is not None and seq != self.last_seq:
+                self.last_seq = seq
+                return values
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll)
+
+    def close(self):
+        self.ring.close()
+
+
+def load_base_history(client, symbol, base, since, limit=1000):
+    """Base candles from `since` up to the live one (paginated: a 1d bucket needs 1440 1m candles)."""
+    tf_ms = timeframe_ms(base)
+    bars = []
+    while True:
+        page = client.get_ohlcv(symbol, base, limit=limit, since=since) or []
+        bars.extend(page)
+        if len(page) < limit:
+            return bars
+        since = page[-1][0] + tf_ms
+
+
+def run_feed(rings, symbol, base, feed_config, stop_event):
+    """
+    Feed process body: one `base` candle source for a symbol, resampled into every
+    timeframe in `rings` ({timeframe: ring name}). Indicators are updated once and
+    every change is published into that timeframe's shared ring.
+    """
+    from main import load_warmup, start_stream
+    from logic.indicators import IndicatorEngine
+
+    rings = {tf: SharedCandleRing.attach(name) for tf, name in rings.items()}
+    resampler = Resampler(IndicatorEngine(), symbol, rings, base=base)
+    client = feed_config.get('client')
+    if client is None:
+        from core.exchange import BinanceClient
+        client = BinanceClient(api_key=feed_config.get('api_key'), secret_key=feed_config.get('secret_key'),
+                               mode=feed_config.get('mode', 'testnet'))
+
+    store = None
+    if feed_config.get('store_dir', 'data/ohlcv'):
+        from core.store import OHLCVStore
+        store = OHLCVStore(feed_config.get('store_dir', 'data/ohlcv'))
+
+    live_bar = None
+    stream = None
+    # Base candles closing drive the waits; forming updates as often as the fastest timeframe needs
+    forming = feed_config.get('poll_interval') or max(1.0, min(timeframe_ms(tf) for tf in rings) / 60_000)
+    scheduler = PollScheduler.for_client(client, base, forming_interval=forming)
+    print(f"📡 [FEED] {symbol} {base} -> {', '.join(f'{tf}: {ring.name}' for tf, ring in rings.items())}")
+
+    while not stop_event.is_set():
+        try:
+            if live_bar is None:
+                # History of every timeframe from the exchange, live buckets rebuilt from base candles
+                for tf in rings:
+                    resampler.seed(tf, load_warmup(client, store, symbol, tf))
+                bars = load_base_history(client, symbol, base, resampler.base_since())
+            elif stream is not None:
+                bars = [e.data for e in stream.poll(timeout=1.0)
+                        if e.kind == 'kline' and e.symbol == symbol and e.timeframe == base]
+            else:
+                bars = client.get_ohlcv(symbol, base, limit=None, since=live_bar[0])
+
+            closed = []
+            for bar in bars or []:
+                for tf, values in resampler.update(bar).items():
+                    rings[tf].publish(resampler.live_bar(tf), values)
+                # A base candle is final once the next one starts (its last update came while live)
+                if live_bar is not None and bar[0] > live_bar[0]:
+                    closed.append(live_bar)
+                if live_bar is None or bar[0] >= live_bar[0]:
+                    live_bar = bar
+            if closed and store is not None:
+                store.append(symbol, base, closed)
+
+            if feed_config.get('feed', 'stream') == 'stream' and stream is None and live_bar is not None:
+                stream = start_stream(client, feed_config.get('transport') or _default_transport(feed_config),
+                                      symbol, base, live_bar[0])
+            if stream is None:
+                stop_event.wait(scheduler.next_delay())
+        except Exception as e:
+            print(f"\n⚠️ [FEED] {symbol} {base} ERROR: {e}")
+            stop_event.wait(scheduler.failure(e))
+
+    if stream is not None:
+        stream.stop()
+    for ring in rings.values():
+        ring.close()
+
+
+def _feed_process(*args):
+    # The owner stops feeds through the event; Ctrl+C is handled there, not in every child
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    run_feed(*args)
+
+
+def _default_transport(feed_config):
+    from core.stream import CcxtProTransport
+    return CcxtProTransport(feed_config.get('api_key'), feed_config.get('secret_key'), feed_config.get('mode', 'testnet'))
+
+
+class FeedHub:
+    """
+    Owns the shared rings and one feed per (symbol, mode): a single `base_timeframe`
+    candle source (default 1m) resampled into every timeframe its strategies asked for.
+    Timeframes that cannot be built from it (not a multiple) get a feed of their own.
+    Strategies only receive the ring name ('shared_feed' in the run_bot config).
+    Register everything with feed_for(), then start(). With processes=False the feeds
+    run as threads (single-process setups, tests).
+    """
+
+    def __init__(self, capacity=1024, processes=True, base_timeframe='1m'):
+        self.capacity = capacity
+        self.processes = processes
+        self.base_timeframe = base_timeframe
+        self.rings = {}
+        self.groups = {}
+        self.workers = {}
+        self.stop_event = multiprocessing.Event() if processes else threading.Event()
+
+    def _base_for(self, tf):
+        base_ms = timeframe_ms(self.base_timeframe)
+        if timeframe_ms(tf) % base_ms or timeframe_offset_ms(tf) % base_ms:
+            return tf
+        return self.base_timeframe
+
+    def feed_for(self, symbol, tf, feed_config):
+        key = (symbol, tf, feed_config.get('mode', 'testnet'))
+        if key not in self.rings:
+            group = (symbol, self._base_for(tf), key[2])
+            if group in self.workers:
+                raise RuntimeError(f"Feed for {symbol} already started; register {tf} before start()")
+            self.rings[key] = SharedCandleRing.create(self.capacity)
+            self.groups.setdefault(group, ({}, feed_config))[0][tf] = self.rings[key].name
+        return self.rings[key].name
+
+    def start(self):
+        for group, (rings, feed_config) in self.groups.items():
+            if group in self.workers:
+                continue
+            symbol, base, _ = group
+            args = (rings, symbol, base, feed_config, self.stop_event)
+            if self.processes:
+                worker = multiprocessing.Process(target=_feed_process, args=args, daemon=True)
+            else:
+                worker = threading.Thread(target=run_feed, args=args, daemon=True)
+            worker.start()
+            self.workers[group] = worker
+        return self
+
+    def close(self, timeout=10.0):
+        self.stop_event.set()
+        for worker in self.workers.values():
+            worker.join(timeout)
+        for ring in self.rings.values():
+            ring.close()
+        self.rings = {}
+        self.groups = {}
+        self.workers = {}
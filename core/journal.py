@@ -0,0 +1,289 @@
+import json
+import os
+import threading
+import time
+import zlib
+
+# No-spell-check: ZENVO
+
+
+def _encode(record):
+    payload = json.dumps(record, separators=(',', ':'))
+    return f"{zlib.crc32(payload.encode()):08x} {payload}\n".encode()
+
+
+def _decode(line):
+    """Record from one journal line, or None if it is torn or fails its checksum."""
+    try:
+        text = line.decode()
+        crc, payload = text.rstrip('\n').split(' ', 1)
+        if not text.endswith('\n') or int(crc, 16) != zlib.crc32(payload.encode()):
+            return None
+        return json.loads(payload)
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+class _Flusher:
+    """One background thread fsyncing every dirty journal with its interval (group commit)."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.dirty = set()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def mark(self, journal):
+        with self._lock:
+            self.dirty.add(journal)
+
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                journals, self.dirty = self.dirty, set()
+            for journal in journals:
+                journal.sync()
+
+
+_flushers = {}
+_flushers_lock = threading.Lock()
+
+
+def _get_flusher(interval):
+    # Journals with the same fsync_interval share one thread (usually all of them)
+    with _flushers_lock:
+        flusher = _flushers.get(interval)
+        if flusher is None:
+            flusher = _flushers[interval] = _Flusher(interval)
+        return flusher
+
+
+class PositionJournal:
+    """
+    Crash-safe state of one bot: an append-only write-ahead log of position and order
+    events plus a compact snapshot.
+    - Every record is a CRC32-checked JSON line written to the OS immediately;
+      fsync is batched (every `fsync_interval` s), critical records can force it.
+    - Every `snapshot_every` records the state is written to '<path>.snap'
+      (write + fsync + rename) and the log starts over.
+    - Opening the journal restores the state from snapshot + log; a torn or corrupt
+      tail (crash mid-write) is cut off.
+    """
+
+    def __init__(self, path, fsync_interval=0.1, snapshot_every=500):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.snap_path = f"{path}.snap"
+        self.snapshot_every = snapshot_every
+        self.state = {'position': None, 'orders': {}}
+        self.seq = 0
+        self._since_snapshot = 0
+        self._lock = threading.Lock()
+        self._flusher = _get_flusher(fsync_interval)
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        started = time.perf_counter()
+        self._restore()
+        self.restore_ms = (time.perf_counter() - started) * 1000
+        self._fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    @classmethod
+    def for_bot(cls, root, bot_id, **kwargs):
+        return cls(os.path.join(root, bot_id.replace('/', '_').replace(':', '_')), **kwargs)
+
+    # --- RECOVERY ---
+    def _restore(self):
+        if os.path.exists(self.snap_path):
+            with open(self.snap_path, 'rb') as f:
+                snapshot = _decode(f.read())
+            if snapshot is not None:
+                self.state = snapshot['state']
+                self.seq = snapshot['seq']
+
+        if not os.path.exists(self.log_path):
+            return
+        valid_bytes = 0
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                record = _decode(line)
+                if record is None:
+                    break
+                valid_bytes += len(line)
+                if record['seq'] > self.seq:
+                    self._apply(record)
+                    self.seq = record['seq']
+                    self._since_snapshot += 1
+        if valid_bytes != os.path.getsize(self.log_path):
+            print(f"⚠️ [JOURNAL] {self.log_path}: dropped a torn tail after {valid_bytes} bytes")
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def _apply(self, record):
+        kind = record['type']
+        if kind == 'open':
+            self.state['position'] = {key: record.get(key) for key in
+                                      ('entry_price', 'quantity', 'sl', 'tp', 'max_price', 'trailing_activated',
+                                       'orders')}
+        elif kind == 'peak' and self.state['position'] is not None:
+            self.state['position']['max_price'] = record['max_price']
+            self.state['position']['trailing_activated'] = record['trailing_activated']
+        elif kind == 'close':
+            self.state['position'] = None
+        elif kind == 'order':
+            if record.get('status') in ('submitted', 'open'):
+                self.state['orders'][record['client_id']] = record
+            else:
+                self.state['orders'].pop(record['client_id'], None)
+
+    # --- WRITE ---
+    def record(self, kind, sync=False, **fields):
+        """Appends one event and applies it to the in-memory state. `sync` fsyncs before returning."""
+        with self._lock:
+            self.seq += 1
+            record = {'seq': self.seq, 'type': kind, 'ts': int(time.time() * 1000), **fields}
+            self._apply(record)
+            os.write(self._fd, _encode(record))
+            self._since_snapshot += 1
+            if self._since_snapshot >= self.snapshot_every:
+                self._snapshot()
+        if sync:
+            self.sync()
+        else:
+            self._flusher.mark(self)
+        return record
+
+    def sync(self):
+        with self._lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+
+    def _snapshot(self):
+        tmp = f"{self.snap_path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(_encode({'seq': self.seq, 'state': self.state}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snap_path)
+        # Everything up to seq is in the snapshot; the log can start over
+        os.ftruncate(self._fd, 0)
+        self._since_snapshot = 0
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
+
+    # --- POSITION HELPERS (run_bot) ---
+    @property
+    def position(self):
+        return self.state['position']
+
+    def open_position(self, position, client_id=None):
+        """
+        Logs a new position, or a changed one (partial sell). `client_id` is the order that
+        opened / changed it; the position keeps the ids of all of them for the Reconciler.
+        """
+        orders = list((self.position or {}).get('orders') or [])
+        if client_id is not None:
+            orders.append(client_id)
+        return self.record('open', sync=True, entry_price=position.entry_price, quantity=position.quantity,
+                           sl=position.sl, tp=position.tp, max_price=position.max_price,
+                           trailing_activated=position.trailing_activated, orders=orders)
+
+    def track(self, position):
+        """Logs a new peak / trailing activation; no-op while nothing changed."""
+        saved = self.state['position']
+        if saved is not None and (saved['max_price'] != position.max_price
+                                  or saved['trailing_activated'] != position.trailing_activated):
+            self.record('peak', max_price=position.max_price, trailing_activated=position.trailing_activated)
+
+    def close_position(self, price, reason):
+        return self.record('close', sync=True, price=price, reason=reason)
+
+    # --- ORDER HELPERS (core.orders) ---
+    def submit_order(self, order):
+        """Write-ahead record of an order about to be sent; stays pending until settle_order()."""
+        return self.record('order', sync=True, client_id=order.client_id, status='submitted', symbol=order.symbol,
+                           side=order.side, quantity=order.quantity, price=order.expected_price, reason=order.reason)
+
+    def settle_order(self, order):
+        """Final state of an order, written once the engine has applied its fill."""
+        return self.record('order', client_id=order.client_id, status=order.status, filled=order.filled,
+                           average=order.average)
+
+    @property
+    def pending_orders(self):
+        return list(self.state['orders'].values())
+
+
+class Reconciler:
+    """
+    Background check of a restored position against the exchange, by the client ids of
+    the journaled orders. `verdict` ends up as 'ok', 'missing' or 'error':
+    - 'missing': the order that opened the position is unknown to the exchange or never
+      filled, or sells not placed by any bot (e.g. by hand) have since covered it.
+    - Positions journaled before they carried order ids fall back to a balance check.
+    `open_orders` lists what the exchange still has pending. Orders journaled as submitted
+    but never settled are looked up by client id: `resolved` holds (record, exchange order
+    or None) pairs.
+    """
+
+    def __init__(self, client_manager, symbol, journal, usd_amount=None):
+        self.client_manager = client_manager
+        self.symbol = symbol
+        self.journal = journal
+        self.usd_amount = usd_amount
+        self.verdict = None
+        self.open_orders = []
+        self.resolved = []
+        self.handled = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            position = self.journal.position
+            exchange = self.client_manager.exchange
+            self.open_orders = exchange.fetch_open_orders(self.symbol) if hasattr(exchange, 'fetch_open_orders') else []
+            for record in self.journal.pending_orders:
+                self.resolved.append((record, self.client_manager.find_order(record['symbol'], record['client_id'])))
+            if position is None:
+                self.verdict = 'ok'
+            elif position.get('orders'):
+                self.verdict = self._check_orders(position)
+            else:
+                self.verdict = self._check_balance(position)
+        except Exception as e:
+            print(f"\n⚠️ [JOURNAL] Reconciliation failed: {e}")
+            self.verdict = 'error'
+
+    def _check_orders(self, position):
+        from core.orders import CLIENT_ID_PREFIX
+
+        entry = self.client_manager.find_order(self.symbol, position['orders'][0])
+        if entry is None or not float(entry.get('filled') or 0.0):
+            return 'missing'
+        exchange = self.client_manager.exchange
+        if not hasattr(exchange, 'fetch_closed_orders'):
+            return 'ok'
+        # Sells of other bots on this symbol close their own positions: only foreign ids count
+        held = position['quantity'] or float(entry['filled'])
+        sold = sum(float(order.get('filled') or 0.0)
+                   for order in exchange.fetch_closed_orders(self.symbol, since=entry.get('timestamp'))
+                   if order.get('side') == 'sell'
+                   and not str(order.get('clientOrderId') or '').startswith(f"{CLIENT_ID_PREFIX}-"))
+        return 'missing' if sold >= held * (1 - 1e-9) else 'ok'
+
+    def _check_balance(self, position):
+        base = self.symbol.split('/')[0]
+        balance = self.client_manager.exchange.fetch_balance().get(base, {})
+        held = float(balance.get('total') or balance.get('free') or 0.0)
+        expected = position['quantity'] or (self.usd_amount or 0.0) / position['entry_price']
+        # Half the expected size tolerates fees taken in the base asset and partial fills
+        return 'missing' if held < expected * 0.5 else 'ok'
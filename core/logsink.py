@@ -0,0 +1,79 @@
+import time
+from collections import deque
+
+
+class LogSink:
+    """
+    Thread-safe, non-blocking replacement for sys.stdout.
+    Writers only append to a deque (atomic under the GIL, no lock, never waits on the GUI).
+    The consumer calls drain() at its own frame rate; '\\r' status updates written in between
+    collapse into a single current line. Beyond `max_pending` unread writes the oldest are
+    dropped; drain() reports how many in a line of its own.
+    """
+
+    def __init__(self, max_pending=10000, file_path=None):
+        self._pending = deque(maxlen=max_pending)
+        self.current = ""
+        self.dropped = 0
+        self._reported = 0
+        self.file_path = file_path
+        self._file = open(file_path, 'a', encoding='utf-8', buffering=1) if file_path else None
+
+    # --- WRITER SIDE (any thread) ---
+    def write(self, message):
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(message)
+        return len(message)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    # --- CONSUMER SIDE (GUI thread) ---
+    def drain(self):
+        """
+        Applies everything written since the last call, terminal-style:
+        '\\n' commits the current line, '\\r' restarts it.
+        Returns (committed_lines, current_line, changed).
+        """
+        pieces = []
+        while True:
+            try:
+                pieces.append(self._pending.popleft())
+            except IndexError:
+                break
+        if not pieces:
+            return [], self.current, False
+
+        previous = self.current
+        parts = "".join(pieces).split("\n")
+        committed = []
+        dropped = self.dropped - self._reported
+        if dropped:
+            self._reported += dropped
+            committed.append(f"⚠️ [LOG] {dropped} lines dropped (written faster than displayed)")
+        line = self.current
+        for part in parts[:-1]:
+            committed.append(_carriage(line + part))
+            line = ""
+        self.current = _carriage(line + parts[-1])
+
+        if self._file is not None and committed:
+            stamp = time.strftime('%Y-%m-%d %H:%M:%S')
+            self._file.write("".join(f"{stamp} {text}\n" for text in committed if text))
+        return committed, self.current, bool(committed) or self.current != previous
+
+    def close(self):
+        """Writes what is still pending to the log file and closes it."""
+        if self._file is not None:
+            self.drain()
+            self._file.close()
+            self._file = None
+
+
+def _carriage(text):
+    # Only what follows the last '\r' is still visible on that line
+    return text.rsplit("\r", 1)[-1]
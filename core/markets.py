@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal, ROUND_DOWN
+
+import ccxt
+
+# Per-symbol trading rules, precomputed from the exchange's market metadata
+SymbolRules = namedtuple('SymbolRules', ['symbol', 'step', 'min_qty', 'max_qty', 'min_notional', 'tick'])
+
+
+class BelowMinimum(ValueError):
+    """Order smaller than the symbol's min quantity / min notional (LOT_SIZE / MIN_NOTIONAL)."""
+
+
+class AboveMaximum(ValueError):
+    """Order larger than the symbol's max quantity (LOT_SIZE); `maximum` is the most one order may be."""
+
+    def __init__(self, message, maximum):
+        super().__init__(message)
+        self.maximum = maximum
+
+
+class MarketCache:
+    """
+    Loads exchange market metadata once and refreshes it in the background.
+    Quantity normalization (LOT_SIZE / MIN_NOTIONAL) is then a local computation.
+    Until a load succeeds the background thread retries every `retry` seconds.
+    """
+
+    def __init__(self, exchange, ttl=3600, retry=60):
+        self.exchange = exchange
+        self.ttl = ttl
+        self.retry = retry
+        self.rules = {}
+        self.loaded_at = 0.0
+        self._missing = set()  # Symbols the last load did not know, until the next one
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Background refresh thread + initial load (its error is raised, the thread keeps retrying)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop, daemon=True)
+            self._thread.start()
+        self.refresh()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh(self):
+        self.update_from(self.exchange.load_markets(reload=bool(self.rules)))
+
+    def update_from(self, markets):
+        """Rebuilds the rules from an already loaded ccxt markets dict (e.g. from an async exchange)."""
+        tick_mode = getattr(self.exchange, 'precisionMode', None) == ccxt.TICK_SIZE
+        rules = {symbol: _build_rules(symbol, market, tick_mode) for symbol, market in markets.items()}
+        with self._lock:
+            self.rules = rules
+            self._missing = set()
+            self.loaded_at = time.time()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.ttl if self.rules else self.retry):
+            try:
+                self.refresh()
+            except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+                print(f"\n⚠️ MARKET CACHE REFRESH FAILED: {e}")
+
+    def get(self, symbol):
+        rules = self.rules.get(symbol)
+        if rules is None:
+            # Unknown or not loaded yet: one synchronous load, then cached (a miss too, until the next load)
+            if symbol not in self._missing:
+                self.refresh()
+                rules = self.rules.get(symbol)
+            if rules is None:
+                self._missing.add(symbol)
+                raise ValueError(f"Unknown market {symbol}")
+        return rules
+
+    def normalize_amount(self, symbol, amount, price=None):
+        """
+        Floors `amount` to the symbol's step size and checks max qty, min qty and min notional.
+        Raises AboveMaximum or BelowMinimum (both ValueErrors) when the exchange would reject the order.
+        """
+        rules = self.get(symbol)
+        qty = Decimal(str(amount))
+        if rules.step:
+            step = Decimal(str(rules.step))
+            qty = (qty / step).to_integral_value(rounding=ROUND_DOWN) * step
+        qty = float(qty)
+
+        if rules.max_qty and qty > rules.max_qty:
+            raise AboveMaximum(f"{symbol} quantity {qty} above maximum {rules.max_qty}", rules.max_qty)
+        if rules.min_qty and qty < rules.min_qty:
+            raise BelowMinimum(f"{symbol} quantity {qty} below minimum {rules.min_qty}")
+        if price and rules.min_notional and qty * price < rules.min_notional:
+            raise BelowMinimum(f"{symbol} order value {qty * price:.2f} below min notional {rules.min_notional}")
+        return qty
+
+
+def _build_rules(symbol, market, tick_mode):
+    precision = market.get('precision') or {}
+    limits = market.get('limits') or {}
+    return SymbolRules(
+        symbol=symbol,
+        step=_to_step(precision.get('amount'), tick_mode),
+        min_qty=(limits.get('amount') or {}).get('min'),
+        max_qty=(limits.get('amount') or {}).get('max'),
+        min_notional=(limits.get('cost') or {}).get('min'),
+        tick=_to_step(precision.get('price'), tick_mode),
+    )
+
+
+def _to_step(precision, tick_mode):
+    # ccxt reports either the step itself (TICK_SIZE) or a number of decimals
+    if precision is None:
+        return None
+    if tick_mode:
+        return float(precision)
+    return 10 ** -int(precision)
@@ -0,0 +1,241 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Histogram bucket upper bounds in seconds (Prometheus 'le' labels)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative buckets for export plus a window of recent samples for p50/p99."""
+
+    def __init__(self, window=2048):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+            else:
+                self.counts[-1] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+            self.recent.append(value)
+
+    def snapshot(self):
+        """(bucket counts, count, total) read together, consistent with each other."""
+        with self._lock:
+            return list(self.counts), self.count, self.total
+
+    def percentile(self, q):
+        with self._lock:
+            samples = sorted(self.recent)
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q / 100 * len(samples)))]
+
+    def summary(self):
+        return {'count': self.count, 'p50': self.percentile(50), 'p99': self.percentile(99), 'max': self.max}
+
+
+class Metrics:
+    """
+    Registry of per-stage latency histograms and counters for one bot.
+    Thread-safe; recording a sample is a few list operations.
+    """
+
+    def __init__(self, name="zenvo"):
+        self.name = name
+        self.histograms = {}
+        self.counters = {}
+        self.profiler = ProfileSwitch()
+        self._lock = threading.Lock()
+
+    def histogram(self, stage):
+        hist = self.histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(stage, Histogram())
+        return hist
+
+    def observe(self, stage, seconds):
+        self.histogram(stage).observe(seconds)
+
+    def inc(self, counter, value=1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    @contextmanager
+    def timer(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def wrap(self, stage, func):
+        """Returns `func` timed under `stage` (used for ccxt's rate-limit throttle)."""
+        def timed(*args, **kwargs):
+            with self.timer(stage):
+                return func(*args, **kwargs)
+        return timed
+
+    # --- EXPORT FORMATS ---
+    def _sorted(self):
+        # Exporters run in their own threads while stages and counters are being added
+        with self._lock:
+            return sorted(self.histograms.items()), sorted(self.counters.items())
+
+    def prometheus(self):
+        lines = []
+        histograms, counters = self._sorted()
+        for stage, hist in histograms:
+            metric = f"{self.name}_{stage}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            counts, total_count, total = hist.snapshot()
+            cumulative = 0
+            for bound, count in zip(BUCKETS, counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {total_count}')
+            lines.append(f"{metric}_sum {total}")
+            lines.append(f"{metric}_count {total_count}")
+        for counter, value in counters:
+            metric = f"{self.name}_{counter}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary_text(self):
+        rows = [f"📊 METRICS [{self.name}]"]
+        histograms, counters = self._sorted()
+        for stage, hist in histograms:
+            s = hist.summary()
+            rows.append(f"   {stage:<14} n={s['count']:<7} p50={s['p50'] * 1000:8.2f} ms | "
+                        f"p99={s['p99'] * 1000:8.2f} ms | max={s['max'] * 1000:8.2f} ms")
+        for counter, value in counters:
+            rows.append(f"   {counter:<14} {value}")
+        return "\n".join(rows)
+
+
+class ProfileSwitch:
+    """
+    Runtime cProfile toggle for a running bot.
+    Any thread may request() a capture; the trading thread calls tick() once per
+    iteration, which starts/stops the profiler inside that thread.
+    """
+
+    def __init__(self):
+        self.requested_until = 0.0
+        self.output_path = None
+        self.last_report = None
+        self._profile = None
+
+    def request(self, seconds=30, output_path=None):
+        self.output_path = output_path
+        self.requested_until = time.monotonic() + seconds
+
+    def tick(self):
+        active = time.monotonic() < self.requested_until
+        if active and self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            print("\n🔬 PROFILER ON")
+        elif not active and self._profile is not None:
+            self._profile.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream).sort_stats('cumulative')
+            stats.print_stats(25)
+            self.last_report = stream.getvalue()
+            if self.output_path:
+                stats.dump_stats(self.output_path)
+            self._profile = None
+            print(f"\n🔬 PROFILER OFF{f' -> {self.output_path}' if self.output_path else ''}")
+
+
+# --- EXPORTERS ---
+
+class PrometheusExporter:
+    """
+    Serves /metrics (Prometheus text format) on a local port.
+    GET /profile?seconds=N switches the cProfile hook on; GET /profile/report returns the last report.
+    """
+
+    def __init__(self, metrics, port=9108, host="127.0.0.1"):
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self.server = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/metrics":
+                    body = metrics.prometheus()
+                elif url.path == "/profile":
+                    seconds = float(parse_qs(url.query).get('seconds', ['30'])[0])
+                    metrics.profiler.request(seconds)
+                    body = f"profiling for {seconds:.0f}s\n"
+                elif url.path == "/profile/report":
+                    body = metrics.profiler.last_report or "no report yet\n"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"📡 [METRICS] http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class SummaryExporter:
+    """Prints the metrics summary every `interval` seconds."""
+
+    def __init__(self, metrics, interval=300):
+        self.metrics = metrics
+        self.interval = interval
+        self._stop = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            print("\n" + self.metrics.summary_text())
+
+    def stop(self):
+        self._stop.set()
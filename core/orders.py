@@ -0,0 +1,295 @@
+import queue
+import threading
+import time
+import uuid
+
+import ccxt
+
+from core.markets import AboveMaximum, BelowMinimum
+
+# ccxt unified statuses after which an order no longer changes ('expired' = partial market fill on Binance)
+TERMINAL = ('closed', 'canceled', 'expired', 'rejected')
+
+
+# Every client order id this engine sends starts with "<prefix>-"
+CLIENT_ID_PREFIX = "zv"
+
+
+def new_client_id(prefix=CLIENT_ID_PREFIX):
+    """Binance newClientOrderId: at most 36 chars of [.A-Z:/a-z0-9_-]."""
+    return f"{prefix}-{uuid.uuid4().hex}"
+
+
+class Order:
+    """
+    One market order as the engine sees it. `status` moves from 'queued' to
+    'filled', 'partial' (some quantity executed), 'failed' (not executed),
+    'rejected' (below the exchange's min qty / min notional, never sent) or
+    'unknown' (sent, but the exchange could not be asked whether it arrived; see
+    OrderExecutor.recheck). `net_quantity` is what ends up held after a fee charged
+    in the base asset. An order above the exchange's max qty is sent for the maximum
+    and `requested` keeps the original quantity; it settles as 'partial' at best.
+    """
+
+    def __init__(self, symbol, side, expected_price, quantity=None, usd_amount=None, signal_time=None,
+                 reason=None, client_id=None):
+        self.client_id = client_id or new_client_id()
+        self.symbol = symbol
+        self.side = side
+        self.expected_price = expected_price
+        self.quantity = quantity
+        self.requested = None  # Set when `quantity` was capped at the exchange's max qty
+        self.usd_amount = usd_amount
+        self.signal_time = signal_time
+        self.reason = reason
+        self.status = 'queued'
+        self.filled = 0.0
+        self.net_quantity = 0.0
+        self.average = None
+        self.fee = 0.0
+        self.fill_seconds = None
+        self.attempts = 0
+        self.error = None
+        self.journaled = False  # A 'submitted' record exists, so the outcome must be journaled too
+
+    @property
+    def done(self):
+        return self.status not in ('queued', 'submitted', 'unknown')
+
+    @property
+    def slippage_bps(self):
+        """Realized slippage vs the signal price in basis points; positive = worse than expected."""
+        if not self.average or not self.expected_price:
+            return None
+        move = (self.average - self.expected_price) / self.expected_price * 10_000
+        return move if self.side == 'buy' else -move
+
+    def describe(self):
+        text = f"{self.filled:g} @ {self.average:,.2f}"
+        if self.slippage_bps is not None:
+            text += f" | SLIPPAGE: {self.slippage_bps:+.1f} bps"
+        if self.fill_seconds is not None:
+            text += f" | FILL: {self.fill_seconds * 1000:.0f} ms"
+        return text
+
+
+class OrderExecutor:
+    """
+    Order stage between the decision and the exchange. submit() returns at once and a
+    worker thread does the round-trip, so market data keeps flowing while orders are
+    in flight; finished orders are collected with poll().
+
+    - Every order carries a client order id and is journaled before it is sent.
+    - On a network error the id is looked up on the exchange, and the order is only
+      sent again (same id) once the exchange answers that it has no such order. While
+      the lookup itself keeps failing the order comes back 'unknown' and is never
+      resent: recheck() looks it up again later, the Reconciler after a restart.
+    - The real average price, executed quantity and fee come from the exchange's
+      order (fetched again until it is final when the first answer is not).
+    `asynchronous=False` executes inside submit() (deterministic runs on the simulator).
+    `wait` is the sleep used between attempts (run_bot passes stop_event.wait).
+    `metrics` defaults to the client's (run_bot passes the bot's own when the client is shared).
+    """
+
+    def __init__(self, client_manager, journal=None, max_retries=5, retry_delay=0.5, fill_timeout=30.0,
+                 asynchronous=True, wait=time.sleep, metrics=None):
+        self.client_manager = client_manager
+        self.metrics = metrics or client_manager.metrics
+        self.journal = journal
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.fill_timeout = fill_timeout
+        self.wait = wait
+        self._queue = queue.Queue()
+        self._done = queue.Queue()
+        self._thread = None
+        if asynchronous:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    # --- ENGINE SIDE ---
+    def submit(self, symbol, side, price, quantity=None, usd_amount=None, signal_time=None, reason=None):
+        """
+        Queues a market order for `quantity` (base asset) or, for buys, `usd_amount`
+        converted at `price`. Returns the Order; its fill arrives through poll().
+        """
+        order = Order(symbol, side, price, quantity=quantity, usd_amount=usd_amount, signal_time=signal_time,
+                      reason=reason)
+        self._dispatch(self._execute, order)
+        return order
+
+    def recheck(self, order):
+        """Looks an 'unknown' order up on the exchange again (never resubmits it); result via poll()."""
+        self._dispatch(self._recheck, order)
+        return order
+
+    def _dispatch(self, job, order):
+        if self._thread is None:
+            self._done.put(job(order))
+        else:
+            self._queue.put((job, order))
+
+    def poll(self):
+        """Orders finished since the last call."""
+        finished = []
+        while True:
+            try:
+                finished.append(self._done.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def adopt(self, record, found):
+        """
+        Order from a journal 'submitted' record left open by a crash, settled from what
+        the exchange reports for its client id (`found`, None if it never arrived).
+        """
+        order = Order(record['symbol'], record['side'], record.get('price'), quantity=record.get('quantity'),
+                      reason=record.get('reason'), client_id=record['client_id'])
+        order.status = 'submitted'
+        order.journaled = True
+        if found is None:
+            order.status = 'failed'
+            order.error = "not found on exchange"
+        else:
+            self._settle(order, found)
+        return order
+
+    def close(self, timeout=5.0):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    # --- WORKER SIDE ---
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            job, order = item
+            self._done.put(job(order))
+
+    def _execute(self, order):
+        # The worker must survive anything: every error ends as an order status
+        try:
+            raw = order.quantity if order.quantity is not None else order.usd_amount / order.expected_price
+            # Normalizes amount according to Binance precision rules (local, cached)
+            markets = self.client_manager.markets
+            try:
+                order.quantity = markets.normalize_amount(order.symbol, raw, order.expected_price)
+            except AboveMaximum as e:
+                # Send the most one order may carry; the rest stays with the caller
+                order.requested = raw
+                order.error = str(e)
+                order.quantity = markets.normalize_amount(order.symbol, e.maximum, order.expected_price)
+        except BelowMinimum as e:
+            return self._finish(order, 'rejected', e)
+        except Exception as e:
+            # Unknown market, metadata not loadable...: nothing was sent
+            return self._finish(order, 'failed', f"{type(e).__name__}: {e}")
+
+        try:
+            if self.journal is not None:
+                self.journal.submit_order(order)
+                order.journaled = True
+            order.status = 'submitted'
+            if order.signal_time is not None:
+                self.metrics.observe('signal_submit', time.perf_counter() - order.signal_time)
+            result = self._place(order)
+            if result is None:
+                return order
+            return self._settle(order, self._await_final(order, result))
+        except ccxt.ExchangeError as e:
+            # Answered by the exchange (insufficient funds, invalid order...): not executed
+            return self._finish(order, 'failed', e)
+        except Exception as e:
+            status = 'unknown' if order.status == 'submitted' else 'failed'
+            return self._finish(order, status, f"{type(e).__name__}: {e}")
+
+    def _place(self, order):
+        """
+        The exchange's order, or None once `order` is finished as 'failed' (retries used up,
+        never accepted) or 'unknown' (lookups failing: it may have been accepted).
+        """
+        client = self.client_manager
+        while True:
+            order.attempts += 1
+            try:
+                return client.place_market_order(order.symbol, order.side, order.quantity, order.client_id)
+            except ccxt.NetworkError as e:
+                # Timeouts and dropped connections: the order may have been accepted anyway
+                order.error = str(e)
+                self.metrics.inc('order_retries')
+            found = self._lookup(order)
+            if found is not None:
+                return found
+            if order.status == 'unknown':
+                return None
+            if order.attempts > self.max_retries:
+                self._finish(order, 'failed', order.error)
+                return None
+
+    def _lookup(self, order):
+        """
+        The exchange's order for `order.client_id`, None when the exchange says it has none.
+        If every lookup fails, `order` is finished as 'unknown' (and None returned).
+        """
+        for lookup in range(self.max_retries + 1):
+            self.wait(self.retry_delay * 2 ** lookup)
+            try:
+                return self.client_manager.find_order(order.symbol, order.client_id)
+            except ccxt.NetworkError as e:
+                order.error = str(e)
+        self._finish(order, 'unknown', order.error)
+        return None
+
+    def _recheck(self, order):
+        try:
+            order.status = 'submitted'
+            found = self._lookup(order)
+            if found is None:
+                if order.status == 'unknown':
+                    return order
+                return self._finish(order, 'failed', "not found on exchange")
+            return self._settle(order, self._await_final(order, found))
+        except Exception as e:
+            return self._finish(order, 'unknown', f"{type(e).__name__}: {e}")
+
+    def _await_final(self, order, result):
+        deadline = time.monotonic() + self.fill_timeout
+        delay = 0.05
+        while result.get('status') not in TERMINAL and time.monotonic() < deadline:
+            self.wait(delay)
+            delay = min(delay * 2, 1.0)
+            try:
+                result = self.client_manager.find_order(order.symbol, order.client_id) or result
+            except ccxt.NetworkError:
+                continue
+        return result
+
+    def _settle(self, order, result):
+        filled = float(result.get('filled') or 0.0)
+        cost = float(result.get('cost') or 0.0)
+        average = result.get('average') or (cost / filled if filled else None)
+        base = order.symbol.split('/')[0]
+        fees = result.get('fees') or ([result['fee']] if result.get('fee') else [])
+        base_fee = sum(float(fee.get('cost') or 0.0) for fee in fees if fee.get('currency') == base)
+
+        order.filled = filled
+        order.average = float(average) if average else None
+        order.fee = sum(float(fee.get('cost') or 0.0) for fee in fees)
+        order.net_quantity = filled - base_fee if order.side == 'buy' else filled
+        if not filled:
+            return self._finish(order, 'failed', f"not filled (exchange status {result.get('status')})")
+        # Tolerance for float noise between our normalized quantity and the exchange's
+        complete = filled >= order.quantity * (1 - 1e-9) and order.requested is None
+        return self._finish(order, 'filled' if complete else 'partial')
+
+    def _finish(self, order, status, error=None):
+        order.status = status
+        if error is not None:
+            order.error = str(error)
+        if order.signal_time is not None and order.filled:
+            order.fill_seconds = time.perf_counter() - order.signal_time
+            self.metrics.observe('signal_fill', order.fill_seconds)
+        self.metrics.inc(f"orders_{status}")
+        return order
@@ -1,3 +1,7 @@
+import itertools
+
+import numpy as np
+
 import config
 
 def calculate_tp_sl(side, entry_price):
@@ -7,4 +11,216 @@ def calculate_tp_sl(side, entry_price):
     else: # SHORT
         tp = entry_price * (1 - config.TP_PERCENT)
         sl = entry_price * (1 + config.SL_PERCENT)
-    return round(tp, 2), round(sl, 2)
\ No newline at end of file
+    return round(tp, 2), round(sl, 2)
+
+
+# --- STOP BOOK ---
+# Many open positions, one price stream per symbol: levels are kept sorted so a price
+# update only touches the positions it actually crosses.
+
+class BookPosition:
+    """One position in the StopBook. Trailing positions use `sl`/`tp` in %, fixed ones absolute prices."""
+
+    def __init__(self, pid, symbol, side, model, entry_price, quantity, sl, tp, trailing_activated=False):
+        self.pid = pid
+        self.symbol = symbol
+        self.side = side
+        self.model = model
+        self.entry_price = entry_price
+        self.quantity = quantity
+        self.sl = sl
+        self.tp = tp
+        self.trailing_activated = trailing_activated
+        self.max_price = entry_price  # Trailing only; kept current by StopBook.refresh()
+        self.exit_reason = None
+
+
+class _Levels:
+    """Sorted price levels and the position ids sitting on them (one side of the book)."""
+
+    def __init__(self):
+        self.levels = np.empty(0)
+        self.ids = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.levels)
+
+    def add(self, level, pid):
+        i = int(np.searchsorted(self.levels, level, side='right'))
+        self.levels = np.insert(self.levels, i, level)
+        self.ids = np.insert(self.ids, i, pid)
+
+    def pop_at_or_below(self, price):
+        """Removes and returns (id, level) pairs with level <= price."""
+        k = int(np.searchsorted(self.levels, price, side='right'))
+        if not k:
+            return ()
+        popped = list(zip(self.ids[:k].tolist(), self.levels[:k].tolist()))
+        self.levels, self.ids = self.levels[k:], self.ids[k:]
+        return popped
+
+    def pop_at_or_above(self, price):
+        """Removes and returns (id, level) pairs with level >= price."""
+        k = int(np.searchsorted(self.levels, price, side='left'))
+        if k == len(self.levels):
+            return ()
+        popped = list(zip(self.ids[k:].tolist(), self.levels[k:].tolist()))
+        self.levels, self.ids = self.levels[:k], self.ids[:k]
+        return popped
+
+    def raise_below(self, price):
+        """All levels under `price` move up to it (stays sorted: the prefix becomes a plateau)."""
+        k = int(np.searchsorted(self.levels, price, side='left'))
+        if k:
+            self.levels[:k] = price
+
+    def level_of(self, pid):
+        i = np.flatnonzero(self.ids == pid)
+        return float(self.levels[i[0]]) if len(i) else None
+
+    def compact(self, alive):
+        keep = np.isin(self.ids, np.fromiter(alive, dtype=np.int64, count=len(alive)))
+        self.levels, self.ids = self.levels[keep], self.ids[keep]
+
+
+class _SymbolBook:
+    def __init__(self):
+        # Trailing (long, as run_bot): peaks grouped by stop gap, plus one-shot activation levels
+        self.peaks = {}
+        self.activation = _Levels()
+        # Fixed TP/SL (calculate_tp_sl)
+        self.long_sl = _Levels()
+        self.long_tp = _Levels()
+        self.short_sl = _Levels()
+        self.short_tp = _Levels()
+
+    def sides(self):
+        return [self.activation, self.long_sl, self.long_tp, self.short_sl, self.short_tp, *self.peaks.values()]
+
+
+class StopBook:
+    """
+    Price-indexed stops for many open positions across symbols.
+    - Trailing model (run_bot / TrailingPosition): stop `sl`% under the peak, trailing
+      'activation' once profit reaches `tp`%. Peaks are raised in bulk (one vectorized
+      prefix assignment per group of equal stop gaps).
+    - Fixed model (core/risk.calculate_tp_sl): LONG/SHORT absolute TP and SL prices.
+    on_price() costs O(log n + crossed) searches per side. Closed positions are dropped
+    lazily from the other sides and compacted once they make up half of the book.
+    """
+
+    def __init__(self):
+        self.books = {}
+        self.positions = {}
+        self._ids = itertools.count(1)
+        self._stale = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _book(self, symbol):
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = _SymbolBook()
+        return book
+
+    # --- ADD / REMOVE ---
+    def add_trailing(self, symbol, entry_price, sl, tp, quantity=None, max_price=None, trailing_activated=False):
+        position = BookPosition(next(self._ids), symbol, 'LONG', 'trailing', entry_price, quantity, sl, tp,
+                                trailing_activated)
+        position.max_price = max_price if max_price is not None else entry_price
+        book = self._book(symbol)
+        gap = 1 - sl / 100
+        book.peaks.setdefault(gap, _Levels()).add(position.max_price, position.pid)
+        if not trailing_activated:
+            book.activation.add(entry_price * (1 + tp / 100), position.pid)
+        self.positions[position.pid] = position
+        return position
+
+    def add_fixed(self, symbol, side, entry_price, quantity=None, tp=None, sl=None):
+        """LONG/SHORT with absolute TP/SL prices; defaults come from calculate_tp_sl()."""
+        if tp is None or sl is None:
+            default_tp, default_sl = calculate_tp_sl(side, entry_price)
+            tp = default_tp if tp is None else tp
+            sl = default_sl if sl is None else sl
+        position = BookPosition(next(self._ids), symbol, side, 'fixed', entry_price, quantity, sl, tp)
+        book = self._book(symbol)
+        if side == 'LONG':
+            book.long_sl.add(sl, position.pid)
+            book.long_tp.add(tp, position.pid)
+        else:
+            book.short_sl.add(sl, position.pid)
+            book.short_tp.add(tp, position.pid)
+        self.positions[position.pid] = position
+        return position
+
+    def remove(self, pid):
+        """Drops a position (e.g. closed manually). Its levels are cleaned up lazily."""
+        position = self.positions.pop(pid, None)
+        if position is not None:
+            self._retire(position)
+        return position
+
+    def _retire(self, position):
+        if position.model == 'trailing' and position.exit_reason is None:
+            position.max_price = self._peaks(position).level_of(position.pid) or position.max_price
+        self._stale += 1
+        if self._stale > max(64, len(self.positions)):
+            for book in self.books.values():
+                for side in book.sides():
+                    side.compact(self.positions)
+            self._stale = 0
+
+    def _peaks(self, position):
+        return self.books[position.symbol].peaks[1 - position.sl / 100]
+
+    # --- PRICE UPDATES ---
+    def on_price(self, symbol, price):
+        """
+        Applies one price to every position on `symbol`.
+        Returns (activated, exits): positions whose trailing just activated, and closed
+        positions (removed from the book, `exit_reason` set).
+        """
+        book = self.books.get(symbol)
+        if book is None:
+            return [], []
+        alive = self.positions
+        exits = []
+
+        activated = []
+        for pid, _ in book.activation.pop_at_or_below(price):
+            position = alive.get(pid)
+            if position is not None:
+                position.trailing_activated = True
+                activated.append(position)
+
+        for gap, peaks in book.peaks.items():
+            # Crossed: price <= peak * gap  <=>  peak >= price / gap
+            for pid, peak in peaks.pop_at_or_above(price / gap):
+                position = alive.get(pid)
+                if position is not None:
+                    position.max_price = peak
+                    position.exit_reason = "TRAILING STOP" if position.trailing_activated else "STOP LOSS"
+                    exits.append(position)
+            peaks.raise_below(price)
+
+        for side, reason in ((book.long_sl.pop_at_or_above(price), 'STOP LOSS'),
+                             (book.long_tp.pop_at_or_below(price), 'TAKE PROFIT'),
+                             (book.short_sl.pop_at_or_below(price), 'STOP LOSS'),
+                             (book.short_tp.pop_at_or_above(price), 'TAKE PROFIT')):
+            for pid, _ in side:
+                position = alive.get(pid)
+                if position is not None and position.exit_reason is None:
+                    position.exit_reason = reason
+                    exits.append(position)
+
+        for position in exits:
+            del alive[position.pid]
+            self._retire(position)
+        return activated, exits
+
+    def refresh(self, position):
+        """Brings `position.max_price` up to date (O(n) lookup; for display and journaling)."""
+        if position.model == 'trailing' and position.pid in self.positions:
+            position.max_price = self._peaks(position).level_of(position.pid)
+        return position
@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import sys
+import threading
+import time
+
+import ccxt
+import ccxt.async_support as ccxt_async
+
+import config
+from core.markets import MarketCache
+from core.risk import StopBook
+from logic.indicators import IndicatorEngine
+from logic.strategy import rebound_signal
+
+WARMUP_BARS = 1000
+
+
+def kline_weight(limit):
+    """Binance REQUEST_WEIGHT of a klines call (conservative table)."""
+    if limit is None or limit >= 1000:
+        return 10
+    if limit >= 500:
+        return 5
+    if limit >= 100:
+        return 2
+    return 1
+
+
+class WeightBudget:
+    """
+    Token bucket over Binance's per-minute request weight, shared by every symbol.
+    Re-synchronized from the 'x-mbx-used-weight-1m' header of each response.
+    """
+
+    def __init__(self, weight_per_minute=1200):
+        self.capacity = float(weight_per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, weight):
+        async with self._lock:
+            self._refill()
+            while self.tokens < weight:
+                wait = (weight - self.tokens) / self.rate
+                self.waited += wait
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= weight
+
+    def sync_used(self, used):
+        """Exchange says `used` weight is already consumed this minute."""
+        self._refill()
+        self.tokens = min(self.tokens, self.capacity - float(used))
+
+
+class MarketScanner:
+    """
+    Scans many symbols from one process over a single ccxt async session.
+    Runs the run_bot entry / trailing rules per symbol and keeps a per-symbol status table.
+    Paper trading only: positions are tracked at the scanned price, no order is sent
+    (live orders go through run_bot, with client order ids and the journal).
+    """
+
+    def __init__(self, symbols=None, timeframe='1m', mode="testnet", usd_amount=11.0, sl=1.5, tp=3.0,
+                 rsi_threshold=40.0, interval=1.0, weight_per_minute=1200, max_concurrency=10):
+        self.symbols = list(symbols or config.MARKET_PAIRS)
+        self.timeframe = timeframe
+        self.mode = mode
+        self.usd_amount = float(usd_amount)
+        self.sl = float(sl)
+        self.tp = float(tp)
+        self.rsi_threshold = rsi_threshold
+        self.interval = interval
+        self.weight_per_minute = weight_per_minute
+        self.max_concurrency = max_concurrency
+
+        self.engine = IndicatorEngine()
+        self.book = StopBook()  # Trailing stops of every open position, price-indexed per symbol
+        self.positions = {}
+        self.status = {symbol: {'state': 'STARTING', 'price': None, 'rsi': None, 'ema9': None,
+                                'updated': None, 'error': None} for symbol in self.symbols}
+        self.stop_event = threading.Event()
+
+        self.exchange = None
+        self.budget = None
+        self.markets = None
+        self._semaphore = None
+
+    # --- PUBLIC API ---
+    def run(self, stop_event=None):
+        """Blocking entry point. Returns when stop() is called (or `stop_event` is set)."""
+        if stop_event is not None:
+            self.stop_event = stop_event
+        asyncio.run(self.run_async())
+
+    def start(self):
+        """Runs the scanner in a daemon thread."""
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.stop_event.set()
+
+    def snapshot(self):
+        """Copy of the per-symbol status table."""
+        return {symbol: dict(row) for symbol, row in self.status.items()}
+
+    def print_status(self):
+        for symbol, row in self.snapshot().items():
+            price = f"{row['price']:,.4f}" if row['price'] is not None else "-"
+            rsi = f"{row['rsi']:.2f}" if row['rsi'] is not None else "-"
+            print(f"{symbol:<12} | PR: {price:>14} | RSI: {rsi:>6} | {row['state']}")
+        print(f"⏳ RATE-LIMIT WAIT: {self.budget.waited if self.budget else 0.0:.2f}s")
+
+    # --- ASYNC ENGINE ---
+    async def run_async(self):
+        # Public market data only, no credentials needed
+        self.exchange = ccxt_async.binance({
+            # Throttling is done by the shared WeightBudget below
+            'enableRateLimit': False,
+            'options': {
+                'defaultType': 'spot',
+                'adjustForTimeDifference': True
+            }
+        })
+        if self.mode == "testnet":
+            self.exchange.set_sandbox_mode(True)
+        self._watch_weight()
+
+        self.budget = WeightBudget(self.weight_per_minute)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.markets = MarketCache(self.exchange)
+
+        try:
+            await self.budget.acquire(20)
+            self.markets.update_from(await self.exchange.load_markets())
+            for symbol in [s for s in self.symbols if s not in self.markets.rules]:
+                print(f"⚠️ [SCANNER] {symbol} is not listed on this exchange, skipping")
+                self.status[symbol]['state'] = 'UNLISTED'
+                self.symbols.remove(symbol)
+            print(f"🔭 [SCANNER] {len(self.symbols)} symbols | TF: {self.timeframe} | PAPER MODE")
+            await asyncio.gather(*(self._scan_symbol(symbol) for symbol in self.symbols))
+        finally:
+            await self.exchange.close()
+
+    def _watch_weight(self):
+        """
+        Syncs the budget inside ccxt's response hook, from the headers of that very response:
+        exchange.last_response_headers may already belong to another symbol's request by the
+        time an awaiting coroutine resumes.
+        """
+        on_rest_response = self.exchange.on_rest_response
+
+        def sync_weight(status, reason, url, method, headers, body, *args):
+            used = (headers or {}).get('x-mbx-used-weight-1m') or (headers or {}).get('X-MBX-USED-WEIGHT-1M')
+            if used is not None and self.budget is not None:
+                self.budget.sync_used(used)
+            return on_rest_response(status, reason, url, method, headers, body, *args)
+
+        self.exchange.on_rest_response = sync_weight
+
+    async def _request(self, weight, coro_factory):
+        async with self._semaphore:
+            await self.budget.acquire(weight)
+            return await coro_factory()
+
+    async def _scan_symbol(self, symbol):
+        state = self.engine.get_state(symbol, self.timeframe)
+        row = self.status[symbol]
+
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            try:
+                if state.live_ts is None:
+                    limit, since = WARMUP_BARS, None
+                else:
+                    limit, since = 100, state.live_ts
+                bars = await self._request(kline_weight(limit), lambda: self.exchange.fetch_ohlcv(
+                    symbol, timeframe=self.timeframe, since=since, limit=limit))
+
+                if bars:
+                    values = state.feed(bars)
+                    row.update(price=values['close'], rsi=values['rsi'], ema9=values['ema9'],
+                               updated=time.time(), error=None)
+                    await self._evaluate(symbol, values)
+
+            except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+                row.update(state='ERROR', error=str(e))
+            except Exception as e:
+                # One symbol's bug must not end the gather() of all the others
+                error = f"{type(e).__name__}: {e}"
+                if row['error'] != error:  # Printed once, not every cycle
+                    print(f"\n⚠️ [{symbol}] SCAN ERROR: {error}")
+                row.update(state='ERROR', error=error)
+
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def _evaluate(self, symbol, values):
+        row = self.status[symbol]
+        price = values['close']
+        position = self.positions.get(symbol)
+
+        if position is None:
+            row['state'] = 'WAITING'
+            if rebound_signal(values['rsi'], price, values['ema9'], self.rsi_threshold):
+                print(f"\n🎯 [{symbol}] SIGNAL DETECTED: RSI {values['rsi']:.2f} | Price > EMA 9")
+                quantity = self._paper_fill(symbol, self.usd_amount / price, price)
+                if quantity:
+                    self.positions[symbol] = self.book.add_trailing(symbol, price, self.sl, self.tp, quantity=quantity)
+                    row['state'] = 'IN POSITION'
+                    print(f"🟢 [{symbol}] BOUGHT @ {price:,.4f} USDT")
+            return
+
+        activated, exits = self.book.on_price(symbol, price)
+        if activated:
+            print(f"\n🎯 [{symbol}] TP REACHED! Trailing Stop Activated at {self.tp}% profit.")
+        self.book.refresh(position)
+        profit_pct = ((price - position.entry_price) / position.entry_price) * 100
+        drawdown = ((position.max_price - price) / position.max_price) * 100
+        status = "TRAILING ACTIVE" if position.trailing_activated else "WAITING TP"
+        row['state'] = f"POS {profit_pct:+.2f}% | DD {drawdown:.2f}% | {status}"
+
+        if exits:
+            print(f"\n🔴 [{symbol}] SELLING: {position.exit_reason} | Final PnL: {profit_pct:.2f}%")
+            if self._paper_fill(symbol, position.quantity, price):
+                del self.positions[symbol]
+                row['state'] = 'WAITING'
+                print(f"✅ [{symbol}] POSITION CLOSED @ {price:,.4f} USDT")
+            else:
+                # Still held: back into the book with its peak and activation
+                self.positions[symbol] = self.book.add_trailing(
+                    symbol, position.entry_price, self.sl, self.tp, quantity=position.quantity,
+                    max_price=position.max_price, trailing_activated=position.trailing_activated)
+
+    def _paper_fill(self, symbol, raw_amount, price):
+        """Base quantity the exchange would accept for this order, or None if it would reject it."""
+        try:
+            return self.markets.normalize_amount(symbol, raw_amount, price)
+        except (ccxt.NetworkError, ccxt.ExchangeError, ValueError) as e:
+            print(f"\n❌ [{symbol}] Order Error: {e}")
+            return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paper-trade the run_bot rules on many symbols at once")
+    parser.add_argument('symbols', nargs='*', help="Pairs to scan (default: config.MARKET_PAIRS)")
+    parser.add_argument('--timeframe', default='1m')
+    parser.add_argument('--mode', default='testnet', choices=('testnet', 'real'), help="Market data source")
+    parser.add_argument('--interval', type=float, default=1.0, help="Seconds between polls of one symbol")
+    parser.add_argument('--status-every', type=float, default=30.0, help="Seconds between status tables")
+    parser.add_argument('--duration', type=float, help="Stop after this many seconds")
+    args = parser.parse_args(argv)
+
+    scanner = MarketScanner(args.symbols or None, timeframe=args.timeframe, mode=args.mode, interval=args.interval)
+    thread = scanner.start()
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        while thread.is_alive() and (deadline is None or time.monotonic() < deadline):
+            thread.join(args.status_every if deadline is None else min(args.status_every, deadline - time.monotonic()))
+            print()
+            scanner.print_status()
+    except KeyboardInterrupt:
+        pass
+    scanner.stop()
+    thread.join(10.0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import random
+import time
+
+# ccxt errors that mean "slow down" (HTTP 429 / 418); matched by name so ccxt is not imported here
+RATE_LIMIT_ERRORS = ('RateLimitExceeded', 'DDoSProtection')
+
+
+class PollScheduler:
+    """
+    Decides how long a REST polling loop waits before the next fetch.
+    - The forming candle is polled every `forming_interval` seconds while flat
+      (default: 1/60 of the timeframe, at least 1 s: 1 s on 1m, 60 s on 1h) and every
+      `active_interval` seconds while a position or order is open, so stops are
+      checked on fresh prices whatever the timeframe.
+    - A poll is always placed `close_grace` seconds after each candle close (exchange
+      server time), so signals at candle close are not delayed by a long cadence.
+    - Used request weight above `pressure_from` of the limit stretches the cadence;
+      above `pause_from` the loop waits for the next one-minute weight window.
+    - Errors back off exponentially with jitter, capped at `max_backoff`.
+    """
+
+    def __init__(self, timeframe_ms, forming_interval=None, active_interval=1.0, close_grace=0.25, server_time=None,
+                 used_weight=None, weight_limit=1200, pressure_from=0.5, pause_from=0.9, base_backoff=1.0, max_backoff=60.0,
+                 rng=None):
+        self.timeframe_ms = timeframe_ms
+        if forming_interval is None:
+            forming_interval = max(1.0, timeframe_ms / 60_000)
+        self.forming_interval = float(forming_interval)
+        self.active_interval = float(active_interval)
+        self.close_grace = close_grace
+        self.server_time = server_time or (lambda: int(time.time() * 1000))
+        self.used_weight = used_weight or (lambda: None)
+        self.weight_limit = weight_limit
+        self.pressure_from = pressure_from
+        self.pause_from = pause_from
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.rng = rng or random.Random()
+        self.failures = 0
+        self.last_delay = 0.0
+
+    @classmethod
+    def for_client(cls, client_manager, timeframe, **kwargs):
+        """Scheduler wired to a BinanceClient's server clock and used-weight header."""
+        timeframe_ms = client_manager.exchange.parse_timeframe(timeframe) * 1000
+        return cls(timeframe_ms, server_time=client_manager.server_time_ms,
+                   used_weight=client_manager.used_weight, **kwargs)
+
+    def until_close(self, now_ms=None):
+        """Seconds until the current candle closes (server time)."""
+        now_ms = self.server_time() if now_ms is None else now_ms
+        return ((now_ms // self.timeframe_ms + 1) * self.timeframe_ms - now_ms) / 1000
+
+    def next_delay(self, active=False):
+        """Wait after a successful poll; `active` while a position or order is open."""
+        self.failures = 0
+        now_ms = self.server_time()
+        ratio = self._weight_ratio()
+
+        cadence = min(self.forming_interval, self.active_interval) if active else self.forming_interval
+        if ratio > self.pressure_from:
+            # Up to 3x slower as the used weight approaches the limit
+            cadence *= 1 + 2 * (ratio - self.pressure_from) / (1 - self.pressure_from)
+        delay = min(cadence, self.until_close(now_ms) + self.close_grace)
+        if ratio >= self.pause_from:
+            delay = max(delay, self._until_weight_reset(now_ms))
+        self.last_delay = delay
+        return delay
+
+    def failure(self, error=None):
+        """Wait after a failed (or empty) poll: jittered exponential backoff."""
+        self.failures += 1
+        ceiling = min(self.max_backoff, self.base_backoff * 2 ** (self.failures - 1))
+        delay = ceiling / 2 + self.rng.uniform(0, ceiling / 2)
+        rate_limited = error is not None and any(c.__name__ in RATE_LIMIT_ERRORS for c in type(error).__mro__)
+        if rate_limited or self._weight_ratio() >= self.pause_from:
+            delay = max(delay, self._until_weight_reset(self.server_time()))
+        self.last_delay = delay
+        return delay
+
+    def _weight_ratio(self):
+        used = self.used_weight()
+        return used / self.weight_limit if used is not None else 0.0
+
+    def _until_weight_reset(self, now_ms):
+        # Binance's weight counter is per clock minute; jitter spreads bots out after the reset
+        return (60_000 - now_ms % 60_000) / 1000 + self.rng.uniform(0, 1.0)
@@ -0,0 +1,256 @@
+import bisect
+import itertools
+import random
+import time
+from collections import namedtuple
+
+import ccxt
+
+from logic.resample import CandleAggregator, bucket_start
+
+# Result of one run_simulation() call
+SimulationReport = namedtuple('SimulationReport', ['fills', 'iterations', 'wall_seconds', 'virtual_seconds',
+                                                   'balances', 'metrics'])
+
+
+class VirtualClock:
+    """Simulated exchange time in ms. Only moves when someone advances it."""
+
+    def __init__(self, start_ms):
+        self.now_ms = int(start_ms)
+
+    def advance(self, seconds):
+        self.now_ms += int(seconds * 1000)
+
+
+class SimStopEvent:
+    """
+    Stands in for run_bot's stop_event: wait(t) advances the virtual clock by t instead of
+    sleeping, so every wait of the real loop is instant. Set once the clock reaches `end_ms`.
+    """
+
+    def __init__(self, clock, end_ms=None):
+        self.clock = clock
+        self.end_ms = end_ms
+        self._set = False
+
+    def is_set(self):
+        if self.end_ms is not None and self.clock.now_ms >= self.end_ms:
+            self._set = True
+        return self._set
+
+    def set(self):
+        self._set = True
+
+    def wait(self, timeout=None):
+        if timeout:
+            self.clock.advance(timeout)
+        return self.is_set()
+
+
+class SimulatedExchange:
+    """
+    ccxt-compatible exchange replaying recorded or synthetic OHLCV on a virtual clock.
+    Plug it into BinanceClient(exchange=...) and the real engine runs against it unchanged.
+
+    - Candles are revealed up to the clock; the forming candle walks open -> low -> high -> close
+      (open -> high -> low -> close when bearish) so intra-candle prices move like a live feed.
+    - Market orders fill at the current price +/- `slippage` (fraction) and pay `fee_rate`
+      (quote currency). With `partial_fill_prob`, a fill only covers part of the amount.
+    - Every request advances the clock by `latency_ms`.
+    - Higher timeframes (multiples of `timeframe`) are aggregated from the same rows,
+      aligned like Binance candles.
+    - Balances are enforced: overspending raises ccxt.InsufficientFunds like Binance would.
+    """
+
+    precisionMode = ccxt.TICK_SIZE
+    parse_timeframe = staticmethod(ccxt.Exchange.parse_timeframe)
+
+    def __init__(self, rows, symbol='BTC/USDT', timeframe='1m', clock=None, balances=None, fee_rate=0.001,
+                 slippage=0.0005, partial_fill_prob=0.0, min_fill_ratio=0.5, latency_ms=0, step=1e-05,
+                 tick=0.01, min_notional=5.0, seed=0):
+        self.rows = [[int(row[0])] + [float(value) for value in row[1:6]] for row in rows]
+        self.timestamps = [row[0] for row in self.rows]
+        self.symbol = symbol
+        self.base, self.quote = symbol.split('/')
+        self.timeframe = timeframe
+        self.timeframe_ms = self.parse_timeframe(timeframe) * 1000
+        self.clock = clock or VirtualClock(self.timestamps[0])
+        self.balances = dict(balances or {self.quote: 10_000.0})
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.partial_fill_prob = partial_fill_prob
+        self.min_fill_ratio = min_fill_ratio
+        self.latency_ms = latency_ms
+        self.market = {'precision': {'amount': step, 'price': tick},
+                       'limits': {'amount': {'min': step, 'max': 9000.0}, 'cost': {'min': min_notional}}}
+        self.rng = random.Random(seed)
+        self.options = {}
+        self.last_response_headers = {}
+        self.orders = {}
+        self.fills = []
+        self._ids = itertools.count(1)
+
+    @property
+    def end_ms(self):
+        """Clock time at which the last candle has closed."""
+        return self.timestamps[-1] + self.timeframe_ms
+
+    def milliseconds(self):
+        return self.clock.now_ms
+
+    def _request(self):
+        if self.latency_ms:
+            self.clock.advance(self.latency_ms / 1000)
+
+    # --- MARKET DATA ---
+    def _live_index(self):
+        return bisect.bisect_right(self.timestamps, self.clock.now_ms) - 1
+
+    def _forming(self, i):
+        """Row `i` as it looks at the current clock (complete once its candle has closed)."""
+        ts, open_, high, low, close, volume = self.rows[i]
+        f = (self.clock.now_ms - ts) / self.timeframe_ms
+        if f >= 1:
+            return self.rows[i]
+        path = (open_, low, high, close) if close >= open_ else (open_, high, low, close)
+        leg = min(int(f * 3), 2)
+        start, end = path[leg], path[leg + 1]
+        price = start + (end - start) * (f * 3 - leg)
+        seen = path[:leg + 1] + (price,)
+        return [ts, open_, max(seen), min(seen), price, volume * f]
+
+    def load_markets(self, reload=False):
+        return {self.symbol: self.market}
+
+    def fetch_ohlcv(self, symbol, timeframe=None, since=None, limit=None):
+        if timeframe and timeframe != self.timeframe:
+            return self._fetch_resampled(symbol, timeframe, since, limit)
+        self._request()
+        live = self._live_index()
+        if live < 0:
+            return []
+        if since is None:
+            lo = max(0, live + 1 - (limit or 500))
+        else:
+            lo = bisect.bisect_left(self.timestamps, since)
+        hi = live + 1 if since is None or not limit else min(live + 1, lo + limit)
+        rows = self.rows[lo:hi]
+        if rows and hi == live + 1:
+            rows = rows[:-1] + [self._forming(live)]
+        return rows
+
+    def _fetch_resampled(self, symbol, timeframe, since, limit):
+        aggregator = CandleAggregator(timeframe)
+        limit = limit or 500
+        start = since if since is not None else self.clock.now_ms - (limit - 1) * aggregator.size
+        buckets = []
+        for row in self.fetch_ohlcv(symbol, self.timeframe, since=bucket_start(start, aggregator.size,
+                                                                                aggregator.offset)):
+            ts = aggregator.ts
+            bucket = aggregator.update(row)
+            if ts is None or aggregator.ts != ts:
+                buckets.append(bucket)
+            else:
+                buckets[-1] = bucket
+        return buckets[:limit] if since is not None else buckets[-limit:]
+
+    def price(self):
+        live = self._live_index()
+        return self._forming(max(live, 0))[4]
+
+    def fetch_ticker(self, symbol):
+        self._request()
+        return {'symbol': symbol, 'last': self.price(), 'timestamp': self.clock.now_ms}
+
+    # --- ACCOUNT ---
+    def fetch_balance(self):
+        self._request()
+        return {asset: {'free': amount, 'used': 0.0, 'total': amount} for asset, amount in self.balances.items()}
+
+    def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+        self._request()
+        params = params or {}
+        filled = amount
+        if self.partial_fill_prob and self.rng.random() < self.partial_fill_prob:
+            filled = amount * self.rng.uniform(self.min_fill_ratio, 1.0)
+        average = self.price() * (1 + self.slippage if side == 'buy' else 1 - self.slippage)
+        cost = filled * average
+        fee = cost * self.fee_rate
+
+        if side == 'buy':
+            if self.balances.get(self.quote, 0.0) < cost + fee:
+                raise ccxt.InsufficientFunds(f"Simulated: {self.quote} balance too low for {cost + fee:.2f}")
+            self.balances[self.quote] -= cost + fee
+            self.balances[self.base] = self.balances.get(self.base, 0.0) + filled
+        else:
+            if self.balances.get(self.base, 0.0) < filled:
+                raise ccxt.InsufficientFunds(f"Simulated: {self.base} balance too low for {filled}")
+            self.balances[self.base] -= filled
+            self.balances[self.quote] = self.balances.get(self.quote, 0.0) + cost - fee
+
+        order = {
+            'id': str(next(self._ids)), 'clientOrderId': params.get('newClientOrderId'),
+            'timestamp': self.clock.now_ms, 'symbol': symbol, 'type': order_type, 'side': side,
+            'amount': amount, 'filled': filled, 'remaining': amount - filled, 'average': average,
+            'price': average, 'cost': cost, 'fee': {'cost': fee, 'currency': self.quote},
+            'status': 'closed' if filled == amount else 'expired',  # Binance EXPIRED = partial market fill
+        }
+        self.orders[order['id']] = order
+        self.fills.append((self.clock.now_ms, side, filled, average))
+        return order
+
+    def fetch_order(self, order_id, symbol=None, params=None):
+        self._request()
+        order = self.orders.get(order_id)
+        if order is None:
+            client_id = (params or {}).get('origClientOrderId')
+            order = next((o for o in self.orders.values() if client_id and o['clientOrderId'] == client_id), None)
+        if order is None:
+            raise ccxt.OrderNotFound(f"Simulated: unknown order {order_id}")
+        return order
+
+    def fetch_open_orders(self, symbol=None, since=None, limit=None, params=None):
+        self._request()
+        return []  # Market orders settle immediately
+
+    def fetch_closed_orders(self, symbol=None, since=None, limit=None, params=None):
+        self._request()
+        return [order for order in self.orders.values()
+                if (symbol is None or order['symbol'] == symbol) and (since is None or order['timestamp'] >= since)]
+
+
+def run_simulation(rows, bot_config=None, warmup_bars=1000, **exchange_kwargs):
+    """
+    Runs the real run_bot loop over `rows` (ccxt-style OHLCV) on a virtual clock.
+    Starts after `warmup_bars` candles and stops when the data is exhausted.
+    """
+    from core.exchange import BinanceClient
+    from core.metrics import Metrics
+    from main import run_bot
+
+    rows = rows.tolist() if hasattr(rows, 'tolist') else rows
+    start = rows[min(warmup_bars, len(rows) - 1)][0]
+    clock = VirtualClock(start)
+    exchange = SimulatedExchange(rows, clock=clock, **exchange_kwargs)
+    metrics = Metrics()
+    client = BinanceClient(exchange=exchange, metrics=metrics)
+    stop_event = SimStopEvent(clock, end_ms=exchange.end_ms)
+
+    config = {'symbol': exchange.symbol, 'timeframe': exchange.timeframe, 'feed': 'rest', 'store_dir': None,
+              'journal_dir': None, 'async_orders': False,
+              **(bot_config or {}), 'client': client, 'stop_event': stop_event, 'metrics': metrics}
+    wall = time.perf_counter()
+    try:
+        run_bot(config)
+    finally:
+        client.close()
+    iteration = metrics.histograms.get('iteration')
+    return SimulationReport(
+        fills=exchange.fills,
+        iterations=iteration.count if iteration else 0,
+        wall_seconds=time.perf_counter() - wall,
+        virtual_seconds=(clock.now_ms - start) / 1000,
+        balances=dict(exchange.balances),
+        metrics=metrics,
+    )
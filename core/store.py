@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+DTYPES = {'timestamp': np.int64, 'open': np.float64, 'high': np.float64,
+          'low': np.float64, 'close': np.float64, 'volume': np.float64}
+
+
+class OHLCVStore:
+    """
+    Append-only columnar OHLCV store on disk.
+    One raw little-endian file per column under <root>/<SYMBOL>/<timeframe>/,
+    read back through np.memmap so range reads are zero-copy NumPy views.
+    Only closed candles belong here; the live candle stays in memory.
+    """
+
+    def __init__(self, root="data/ohlcv"):
+        self.root = root
+        self._checked = set()
+        self._maps = {}
+
+    def _dir(self, symbol, timeframe):
+        return os.path.join(self.root, symbol.replace('/', '_'), timeframe)
+
+    def _path(self, symbol, timeframe, column):
+        return os.path.join(self._dir(symbol, timeframe), f"{column}.bin")
+
+    def _repair(self, symbol, timeframe):
+        """A crash mid-append can leave columns of different lengths; cut back to whole rows."""
+        key = (symbol, timeframe)
+        if key in self._checked:
+            return
+        os.makedirs(self._dir(symbol, timeframe), exist_ok=True)
+        sizes = {}
+        for column in COLUMNS:
+            path = self._path(symbol, timeframe, column)
+            if not os.path.exists(path):
+                open(path, 'wb').close()
+            sizes[column] = os.path.getsize(path)
+        rows = min(size // np.dtype(DTYPES[column]).itemsize for column, size in sizes.items())
+        for column in COLUMNS:
+            # Also drops a half-written value at the end of a column that is otherwise whole
+            if sizes[column] != rows * np.dtype(DTYPES[column]).itemsize:
+                with open(self._path(symbol, timeframe, column), 'r+b') as f:
+                    f.truncate(rows * np.dtype(DTYPES[column]).itemsize)
+        self._checked.add(key)
+
+    # --- WRITE ---
+    def append(self, symbol, timeframe, bars):
+        """Appends OHLCV rows newer than the last stored candle. Returns how many were written."""
+        self._repair(symbol, timeframe)
+        last = self.last_timestamp(symbol, timeframe)
+        rows = sorted((bar for bar in bars if last is None or bar[0] > last), key=lambda bar: bar[0])
+        if not rows:
+            return 0
+
+        # Drop duplicates inside the batch itself
+        unique = [rows[0]]
+        for bar in rows[1:]:
+            if bar[0] != unique[-1][0]:
+                unique.append(bar)
+
+        # Timestamp column last: a row only "exists" once its timestamp is written
+        for i in (1, 2, 3, 4, 5, 0):
+            column = COLUMNS[i]
+            values = np.array([bar[i] for bar in unique], dtype=DTYPES[column])
+            with open(self._path(symbol, timeframe, column), 'ab') as f:
+                f.write(values.tobytes())
+        return len(unique)
+
+    # --- READ ---
+    def count(self, symbol, timeframe):
+        self._repair(symbol, timeframe)
+        return os.path.getsize(self._path(symbol, timeframe, 'timestamp')) // 8
+
+    def last_timestamp(self, symbol, timeframe):
+        n = self.count(symbol, timeframe)
+        if n == 0:
+            return None
+        with open(self._path(symbol, timeframe, 'timestamp'), 'rb') as f:
+            f.seek((n - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype=np.int64)[0])
+
+    def _columns(self, symbol, timeframe):
+        n = self.count(symbol, timeframe)
+        key = (symbol, timeframe)
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == n:
+            return cached[1]
+        if n == 0:
+            columns = {column: np.empty(0, dtype=DTYPES[column]) for column in COLUMNS}
+        else:
+            columns = {column: np.memmap(self._path(symbol, timeframe, column), dtype=DTYPES[column],
+                                         mode='r', shape=(n,)) for column in COLUMNS}
+        self._maps[key] = (n, columns)
+        return columns
+
+    def read(self, symbol, timeframe, start=None, end=None):
+        """Dict of zero-copy column views with start <= timestamp < end (ms)."""
+        columns = self._columns(symbol, timeframe)
+        ts = columns['timestamp']
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side='left'))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side='left'))
+        return {column: values[lo:hi] for column, values in columns.items()}
+
+    def tail(self, symbol, timeframe, n):
+        """Dict of zero-copy views over the last `n` stored candles."""
+        columns = self._columns(symbol, timeframe)
+        return {column: values[-n:] if n else values[:0] for column, values in columns.items()}
+
+    def rows(self, symbol, timeframe, n):
+        """Last `n` candles as ccxt-style rows (for feeding the indicator engine)."""
+        cols = self.tail(symbol, timeframe, n)
+        return [list(row) for row in zip(cols['timestamp'].tolist(), cols['open'].tolist(), cols['high'].tolist(),
+                                         cols['low'].tolist(), cols['close'].tolist(), cols['volume'].tolist())]
+
+    def load_frame(self, symbol, timeframe, start=None, end=None):
+        """Copies a range into a get_klines()-style DataFrame (only when pandas is really needed)."""
+        import pandas as pd
+
+        cols = self.read(symbol, timeframe, start, end)
+        df = pd.DataFrame({column: np.array(values) for column, values in cols.items()})
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        return df
@@ -0,0 +1,281 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import namedtuple
+
+import ccxt
+
+# kind: 'kline' (data = OHLCV row) or 'ticker' (data = ccxt ticker dict)
+StreamEvent = namedtuple('StreamEvent', ['kind', 'symbol', 'timeframe', 'data'])
+
+
+class CcxtProTransport:
+    """
+    Websocket transport backed by ccxt.pro (watch_ohlcv / watch_ticker).
+    Runs its own asyncio loop inside the feed thread.
+    """
+
+    def __init__(self, api_key="", secret_key="", mode="testnet"):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.mode = mode
+        self.loop = None
+        self.exchange = None
+        self.tasks = {}
+
+    def connect(self, subscriptions):
+        import ccxt.pro as ccxtpro
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.exchange = ccxtpro.binance({
+            'apiKey': self.api_key,
+            'secret': self.secret_key,
+            'enableRateLimit': True,
+            'options': {
+                'defaultType': 'spot',
+                'adjustForTimeDifference': True
+            }
+        })
+        if self.mode == "testnet":
+            self.exchange.set_sandbox_mode(True)
+
+        self.tasks = {}
+        for sub in subscriptions:
+            self._schedule(sub)
+
+    def _schedule(self, sub):
+        kind, symbol, timeframe = sub
+        if kind == 'kline':
+            coro = self.exchange.watch_ohlcv(symbol, timeframe)
+        else:
+            coro = self.exchange.watch_ticker(symbol)
+        self.tasks[self.loop.create_task(coro)] = sub
+
+    def recv(self, timeout=1.0):
+        """Waits for the next pushes. Raises ConnectionError when the socket drops."""
+        if not self.tasks:
+            time.sleep(timeout)
+            return []
+
+        done, _ = self.loop.run_until_complete(
+            asyncio.wait(list(self.tasks), timeout=timeout, return_when=asyncio.FIRST_COMPLETED))
+
+        messages = []
+        for task in done:
+            kind, symbol, timeframe = self.tasks.pop(task)
+            try:
+                result = task.result()
+            except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+                raise ConnectionError(str(e)) from e
+
+            if kind == 'kline':
+                for bar in result:
+                    messages.append(StreamEvent('kline', symbol, timeframe, bar))
+            else:
+                messages.append(StreamEvent('ticker', symbol, None, result))
+            self._schedule((kind, symbol, timeframe))
+        return messages
+
+    def close(self):
+        if self.loop is None:
+            return
+        for task in self.tasks:
+            task.cancel()
+        try:
+            if self.tasks:
+                self.loop.run_until_complete(asyncio.gather(*self.tasks, return_exceptions=True))
+            self.loop.run_until_complete(self.exchange.close())
+        except Exception:
+            pass
+        self.loop.close()
+        self.loop = None
+        self.tasks = {}
+
+
+class ReplayTransport:
+    """
+    Offline transport that replays a recorded list of StreamEvents.
+    A None entry simulates a dropped connection (recv raises ConnectionError once).
+    """
+
+    def __init__(self, messages, interval=0.0):
+        self.messages = list(messages)
+        self.interval = interval
+        self.position = 0
+        self.connects = 0
+
+    def connect(self, subscriptions):
+        self.connects += 1
+
+    def recv(self, timeout=1.0):
+        if self.position >= len(self.messages):
+            time.sleep(timeout)
+            return []
+
+        message = self.messages[self.position]
+        self.position += 1
+        if message is None:
+            raise ConnectionError("replay disconnect")
+        if self.interval:
+            time.sleep(self.interval)
+        return [message]
+
+    def close(self):
+        pass
+
+
+class MarketStream:
+    """
+    Push-based market data feed.
+    Events are delivered to registered callbacks and to the `events` queue.
+    Reconnects automatically and backfills missed candles through REST (`since=`).
+    `failures` counts the connections in a row that dropped before delivering anything
+    and silent_for() the seconds since the last event: a consumer can give up on a dead
+    feed with them.
+    """
+
+    def __init__(self, transport, rest_client=None, reconnect_delay=1.0, max_reconnect_delay=30.0,
+                 backfill_page=1000):
+        self.transport = transport
+        self.rest_client = rest_client
+        self.backfill_page = backfill_page  # Binance returns at most 1000 klines per request
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.events = queue.Queue()
+        self.listeners = []
+        self.subscriptions = []
+        self.last_kline_ts = {}
+        self.last_price = {}
+
+        self.running = False
+        self.connected = False
+        self.reconnects = 0
+        self.failures = 0
+        self.last_event = None
+        self.started_at = None
+        self._thread = None
+
+    # --- SUBSCRIPTIONS ---
+    def subscribe_klines(self, symbol, timeframe, since=None):
+        """`since` is the last candle already known locally, used for the first backfill."""
+        sub = ('kline', symbol, timeframe)
+        if sub not in self.subscriptions:
+            self.subscriptions.append(sub)
+        if since is not None:
+            self.last_kline_ts[(symbol, timeframe)] = since
+
+    def subscribe_ticker(self, symbol):
+        sub = ('ticker', symbol, None)
+        if sub not in self.subscriptions:
+            self.subscriptions.append(sub)
+
+    def add_listener(self, callback):
+        """callback(event) is called from the feed thread for every event."""
+        self.listeners.append(callback)
+
+    # --- LIFECYCLE ---
+    def start(self):
+        if self.running:
+            return self
+        self.running = True
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll(self, timeout=1.0):
+        """Blocks up to `timeout` for the first event, then drains whatever is queued."""
+        try:
+            batch = [self.events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                batch.append(self.events.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def latest_price(self, symbol):
+        return self.last_price.get(symbol)
+
+    @property
+    def alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def silent_for(self):
+        """Seconds since the last pushed event (since start() before the first one)."""
+        return time.monotonic() - (self.last_event or self.started_at or time.monotonic())
+
+    # --- FEED THREAD ---
+    def _run(self):
+        delay = self.reconnect_delay
+        while self.running:
+            try:
+                self.transport.connect(list(self.subscriptions))
+                self.connected = True
+                self._backfill()
+                delay = self.reconnect_delay
+
+                while self.running:
+                    for event in self.transport.recv(timeout=1.0):
+                        self.failures = 0
+                        self.last_event = time.monotonic()
+                        self._dispatch(event)
+
+            except (ConnectionError, ccxt.NetworkError) as e:
+                self.failures += 1
+                print(f"\n⚠️ STREAM DISCONNECTED: {e} | Reconnecting in {delay:.0f}s")
+            except Exception as e:
+                self.failures += 1
+                print(f"\n⚠️ STREAM ERROR: {e} | Reconnecting in {delay:.0f}s")
+            finally:
+                self.connected = False
+                self.transport.close()
+
+            if self.running:
+                self.reconnects += 1
+                time.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _backfill(self):
+        """Replays every candle since the last one seen, so disconnects leave no gaps."""
+        if self.rest_client is None:
+            return
+        for kind, symbol, timeframe in self.subscriptions:
+            if kind != 'kline':
+                continue
+            since = self.last_kline_ts.get((symbol, timeframe))
+            while since is not None:
+                # Page by page: a long outage spans more candles than one request returns
+                bars = self.rest_client.get_ohlcv(symbol, timeframe, limit=self.backfill_page, since=since)
+                for bar in bars or []:
+                    self._dispatch(StreamEvent('kline', symbol, timeframe, bar))
+                if not bars or len(bars) < self.backfill_page:
+                    break
+                since = bars[-1][0] + 1
+
+    def _dispatch(self, event):
+        if event.kind == 'kline':
+            key = (event.symbol, event.timeframe)
+            last = self.last_kline_ts.get(key)
+            if last is None or event.data[0] >= last:
+                self.last_kline_ts[key] = event.data[0]
+            self.last_price[event.symbol] = float(event.data[4])
+        elif event.kind == 'ticker' and event.data.get('last') is not None:
+            self.last_price[event.symbol] = float(event.data['last'])
+
+        self.events.put(event)
+        for callback in self.listeners:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"\n⚠️ STREAM LISTENER ERROR: {e}")
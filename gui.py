@@ -5,6 +5,10 @@ import os
 import json
 import importlib.util
 
+import config
+from core.explorer import MarketExplorer
+from core.logsink import LogSink
+
 
 def load_run_bot():
     """ Dynamically loads the trading logic from main.py. """
@@ -21,33 +25,102 @@ except (ImportError, AttributeError, FileNotFoundError) as e:
     print(f"CRITICAL: Failed to load main.py: {e}")
     sys.exit(1)
 
+LOG_FPS = 20  # Terminal redraws per second
+LOG_MAX_LINES = 2000  # Lines kept in the terminal widget
+MARKET_FPS = 4  # Explorer refreshes per second (only changed labels are touched)
+MARKET_ROWS = 7  # Row widgets in the explorer; scrolling rebinds them to other pairs
+SIGNAL_STYLES = {'BUY': ("BUY", "#81C784"), 'OVERSOLD': ("RSI↓", "#FFB74D"), '': ("", "#555555")}
+
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
+def format_price(price):
+    if price is None:
+        return "…"
+    if price >= 100:
+        return f"{price:,.2f}"
+    if price >= 1:
+        return f"{price:.4f}"
+    return f"{price:.8f}".rstrip("0")
+
+
+class MarketRow:
+    """
+    One reusable Market Explorer row. The list only owns MARKET_ROWS of them: scrolling
+    and re-sorting rebind rows to other pairs, and every update only configures the
+    widgets whose text or color actually changed.
+    """
+
+    def __init__(self, parent, app):
+        self.app = app
+        self.pair = None
+        self._shown = {}
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent", height=26)
+        self.frame.pack(fill="x", pady=1)
+        self.star = ctk.CTkButton(self.frame, text="★", width=22, height=24, fg_color="transparent",
+                                  command=lambda: self.pair and self.app.toggle_favorite(self.pair))
+        self.star.pack(side="left", padx=(2, 0))
+        self.name = ctk.CTkButton(self.frame, text="", anchor="w", width=84, height=24, fg_color="transparent",
+                                  command=lambda: self.pair and self.app.select_pair(self.pair))
+        self.name.pack(side="left")
+        self.price = ctk.CTkLabel(self.frame, text="", width=74, anchor="e", font=("Consolas", 11))
+        self.price.pack(side="left")
+        self.change = ctk.CTkLabel(self.frame, text="", width=54, anchor="e", font=("Consolas", 11))
+        self.change.pack(side="left")
+        self.signal = ctk.CTkLabel(self.frame, text="", width=34, font=("Arial", 10, "bold"))
+        self.signal.pack(side="left", padx=(2, 0))
+        for widget in (self.frame, self.star, self.name, self.price, self.change, self.signal):
+            app.bind_market_wheel(widget)
+
+    def _patch(self, widget, key, **options):
+        if self._shown.get(key) != options:
+            widget.configure(**options)
+            self._shown[key] = options
+
+    def bind(self, item, quote):
+        self.pair = item["pair"] if item else None
+        self._patch(self.star, 'star', text="★" if item else "",
+                    text_color="#FFD700" if item and item["fav"] else "#555555")
+        self._patch(self.name, 'name', text=self.pair or "")
+        self.show(quote)
+
+    def show(self, quote):
+        if quote is None:
+            self._patch(self.price, 'price', text="")
+            self._patch(self.change, 'change', text="")
+            self._patch(self.signal, 'signal', text="")
+            return
+        self._patch(self.price, 'price', text=format_price(quote.last))
+        change = quote.change_pct
+        self._patch(self.change, 'change', text="" if change is None else f"{change:+.2f}%",
+                    text_color="#81C784" if (change or 0) >= 0 else "#E57373")
+        text, color = SIGNAL_STYLES.get(quote.signal, SIGNAL_STYLES[''])
+        self._patch(self.signal, 'signal', text=text, text_color=color)
+
+
 class ZenvoTerminal:
     def __init__(self):
         self.root = ctk.CTk()
         self.root.title("ZENVO Core")
         self.root.geometry("900x750")
         self.bot_running = False
+        self.stop_event = None
         self.fav_file = "favorites.json"
+        self.log_sink = LogSink(file_path=config.LOG_FILE)
 
-        self.market_data = [
-            {"pair": "BTC/USDT", "fav": False}, {"pair": "ETH/USDT", "fav": False},
-            {"pair": "BNB/USDT", "fav": False}, {"pair": "SOL/USDT", "fav": False},
-            {"pair": "XRP/USDT", "fav": False}, {"pair": "ADA/USDT", "fav": False},
-            {"pair": "AVAX/USDT", "fav": False}, {"pair": "DOGE/USDT", "fav": False},
-            {"pair": "DOT/USDT", "fav": False}, {"pair": "MATIC/USDT", "fav": False},
-            {"pair": "LINK/USDT", "fav": False}, {"pair": "SHIB/USDT", "fav": False},
-            {"pair": "LTC/USDT", "fav": False}, {"pair": "TRX/USDT", "fav": False},
-            {"pair": "NEAR/USDT", "fav": False}, {"pair": "ATOM/USDT", "fav": False},
-            {"pair": "UNI/USDT", "fav": False}, {"pair": "ICP/USDT", "fav": False},
-            {"pair": "APT/USDT", "fav": False}, {"pair": "OP/USDT", "fav": False}
-        ]
+        self.market_data = [{"pair": pair, "fav": False} for pair in config.MARKET_PAIRS]
+        self.market_order = []
+        self.market_rows = []
+        self.market_offset = 0
+        self.market_version = 0
+        self.explorer = MarketExplorer(config.MARKET_PAIRS, timeframe="1m")
 
         self.load_favorites()
         self._build_ui()
+        self.explorer.start()
+        self.pump_market()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def load_favorites(self):
         if os.path.exists(self.fav_file):
@@ -74,43 +147,77 @@ class ZenvoTerminal:
         self.render_market_list()
 
     def render_market_list(self):
-        for widget in self.market_scroll.winfo_children():
-            widget.destroy()
-        sorted_list = sorted(self.market_data, key=lambda x: (not x['fav'], x['pair']))
-        for item in sorted_list:
-            frame = ctk.CTkFrame(self.market_scroll, fg_color="transparent")
-            frame.pack(fill="x", pady=1)
-            star_color = "#FFD700" if item["fav"] else "#555555"
-            ctk.CTkButton(frame, text="★", width=25, height=25, fg_color="transparent",
-                          text_color=star_color, command=lambda p=item["pair"]: self.toggle_favorite(p)).pack(
-                side="left", padx=2)
-            ctk.CTkButton(frame, text=item["pair"], anchor="w", fg_color="transparent", height=25,
-                          command=lambda p=item["pair"]: self.select_pair(p)).pack(side="left", fill="x", expand=True)
+        """Sorts favorites first and rebinds the row pool to the visible slice (no widget is recreated)."""
+        self.market_order = sorted(self.market_data, key=lambda x: (not x['fav'], x['pair']))
+        self.show_market_rows()
+
+    def show_market_rows(self):
+        total = len(self.market_order)
+        self.market_offset = max(0, min(self.market_offset, total - len(self.market_rows)))
+        visible = self.market_order[self.market_offset:self.market_offset + len(self.market_rows)]
+        quotes = self.explorer.quotes
+        for i, row in enumerate(self.market_rows):
+            item = visible[i] if i < len(visible) else None
+            row.bind(item, quotes.get(item["pair"]) if item else None)
+        self.explorer.focus([item["pair"] for item in visible])
+        if total:
+            self.market_scrollbar.set(self.market_offset / total, (self.market_offset + len(visible)) / total)
+
+    def scroll_market(self, action, amount, unit=None):
+        """Scrollbar protocol: ('moveto', fraction) or ('scroll', n, 'units' | 'pages')."""
+        if action == "moveto":
+            self.market_offset = round(float(amount) * len(self.market_order))
+        else:
+            step = len(self.market_rows) if unit == "pages" else 1
+            self.market_offset += int(amount) * step
+        self.show_market_rows()
+
+    def bind_market_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll_market("scroll", -1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll_market("scroll", -1))
+        widget.bind("<Button-5>", lambda e: self.scroll_market("scroll", 1))
+
+    def pump_market(self):
+        """Patches the visible rows whose quote changed, MARKET_FPS times per second (Tk thread)."""
+        self.market_version, changed = self.explorer.changes(self.market_version)
+        if changed:
+            for row in self.market_rows:
+                if row.pair in changed:
+                    row.show(changed[row.pair])
+        self.root.after(1000 // MARKET_FPS, self.pump_market)
 
     def select_pair(self, pair):
         self.symbol_input.delete(0, "end")
         self.symbol_input.insert(0, pair)
 
-    def write_to_terminal(self, message):
+    def pump_logs(self):
         """
-        Improved terminal output to prevent status line disappearing.
+        Drains the log sink into the textbox on the Tk thread, LOG_FPS times per second.
+        The trading thread only ever appends to the sink.
         """
-        if self.log_box and self.log_box.winfo_exists():
+        committed, current, changed = self.log_sink.drain()
+        if changed and self.log_box and self.log_box.winfo_exists():
             self.log_box.configure(state="normal")
 
-            # Detects \r which means we update the same line
-            if message.startswith("\r"):
-                # Delete only the last line content
-                self.log_box.delete("end-2l", "end-1c")
-                self.log_box.insert("end", "\n" + message.strip())
+            # The last line of the box is always the live (status) line: replace it
+            self.log_box.delete("end-1c linestart", "end-1c")
+            if committed:
+                self.log_box.insert("end", "\n".join(committed) + "\n" + current)
             else:
-                self.log_box.insert("end", message)
+                self.log_box.insert("end", current)
+
+            # Keep memory flat on multi-day sessions
+            excess = int(self.log_box.index("end-1c").split(".")[0]) - LOG_MAX_LINES
+            if excess > 0:
+                self.log_box.delete("1.0", f"{excess + 1}.0")
 
             self.log_box.configure(state="disabled")
             # Only scroll to end for new logs, not for repetitive updates
-            if not message.startswith("\r"):
+            if committed:
                 self.log_box.see("end")
 
+        self.root.after(1000 // LOG_FPS, self.pump_logs)
+
     def _build_ui(self):
         self.root.grid_columnconfigure(1, weight=1)
         self.root.grid_rowconfigure(0, weight=1)
@@ -131,8 +238,13 @@ class ZenvoTerminal:
 
         # TÍTULO MARKET EXPLORER (AGRANDADO)
         ctk.CTkLabel(self.sidebar, text="MARKET EXPLORER", font=("Arial", 16, "bold")).pack(pady=(15, 0))
-        self.market_scroll = ctk.CTkScrollableFrame(self.sidebar, width=250, height=150, fg_color="#101010")
-        self.market_scroll.pack(pady=5, padx=10)
+        market_box = ctk.CTkFrame(self.sidebar, fg_color="#101010")
+        market_box.pack(pady=5, padx=10, fill="x")
+        self.market_scrollbar = ctk.CTkScrollbar(market_box, command=self.scroll_market)
+        self.market_scrollbar.pack(side="right", fill="y")
+        market_rows = ctk.CTkFrame(market_box, fg_color="transparent")
+        market_rows.pack(side="left", fill="both", expand=True)
+        self.market_rows = [MarketRow(market_rows, self) for _ in range(MARKET_ROWS)]
         self.render_market_list()
 
         # Input Pair
@@ -142,7 +254,8 @@ class ZenvoTerminal:
 
         # TÍTULO TIMEFRAME (AGRANDADO)
         ctk.CTkLabel(self.sidebar, text="TIMEFRAME", font=("Arial", 14, "bold")).pack(pady=(5, 0))
-        self.timeframe_option = ctk.CTkOptionMenu(self.sidebar, values=["1m", "3m", "5m", "15m", "1h"], width=260)
+        self.timeframe_option = ctk.CTkOptionMenu(self.sidebar, values=["1m", "3m", "5m", "15m", "1h"], width=260,
+                                                  command=self.explorer.set_timeframe)
         self.timeframe_option.set("1m")
         self.timeframe_option.pack(pady=5)
 
@@ -186,13 +299,15 @@ class ZenvoTerminal:
                                       font=("Consolas", 12))
         self.log_box.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
 
-        sys.stdout.write = self.write_to_terminal
+        sys.stdout = self.log_sink
+        self.pump_logs()
 
     def start_bot(self):
         self.bot_running = True
+        self.stop_event = threading.Event()
         self.start_btn.configure(state="disabled")
         self.stop_btn.configure(state="normal")
-        config = {
+        bot_config = {
             'api_key': self.api_key.get(),
             'secret_key': self.secret_key.get(),
             'symbol': self.symbol_input.get(),
@@ -201,15 +316,27 @@ class ZenvoTerminal:
             'sl': self.sl_input.get(),
             'tp': self.tp_input.get(),
             'mode': "real" if self.mode_switch.get() == 1 else "testnet",
-            'instance': self
+            'instance': self,
+            'stop_event': self.stop_event,
+            'metrics_port': config.METRICS_PORT,
+            'metrics_summary': config.METRICS_SUMMARY_INTERVAL
         }
-        threading.Thread(target=run_bot_func, args=(config,), daemon=True).start()
+        threading.Thread(target=run_bot_func, args=(bot_config,), daemon=True).start()
 
     def stop_bot(self):
         self.bot_running = False
+        if self.stop_event is not None:
+            self.stop_event.set()
         self.start_btn.configure(state="normal")
         self.stop_btn.configure(state="disabled")
 
+    def on_close(self):
+        self.stop_bot()
+        self.explorer.stop()
+        sys.stdout = sys.__stdout__
+        self.log_sink.close()
+        self.root.destroy()
+
 
 if __name__ == "__main__":
     ZenvoTerminal().root.mainloop()
\ No newline at end of file
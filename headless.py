@@ -0,0 +1,269 @@
+"""
+Headless engine runner (no Tk, no display).
+
+    python headless.py bots.json [--workers 4] [--log-dir logs] [--duration 3600] [--shared-feeds]
+
+Python API:
+
+    runner = BotRunner()
+    runner.start("btc", {'symbol': 'BTC/USDT', 'timeframe': '1m', 'sl': 1.5, 'tp': 3.0})
+    ...
+    runner.stop()
+"""
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+
+from core.logsink import LogSink
+
+DEFAULT_BOT = {'mode': 'testnet', 'timeframe': '1m', 'usd_amount': 11.0, 'sl': 1.5, 'tp': 3.0}
+
+
+def load_bot_configs(path):
+    """
+    Reads a bots file: {"defaults": {...}, "bots": [{"name": ..., "symbol": ...}, ...]}.
+    Credentials default to the BINANCE_API_KEY / BINANCE_SECRET_KEY environment (.env).
+    """
+    import config
+
+    with open(path) as f:
+        spec = json.load(f)
+    defaults = {**DEFAULT_BOT, 'api_key': config.API_KEY, 'secret_key': config.SECRET_KEY,
+                **spec.get('defaults', {})}
+
+    bots = []
+    for i, bot in enumerate(spec.get('bots', [])):
+        merged = {**defaults, **bot}
+        merged.setdefault('name', f"{merged.get('symbol', 'BOT')}-{merged['timeframe']}-{i}")
+        bots.append(merged)
+    return bots
+
+
+class BotOutput:
+    """
+    Stands in for sys.stdout: print() from a bot thread goes to that bot's LogSink,
+    everything else to the real stream. pump() copies finished lines to the console
+    as '[name] line' (the '\\r' status lines stay in the sink).
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.sinks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, sink):
+        with self._lock:
+            self.sinks[threading.get_ident()] = (name, sink)
+
+    def unregister(self):
+        """Called by the bot thread on exit: flushes its last lines and detaches the sink."""
+        with self._lock:
+            entry = self.sinks.pop(threading.get_ident(), None)
+            if entry is not None:
+                entry[1].write("\n")
+                self._emit(*entry)
+                entry[1].close()
+
+    def write(self, message):
+        entry = self.sinks.get(threading.get_ident())
+        if entry is not None:
+            return entry[1].write(message)
+        return self.stream.write(message)
+
+    def flush(self):
+        self.stream.flush()
+
+    def isatty(self):
+        return False
+
+    def pump(self):
+        with self._lock:
+            for name, sink in self.sinks.values():
+                self._emit(name, sink)
+        self.stream.flush()
+
+    def _emit(self, name, sink):
+        committed, _, _ = sink.drain()
+        for line in committed:
+            if line:
+                self.stream.write(f"[{name}] {line}\n")
+
+
+class BotRunner:
+    """
+    Runs many run_bot instances in one process, each in its own thread with its own stop event.
+    The engine (and with it ccxt) is only imported when the first bot starts.
+    Bots of the same account share one exchange client: one load_markets() and one market
+    metadata thread per process, and one throttle for the account's request weight.
+    """
+
+    def __init__(self, log_dir=None, pump_interval=0.5):
+        self.log_dir = log_dir
+        self.pump_interval = pump_interval
+        self.bots = {}
+        self.clients = {}
+        self.output = None
+        self._pump_stop = threading.Event()
+        self._clients_lock = threading.Lock()
+
+    def client_for(self, bot_config):
+        """The shared BinanceClient of the bot's account (built by the first bot that needs it)."""
+        key = (bot_config.get('api_key'), bot_config.get('secret_key'), bot_config.get('mode', 'testnet'))
+        with self._clients_lock:
+            client = self.clients.get(key)
+            if client is None:
+                from core.exchange import BinanceClient
+                client = self.clients[key] = BinanceClient(api_key=key[0], secret_key=key[1], mode=key[2])
+            return client
+
+    def _install_output(self):
+        if self.output is not None:
+            return
+        if self.log_dir:
+            os.makedirs(self.log_dir, exist_ok=True)
+        self.output = BotOutput(sys.stdout)
+        sys.stdout = self.output
+        threading.Thread(target=self._pump_loop, daemon=True).start()
+
+    def _pump_loop(self):
+        while not self._pump_stop.wait(self.pump_interval):
+            self.output.pump()
+
+    def start(self, name, bot_config):
+        """Starts one bot. Returns its stop event."""
+        if name in self.bots:
+            raise ValueError(f"Bot '{name}' is already running")
+        from main import run_bot
+
+        self._install_output()
+        stop_event = threading.Event()
+        file_path = os.path.join(self.log_dir, f"{name.replace('/', '_')}.log") if self.log_dir else None
+        sink = LogSink(file_path=file_path)
+
+        def target():
+            self.output.register(name, sink)
+            try:
+                client = bot_config.get('client')
+                if client is None:
+                    client = self.client_for(bot_config)
+                run_bot({'bot_id': name, **bot_config, 'client': client, 'stop_event': stop_event})
+            except Exception as e:
+                print(f"\n❌ CRITICAL ERROR: {e}")
+            finally:
+                self.output.unregister()
+
+        thread = threading.Thread(target=target, name=f"bot-{name}", daemon=True)
+        self.bots[name] = (thread, stop_event)
+        thread.start()
+        return stop_event
+
+    def stop(self, name=None, timeout=10.0):
+        """Stops one bot (or all of them) and waits for the threads to finish."""
+        names = [name] if name else list(self.bots)
+        for bot in names:
+            self.bots[bot][1].set()
+        for bot in names:
+            thread, _ = self.bots.pop(bot)
+            thread.join(timeout)
+        if not self.bots:
+            for client in self.clients.values():
+                client.close()
+            self.clients = {}
+        if not self.bots and self.output is not None:
+            self._pump_stop.set()
+            self.output.pump()
+
+    def running(self):
+        return [name for name, (thread, _) in self.bots.items() if thread.is_alive()]
+
+    def wait(self, stop_event, duration=None):
+        """Blocks until `stop_event` is set, `duration` elapses or every bot has exited."""
+        deadline = time.monotonic() + duration if duration else None
+        while not stop_event.wait(0.5):
+            if deadline and time.monotonic() >= deadline:
+                break
+            if not self.running():
+                break
+
+
+def run_group(bots, log_dir, stop_event, duration=None):
+    """Runs a list of bot configs in this process until `stop_event` is set."""
+    runner = BotRunner(log_dir=log_dir)
+    started = time.perf_counter()
+    for bot in bots:
+        runner.start(bot['name'], bot)
+    print(f"⚡ [HEADLESS pid {os.getpid()}] {len(bots)} bots started in "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms")
+    runner.wait(stop_event, duration)
+    runner.stop()
+
+
+def share_feeds(bots, hub):
+    """Points every bot at one shared feed per symbol/timeframe (see core.fanout) and starts the feeds."""
+    for bot in bots:
+        bot['shared_feed'] = hub.feed_for(bot.get('symbol', 'BTC/USDT'), bot['timeframe'], bot)
+    hub.start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Zenvo bots without the GUI")
+    parser.add_argument('bots', help="JSON file with 'defaults' and a 'bots' list")
+    parser.add_argument('--workers', type=int, default=1, help="Processes to spread the bots over")
+    parser.add_argument('--log-dir', help="Write one log file per bot here")
+    parser.add_argument('--duration', type=float, help="Stop after this many seconds")
+    parser.add_argument('--shared-feeds', action='store_true',
+                        help="One 1m feed process per symbol, resampled into every timeframe its bots use")
+    args = parser.parse_args(argv)
+
+    bots = load_bot_configs(args.bots)
+    if not bots:
+        print("⚠️ No bots defined")
+        return 1
+
+    print(f"⚡ [HEADLESS] {len(bots)} bots | {args.workers} worker(s) | "
+          f"start-up {(time.perf_counter() - _T0) * 1000:.1f} ms")
+
+    hub = None
+    if args.shared_feeds:
+        from core.fanout import FeedHub
+
+        hub = FeedHub()
+        share_feeds(bots, hub)
+        print(f"📡 [HEADLESS] {len(hub.workers)} feed process(es), {len(hub.rings)} timeframe(s) for {len(bots)} bots")
+
+    try:
+        if args.workers <= 1:
+            stop_event = threading.Event()
+            signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+            signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+            run_group(bots, args.log_dir, stop_event, args.duration)
+            return 0
+
+        # Handlers are installed before forking so Ctrl+C in any process stops them all
+        stop_event = multiprocessing.Event()
+        signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+
+        groups = [bots[i::args.workers] for i in range(args.workers)]
+        workers = [multiprocessing.Process(target=run_group, args=(group, args.log_dir, stop_event, args.duration))
+                   for group in groups if group]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return 0
+    finally:
+        if hub is not None:
+            hub.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from logic.indicators import ema, wilder_rsi
+from logic.resample import timeframe_ms, timeframe_offset_ms
+from logic.strategy import calculate_indicators
+
+# No-spell-check: ZENVO
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+BacktestResult = namedtuple('BacktestResult', ['trades', 'equity', 'timestamps', 'stats'])
+
+
+def to_frame(data):
+    """
+    Accepts a get_klines() DataFrame, a dict of arrays or raw ccxt OHLCV rows
+    and returns a DataFrame with float OHLCV columns and a timestamp column (ms).
+    """
+    if isinstance(data, pd.DataFrame):
+        df = data.reset_index() if 'timestamp' not in data.columns else data.copy()
+        if np.issubdtype(df['timestamp'].dtype, np.datetime64):
+            df['timestamp'] = df['timestamp'].astype('datetime64[ms]').astype(np.int64)
+        return df[OHLCV_COLUMNS]
+    if isinstance(data, dict):
+        return pd.DataFrame({column: np.asarray(data[column]) for column in OHLCV_COLUMNS})
+    return pd.DataFrame(np.asarray(data, dtype=np.float64), columns=OHLCV_COLUMNS)
+
+
+def resample_ohlcv(columns, timeframe):
+    """
+    Aggregates OHLCV arrays (dict of NumPy columns, ms timestamps) into `timeframe` buckets
+    aligned like exchange candles (epoch; weekly on Monday). Fully vectorized.
+    logic.resample does the same incrementally for live candles.
+    """
+    ts = np.asarray(columns['timestamp'])
+    if not len(ts):
+        return {column: np.asarray(columns[column])[:0] for column in OHLCV_COLUMNS}
+
+    size = timeframe_ms(timeframe)
+    offset = timeframe_offset_ms(timeframe)
+    bucket = ((ts - offset) // size).astype(np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ends = np.append(starts[1:], len(ts))
+    return {
+        'timestamp': bucket[starts] * size + offset,
+        'open': np.asarray(columns['open'])[starts],
+        'high': np.maximum.reduceat(np.asarray(columns['high']), starts),
+        'low': np.minimum.reduceat(np.asarray(columns['low']), starts),
+        'close': np.asarray(columns['close'])[ends - 1],
+        'volume': np.add.reduceat(np.asarray(columns['volume']), starts),
+    }
+
+
+# --- TRADE GENERATION ---
+
+def rebound_trades(close, rsi, ema_fast, sl=1.5, tp=3.0, rsi_threshold=40.0):
+    """
+    Replays run_bot's rules on bar closes:
+    entry when RSI <= threshold and close > EMA, exit once the close drops `sl`% below the
+    peak since entry, trailing 'activation' flagged once profit reached `tp`%.
+    Returns (entry_idx, exit_idx, reasons); an open trade at the end exits on the last bar with 'END'.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    signals = np.flatnonzero((np.asarray(rsi) <= rsi_threshold) & (close > np.asarray(ema_fast)))
+
+    entries, exits, reasons = [], [], []
+    n = len(close)
+    cursor = 0
+    while True:
+        k = np.searchsorted(signals, cursor)
+        if k >= len(signals):
+            break
+        entry = int(signals[k])
+        exit_idx, activated = _find_trailing_exit(close, entry, sl, tp)
+
+        entries.append(entry)
+        if exit_idx is None:
+            exits.append(n - 1)
+            reasons.append('END')
+            break
+        exits.append(exit_idx)
+        reasons.append('TRAILING STOP' if activated else 'STOP LOSS')
+        # Exit tick never re-enters; the next tick can
+        cursor = exit_idx + 1
+
+    return np.asarray(entries, dtype=np.int64), np.asarray(exits, dtype=np.int64), reasons
+
+
+def _find_trailing_exit(close, entry, sl, tp):
+    """Scans forward in doubling windows so every bar is looked at once on average."""
+    entry_price = close[entry]
+    peak = entry_price
+    n = len(close)
+    pos = entry + 1
+    size = 256
+    while pos < n:
+        end = min(n, pos + size)
+        window = close[pos:end]
+        run_max = np.maximum.accumulate(window)
+        np.maximum(run_max, peak, out=run_max)
+
+        # Same arithmetic as TrailingPosition.update() so results match run_bot exactly
+        drawdown = ((run_max - window) / run_max) * 100
+        hits = np.flatnonzero(drawdown >= sl)
+        if hits.size:
+            hit = hits[0]
+            activated = ((run_max[hit] - entry_price) / entry_price) * 100 >= tp
+            return pos + int(hit), bool(activated)
+
+        peak = run_max[-1]
+        pos = end
+        size *= 2
+    return None, False
+
+
+def signal_trades(df):
+    """
+    Replays logic/strategy.get_signal(): enter on 'BUY', exit on the next 'SELL'.
+    `df` must already hold calculate_indicators() columns.
+    """
+    close = df['close'].to_numpy()
+    ema50 = df['ema50'].to_numpy()
+    rsi = df['rsi'].to_numpy()
+    prev_rsi = np.concatenate(([np.nan], rsi[:-1]))
+
+    buy = (close > ema50) & (prev_rsi < 50) & (rsi >= 50)
+    sell = ((close < ema50) | ((prev_rsi > 50) & (rsi <= 50))) & ~buy
+    # get_signal() stays NEUTRAL until it sees 50 rows
+    buy[:49] = False
+    sell[:49] = False
+
+    buys = np.flatnonzero(buy)
+    sells = np.flatnonzero(sell)
+    entries, exits, reasons = [], [], []
+    cursor = 0
+    while True:
+        k = np.searchsorted(buys, cursor)
+        if k >= len(buys):
+            break
+        entry = int(buys[k])
+        j = np.searchsorted(sells, entry + 1)
+        entries.append(entry)
+        if j >= len(sells):
+            exits.append(len(close) - 1)
+            reasons.append('END')
+            break
+        exits.append(int(sells[j]))
+        reasons.append('SELL SIGNAL')
+        cursor = int(sells[j]) + 1
+
+    return np.asarray(entries, dtype=np.int64), np.asarray(exits, dtype=np.int64), reasons
+
+
+# --- ACCOUNTING ---
+
+def build_result(timestamps, close, entries, exits, reasons, usd_amount=11.0, initial_capital=1000.0,
+                 fee_rate=0.001, slippage=0.0005):
+    """
+    Fixed `usd_amount` stake per trade (as run_bot), `fee_rate` per side and
+    `slippage` as a fraction of price against us on both fills.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    timestamps = np.asarray(timestamps)
+
+    entry_fill = close[entries] * (1 + slippage)
+    exit_fill = close[exits] * (1 - slippage)
+    qty = usd_amount / entry_fill
+    fees = usd_amount * fee_rate + qty * exit_fill * fee_rate
+    pnl = qty * (exit_fill - entry_fill) - fees
+
+    trades = pd.DataFrame({
+        'entry_time': timestamps[entries],
+        'exit_time': timestamps[exits],
+        'entry_price': entry_fill,
+        'exit_price': exit_fill,
+        'qty': qty,
+        'fees': fees,
+        'pnl': pnl,
+        'return_pct': pnl / usd_amount * 100,
+        'bars': exits - entries,
+        'reason': reasons,
+    })
+
+    # Equity: realized PnL steps at exits, mark-to-market while in a trade
+    steps = np.zeros(len(close))
+    np.add.at(steps, exits, pnl)
+    equity = initial_capital + np.cumsum(steps)
+    for k in range(len(entries)):
+        start, end = entries[k], exits[k]
+        equity[start:end] += qty[k] * (close[start:end] - entry_fill[k]) - usd_amount * fee_rate
+
+    return BacktestResult(trades=trades, equity=equity, timestamps=timestamps,
+                          stats=_stats(trades, equity, initial_capital))
+
+
+def _stats(trades, equity, initial_capital):
+    peak = np.maximum.accumulate(equity) if len(equity) else equity
+    max_dd = float(((peak - equity) / peak).max() * 100) if len(equity) else 0.0
+    total = float(trades['pnl'].sum()) if len(trades) else 0.0
+    return {
+        'trades': int(len(trades)),
+        'win_rate': float((trades['pnl'] > 0).mean() * 100) if len(trades) else 0.0,
+        'total_pnl': total,
+        'return_pct': total / initial_capital * 100,
+        'max_drawdown_pct': max_dd,
+        'fees': float(trades['fees'].sum()) if len(trades) else 0.0,
+    }
+
+
+# --- ENTRY POINT ---
+
+def run_backtest(data, strategy='rebound', sl=1.5, tp=3.0, rsi_threshold=40.0, ema_span=9,
+                 usd_amount=11.0, initial_capital=1000.0, fee_rate=0.001, slippage=0.0005):
+    """
+    Backtests historical OHLCV.
+    strategy='rebound' replays run_bot (RSI/EMA entry + trailing stop),
+    strategy='signal' replays logic/strategy.get_signal().
+    """
+    df = to_frame(data)
+
+    if strategy == 'rebound':
+        close = df['close']
+        entries, exits, reasons = rebound_trades(
+            close.to_numpy(), wilder_rsi(close).to_numpy(), ema(close, ema_span).to_numpy(),
+            sl=sl, tp=tp, rsi_threshold=rsi_threshold)
+    elif strategy == 'signal':
+        entries, exits, reasons = signal_trades(calculate_indicators(df))
+    else:
+        raise ValueError(f"Unknown strategy '{strategy}'")
+
+    return build_result(df['timestamp'].to_numpy(), df['close'].to_numpy(), entries, exits, reasons,
+                        usd_amount=usd_amount, initial_capital=initial_capital,
+                        fee_rate=fee_rate, slippage=slippage)
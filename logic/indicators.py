@@ -1,31 +1,48 @@
+import math
+from collections import deque
+
+
 # No-spell-check: ZENVO
 
+def ema(close, span):
+    """EMA as used across the bot (pandas ewm, adjust=False)."""
+    return close.ewm(span=span, adjust=False).mean()
+
+
+def wilder_rsi(close, period=14):
+    """RSI with Wilder's smoothing (alpha = 1/period)."""
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0))
+    loss = (-delta.where(delta < 0, 0))
+
+    avg_gain = gain.ewm(alpha=1 / period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / period, adjust=False).mean()
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
 def add_indicators(df):
     """
     Calculates technical indicators for the Zenvo Bot.
     Includes EMA 9 (Safety Filter), EMA 50, EMA 200, and RSI 14.
+    Also accepts a CandleBuffer (columns are then filled in place, see buffer_indicators).
     """
+    if is_candle_buffer(df):
+        return buffer_indicators(df)
     try:
         # --- MOVING AVERAGES ---
         # EMA 9 is your primary safety filter for confirmed entries
-        df['ema9'] = df['close'].ewm(span=9, adjust=False).mean()
+        df['ema9'] = ema(df['close'], 9)
 
         # Long-term trend indicators
-        df['ema50'] = df['close'].ewm(span=50, adjust=False).mean()
-        df['ema200'] = df['close'].ewm(span=200, adjust=False).mean()
+        df['ema50'] = ema(df['close'], 50)
+        df['ema200'] = ema(df['close'], 200)
 
         # --- RSI 14 (Wilder's Smoothing) ---
         # We use Wilder's method for smoother and more reliable signals
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0))
-        loss = (-delta.where(delta < 0, 0))
-
         # alpha=1/14 is the standard for Wilder's RSI
-        avg_gain = gain.ewm(alpha=1 / 14, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1 / 14, adjust=False).mean()
-
-        rs = avg_gain / avg_loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        df['rsi'] = wilder_rsi(df['close'], 14)
 
         # --- VOLUME ---
         # Calculating 20-period volume average for liquidity context
@@ -35,4 +52,276 @@ def add_indicators(df):
 
     except Exception as e:
         print(f"❌ Indicator Calculation Error: {e}")
-        return df
\ No newline at end of file
+        return df
+
+
+# --- CANDLE BUFFER ---
+# Same columns as above, written into a CandleBuffer. Only rows that changed since the
+# last pass (normally just the live candle) are recomputed, without building a DataFrame.
+
+def is_candle_buffer(data):
+    # Duck-typed so this module does not import NumPy for the DataFrame / tick paths
+    return hasattr(data, 'mark_valid')
+
+
+def buffer_indicators(buffer):
+    """add_indicators() for a CandleBuffer: ema9/50/200, Wilder RSI 14 and vol_avg 20."""
+    for span in (9, 50, 200):
+        fill_ema(buffer, f'ema{span}', span)
+
+    fill_gain_loss(buffer)
+    fill_ewm(buffer, '_avg_gain', 1 / 14, '_gain')
+    fill_ewm(buffer, '_avg_loss', 1 / 14, '_loss')
+    fill_rsi(buffer, '_avg_gain', '_avg_loss')
+
+    fill_rolling_mean(buffer, 'vol_avg', 20, 'volume')
+    return buffer
+
+
+def fill_ema(buffer, name, span, source='close'):
+    """Brings buffer[name] (EMA of `source`, pandas ewm(span, adjust=False)) up to date."""
+    return fill_ewm(buffer, name, 2.0 / (span + 1.0), source)
+
+
+def fill_ewm(buffer, name, alpha, source):
+    """Brings buffer[name] (pandas ewm(alpha, adjust=False) of `source`) up to date."""
+    start = buffer.valid(name)
+    out = buffer.column(name)
+    values = buffer[source][start:].tolist()
+    prev = float(out[start - 1]) if start else (values[0] if values else 0.0)
+    for i, value in enumerate(values, start):
+        prev += alpha * (value - prev)
+        out[i] = prev
+    buffer.mark_valid(name)
+    return out
+
+
+def fill_rolling_mean(buffer, name, window, source):
+    """Brings buffer[name] (pandas rolling(window).mean() of `source`) up to date."""
+    start = buffer.valid(name)
+    out = buffer.column(name)
+    lo = max(0, start - window + 1)
+    values = buffer[source][lo:].tolist()
+    total = sum(values[:start - lo])
+    for j in range(start - lo, len(values)):
+        total += values[j]
+        if j >= window:
+            total -= values[j - window]
+        out[lo + j] = total / window if lo + j >= window - 1 else math.nan
+    buffer.mark_valid(name)
+    return out
+
+
+def fill_gain_loss(buffer):
+    """Per-row gain / loss columns (row 0 counts as 0, like pandas' where() on its NaN delta)."""
+    start = min(buffer.valid('_gain'), buffer.valid('_loss'))
+    close = buffer['close']
+    gain = buffer.column('_gain')
+    loss = buffer.column('_loss')
+    prev = float(close[start - 1]) if start else None
+    for i, value in enumerate(close[start:].tolist(), start):
+        gain[i], loss[i] = _gain_loss(prev, value)
+        prev = value
+    buffer.mark_valid('_gain', '_loss')
+
+
+def fill_rsi(buffer, gain_column, loss_column, name='rsi'):
+    """RSI column from averaged gain / loss columns (0/0 -> NaN, x/0 -> 100, as in pandas)."""
+    buffer.bind(name, (gain_column, loss_column))
+    start = buffer.valid(name)
+    out = buffer.column(name)
+    gains = buffer[gain_column][start:].tolist()
+    losses = buffer[loss_column][start:].tolist()
+    for i, (avg_gain, avg_loss) in enumerate(zip(gains, losses), start):
+        out[i] = _rsi(avg_gain, avg_loss)
+    buffer.mark_valid(name)
+    return out
+
+
+# --- INCREMENTAL ENGINE ---
+# add_indicators() recomputes every column from scratch on each call. The classes
+# below keep the running EMA / Wilder RSI / volume state per symbol and timeframe,
+# so a tick only costs a handful of float operations.
+
+EMA_SPANS = (9, 50, 200)
+RSI_PERIOD = 14
+VOL_WINDOW = 20
+
+
+class IndicatorState:
+    """
+    Running indicator state for a single symbol/timeframe.
+    Values match add_indicators() (pandas ewm(adjust=False) / rolling) on the same bars.
+    """
+
+    def __init__(self, ema_spans=EMA_SPANS, rsi_period=RSI_PERIOD, vol_window=VOL_WINDOW, closed_backlog=1000):
+        self.alphas = {span: 2.0 / (span + 1.0) for span in ema_spans}
+        self.rsi_alpha = 1.0 / rsi_period
+        self.vol_window = vol_window
+
+        # Committed state: everything up to and including the last CLOSED candle
+        self.ema = {span: None for span in ema_spans}
+        self.avg_gain = None
+        self.avg_loss = None
+        self.prev_close = None
+        self.volumes = deque(maxlen=vol_window)
+        self.vol_sum = 0.0
+        self.bars = 0
+
+        # Live (still forming) candle, not yet folded into the committed state
+        self.live_bar = None
+        self.values = {}
+
+        # Final versions of the candles closed since the last take_closed() (bounded)
+        self.closed = deque(maxlen=closed_backlog)
+
+    @property
+    def live_ts(self):
+        return self.live_bar[0] if self.live_bar is not None else None
+
+    def update(self, bar):
+        """
+        Feeds one OHLCV row [ts, open, high, low, close, volume].
+        Same ts as the live candle -> replaces it. Newer ts -> closes the live candle first.
+        Older rows are ignored. Returns the current indicator values.
+        """
+        ts = bar[0]
+        live_ts = self.live_ts
+        if live_ts is not None and ts < live_ts:
+            return self.values
+        if live_ts is not None and ts > live_ts:
+            self._commit(self.live_bar)
+            self.closed.append(self.live_bar)
+        self.live_bar = bar
+        self.values = self._preview(bar)
+        return self.values
+
+    def feed(self, bars):
+        """Feeds OHLCV rows in order (the last row stays live)."""
+        for bar in bars:
+            self.update(bar)
+        return self.values
+
+    def take_closed(self):
+        """
+        Candles closed since the last call, as they were when the next one started.
+        A closed candle's last update usually arrives while it is still live (stream
+        mode), so this is what the candle store must persist.
+        """
+        bars = list(self.closed)
+        self.closed.clear()
+        return bars
+
+    def _commit(self, bar):
+        close = float(bar[4])
+        volume = float(bar[5])
+        for span, alpha in self.alphas.items():
+            prev = self.ema[span]
+            self.ema[span] = close if prev is None else prev + alpha * (close - prev)
+
+        gain, loss = _gain_loss(self.prev_close, close)
+        if self.avg_gain is None:
+            self.avg_gain, self.avg_loss = gain, loss
+        else:
+            self.avg_gain += self.rsi_alpha * (gain - self.avg_gain)
+            self.avg_loss += self.rsi_alpha * (loss - self.avg_loss)
+        self.prev_close = close
+
+        if len(self.volumes) == self.vol_window:
+            self.vol_sum -= self.volumes[0]
+        self.volumes.append(volume)
+        self.vol_sum += volume
+        self.bars += 1
+
+    def _preview(self, bar):
+        """Indicator values if `bar` were appended, without touching the committed state."""
+        close = float(bar[4])
+        volume = float(bar[5])
+        values = {'close': close, 'volume': volume}
+
+        for span, alpha in self.alphas.items():
+            prev = self.ema[span]
+            values[f'ema{span}'] = close if prev is None else prev + alpha * (close - prev)
+
+        gain, loss = _gain_loss(self.prev_close, close)
+        if self.avg_gain is None:
+            avg_gain, avg_loss = gain, loss
+        else:
+            avg_gain = self.avg_gain + self.rsi_alpha * (gain - self.avg_gain)
+            avg_loss = self.avg_loss + self.rsi_alpha * (loss - self.avg_loss)
+        values['rsi'] = _rsi(avg_gain, avg_loss)
+
+        # Rolling volume average only exists once the window is full
+        count = len(self.volumes) + 1
+        if count >= self.vol_window:
+            drop = self.volumes[0] if len(self.volumes) == self.vol_window else 0.0
+            values['vol_avg'] = (self.vol_sum - drop + volume) / self.vol_window
+        else:
+            values['vol_avg'] = math.nan
+
+        return values
+
+
+class IndicatorEngine:
+    """Keeps one IndicatorState per (symbol, timeframe)."""
+
+    def __init__(self, **state_kwargs):
+        self.state_kwargs = state_kwargs
+        self.states = {}
+
+    def get_state(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        state = self.states.get(key)
+        if state is None:
+            state = IndicatorState(**self.state_kwargs)
+            self.states[key] = state
+        return state
+
+    def warm_up(self, symbol, timeframe, bars):
+        return self.get_state(symbol, timeframe).feed(bars)
+
+    def update(self, symbol, timeframe, bar):
+        return self.get_state(symbol, timeframe).update(bar)
+
+    def reset(self, symbol, timeframe):
+        self.states.pop((symbol, timeframe), None)
+
+
+# Largest difference max_deviation() may report: float rounding only (observed ~1e-10 on BTC prices)
+DEVIATION_TOLERANCE = 1e-6
+
+
+def max_deviation(df, state_kwargs=None):
+    """
+    Replays `df` through an IndicatorState and returns the largest absolute
+    difference against add_indicators() on the final row, per column.
+    Used to check the incremental engine against pandas within DEVIATION_TOLERANCE.
+    """
+    state = IndicatorState(**(state_kwargs or {}))
+    bars = df.reset_index()[['timestamp', 'open', 'high', 'low', 'close', 'volume']].values.tolist()
+    values = state.feed(bars)
+    reference = add_indicators(df.copy()).iloc[-1]
+
+    deviation = {}
+    for column in ('ema9', 'ema50', 'ema200', 'rsi', 'vol_avg'):
+        expected = float(reference[column])
+        got = values[column]
+        if math.isnan(expected) and math.isnan(got):
+            deviation[column] = 0.0
+        else:
+            deviation[column] = abs(expected - got)
+    return deviation
+
+
+def _gain_loss(prev_close, close):
+    # First bar has no delta; pandas' where() turns that NaN into a 0 gain / 0 loss
+    if prev_close is None:
+        return 0.0, 0.0
+    delta = close - prev_close
+    return (delta, 0.0) if delta > 0 else (0.0, -delta)
+
+
+def _rsi(avg_gain, avg_loss):
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else math.nan
+    return 100 - (100 / (1 + avg_gain / avg_loss))
@@ -0,0 +1,137 @@
+TIMEFRAME_UNITS_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+# Binance weekly candles open on Monday 00:00 UTC; the epoch (1970-01-01) was a Thursday
+WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def timeframe_ms(timeframe):
+    """'1m' -> 60000, '4h' -> 14400000 ..."""
+    return int(timeframe[:-1]) * TIMEFRAME_UNITS_MS[timeframe[-1]]
+
+
+def timeframe_offset_ms(timeframe):
+    """Shift of the bucket grid against the epoch (only weekly candles have one)."""
+    return WEEK_OFFSET_MS if timeframe[-1] == 'w' else 0
+
+
+def bucket_start(ts, size, offset=0):
+    """Open time of the `size`-ms candle containing `ts`, aligned like exchange candles."""
+    return (ts - offset) // size * size + offset
+
+
+class CandleAggregator:
+    """
+    Builds one higher-timeframe candle from base candles as they arrive.
+    The base stream may revise its live candle any number of times (same timestamp);
+    closed base candles are folded into the bucket, so update() costs O(1) and the
+    bucket always equals the aggregate of every base candle seen for it.
+    Base candles before `floor` (a bucket start) are ignored.
+    """
+
+    def __init__(self, timeframe, floor=None):
+        self.timeframe = timeframe
+        self.size = timeframe_ms(timeframe)
+        self.offset = timeframe_offset_ms(timeframe)
+        self.floor = floor
+        self.ts = None
+        self.closed = None  # [open, high, low, volume] of the bucket's closed base candles
+        self.live = None  # Base candle still forming
+
+    def update(self, bar):
+        """Feeds one base row [ts, open, high, low, close, volume]; returns the bucket row or None."""
+        ts = bar[0]
+        if self.floor is not None and ts < self.floor:
+            return None
+        live = self.live
+        if live is not None and ts < live[0]:
+            return None
+        start = bucket_start(ts, self.size, self.offset)
+        if start != self.ts:
+            self.ts = start
+            self.closed = None
+        elif live is not None and ts > live[0]:
+            closed = self.closed
+            if closed is None:
+                self.closed = [live[1], live[2], live[3], live[5]]
+            else:
+                if live[2] > closed[1]:
+                    closed[1] = live[2]
+                if live[3] < closed[2]:
+                    closed[2] = live[3]
+                closed[3] += live[5]
+        self.live = bar
+        return self.bar()
+
+    def bar(self):
+        live = self.live
+        if live is None:
+            return None
+        closed = self.closed
+        if closed is None:
+            return [self.ts, live[1], live[2], live[3], live[4], live[5]]
+        return [self.ts, closed[0], max(closed[1], live[2]), min(closed[2], live[3]), live[4], closed[3] + live[5]]
+
+
+class Resampler:
+    """
+    One base candle source per symbol (default 1m) serving any number of timeframes.
+    Every base candle updates each timeframe's live bucket and feeds its IndicatorState
+    in the IndicatorEngine; a bucket closes when the first base candle of the next one
+    arrives, exactly at the exchange's boundaries.
+
+    Start-up: seed() each timeframe with exchange candles (its history), then replay the
+    base candles from base_since() so the live buckets are rebuilt from their start.
+    """
+
+    def __init__(self, engine, symbol, timeframes, base='1m'):
+        self.engine = engine
+        self.symbol = symbol
+        self.base = base
+        base_size = timeframe_ms(base)
+        self.aggregators = {}
+        for tf in dict.fromkeys(timeframes):
+            size = timeframe_ms(tf)
+            if size < base_size or size % base_size or timeframe_offset_ms(tf) % base_size:
+                raise ValueError(f"{tf} candles cannot be built from {base} candles")
+            self.aggregators[tf] = CandleAggregator(tf)
+
+    @property
+    def timeframes(self):
+        return list(self.aggregators)
+
+    def state(self, timeframe):
+        return self.engine.get_state(self.symbol, timeframe)
+
+    def seed(self, timeframe, bars):
+        """
+        Exchange candles of `timeframe`, oldest first, the last one being the live candle.
+        The closed ones warm the indicators; the live one is rebuilt from base candles.
+        """
+        aggregator = self.aggregators[timeframe]
+        if not bars:
+            return
+        self.state(timeframe).feed(bars[:-1])
+        aggregator.floor = bars[-1][0]
+
+    def base_since(self):
+        """Earliest base timestamp the live buckets need (None before any seed())."""
+        floors = [aggregator.floor for aggregator in self.aggregators.values() if aggregator.floor is not None]
+        return min(floors) if floors else None
+
+    def update(self, bar):
+        """Feeds one base candle; returns {timeframe: indicator values} for the buckets it touched."""
+        changed = {}
+        for tf, aggregator in self.aggregators.items():
+            bucket = aggregator.update(bar)
+            if bucket is not None:
+                changed[tf] = self.engine.update(self.symbol, tf, bucket)
+        return changed
+
+    def feed(self, bars):
+        changed = {}
+        for bar in bars:
+            changed.update(self.update(bar))
+        return changed
+
+    def live_bar(self, timeframe):
+        return self.state(timeframe).live_bar
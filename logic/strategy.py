@@ -1,10 +1,25 @@
-import pandas as pd
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from logic.indicators import fill_ema, fill_gain_loss, fill_rolling_mean, fill_rsi, is_candle_buffer
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # No-spell-check: ZENVO
 
 def calculate_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculates indicators for the aggressive strategy."""
+    """Calculates indicators for the aggressive strategy (also fills a CandleBuffer in place)."""
+    if is_candle_buffer(df):
+        fill_ema(df, 'ema50', 50)
+        fill_gain_loss(df)
+        fill_rolling_mean(df, '_sma_gain', 14, '_gain')
+        fill_rolling_mean(df, '_sma_loss', 14, '_loss')
+        fill_rsi(df, '_sma_gain', '_sma_loss')
+        return df
+
     # 1. EMA 50 (Immediate Trend)
     df['ema50'] = df['close'].ewm(span=50, adjust=False).mean()
 
@@ -23,15 +38,69 @@ def get_signal(df: pd.DataFrame) -> str:
     if len(df) < 50:
         return 'NEUTRAL'
 
-    current = df.iloc[-1]
-    previous = df.iloc[-2]
+    if is_candle_buffer(df):
+        # Plain floats straight from the columns, no row Series
+        close, ema50, rsi, prev_rsi = df.last('close'), df.last('ema50'), df.last('rsi'), df.last('rsi', 2)
+    else:
+        current = df.iloc[-1]
+        previous = df.iloc[-2]
+        close, ema50, rsi, prev_rsi = current['close'], current['ema50'], current['rsi'], previous['rsi']
 
     # BUY: Above EMA 50 and RSI crossing UP the 50 mark
-    if current['close'] > current['ema50'] and previous['rsi'] < 50 <= current['rsi']:
+    if close > ema50 and prev_rsi < 50 <= rsi:
         return 'BUY'
 
     # SELL: Below EMA 50 or RSI crossing DOWN the 50 mark
-    if current['close'] < current['ema50'] or previous['rsi'] > 50 >= current['rsi']:
+    if close < ema50 or prev_rsi > 50 >= rsi:
         return 'SELL'
 
-    return 'NEUTRAL'
\ No newline at end of file
+    return 'NEUTRAL'
+
+# --- TREND-FOLLOWER REBOUND (run_bot rules) ---
+
+def rebound_signal(rsi_val, price, ema_9, rsi_threshold=40.0) -> bool:
+    """Entry used by run_bot: RSI at or below the threshold while price holds above EMA 9."""
+    return rsi_val <= rsi_threshold and price > ema_9
+
+
+class TrailingPosition:
+    """
+    Exit model used by run_bot.
+    Trailing stop `sl`% below the peak from the first tick; trailing 'activation' once profit reaches `tp`%.
+    """
+
+    def __init__(self, entry_price, sl, tp, max_price=None, trailing_activated=False, quantity=None):
+        self.entry_price = entry_price
+        self.quantity = quantity
+        self.max_price = max_price if max_price is not None else entry_price
+        self.sl = sl
+        self.tp = tp
+        self.trailing_activated = trailing_activated
+        self.profit_pct = 0.0
+        self.drawdown = 0.0
+
+    def update(self, price):
+        """Tracks the peak and recomputes PnL / drawdown from peak (both in %)."""
+        if price > self.max_price:
+            self.max_price = price
+        self.profit_pct = ((price - self.entry_price) / self.entry_price) * 100
+        self.drawdown = ((self.max_price - price) / self.max_price) * 100
+        return self.profit_pct, self.drawdown
+
+    def check_activation(self) -> bool:
+        """True on the tick where the TP level is first reached."""
+        if not self.trailing_activated and self.profit_pct >= self.tp:
+            self.trailing_activated = True
+            return True
+        return False
+
+    def hit_stop(self) -> bool:
+        return self.drawdown >= self.sl
+
+    @property
+    def exit_reason(self) -> str:
+        return "TRAILING STOP" if self.trailing_activated else "STOP LOSS"
+
+    @property
+    def status(self) -> str:
+        return "TRAILING ACTIVE" if self.trailing_activated else "WAITING TP"
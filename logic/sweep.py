@@ -0,0 +1,179 @@
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from logic.backtest import OHLCV_COLUMNS, build_result, rebound_trades, resample_ohlcv, to_frame
+from logic.indicators import ema, wilder_rsi
+
+# No-spell-check: ZENVO
+
+DEFAULT_CONFIG = {'rsi_threshold': 40.0, 'sl': 1.5, 'tp': 3.0, 'ema_span': 9, 'timeframe': '1m'}
+BATCHES_PER_WORKER = 4  # Enough batches to even out slow configs, few enough to keep each worker's cache warm
+
+
+# --- PARAMETER SPACES ---
+
+def grid(**params):
+    """grid(sl=[1, 1.5], tp=[2, 3]) -> every combination as a list of config dicts."""
+    keys = list(params)
+    return [dict(zip(keys, values)) for values in itertools.product(*(params[k] for k in keys))]
+
+
+def random_samples(space, n, seed=None):
+    """
+    Random search. Each value in `space` is either a list (pick one) or a
+    (low, high) tuple (uniform float, or uniform int when both bounds are ints).
+    """
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for key, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    config[key] = rng.randint(low, high)
+                else:
+                    config[key] = rng.uniform(low, high)
+            else:
+                config[key] = rng.choice(values)
+        configs.append(config)
+    return configs
+
+
+def walk_forward_splits(timestamps, folds=4, train_ratio=0.7):
+    """
+    Rolling walk-forward windows over the data's time span.
+    Returns [(train_start, train_end, test_end), ...] in ms; test runs from train_end to test_end.
+    """
+    start, end = int(timestamps[0]), int(timestamps[-1]) + 1
+    span = end - start
+    test_len = span * (1 - train_ratio) / folds
+    train_len = span * train_ratio
+    splits = []
+    for k in range(folds):
+        train_start = start + k * test_len
+        train_end = train_start + train_len
+        splits.append((int(train_start), int(train_end), int(min(end, train_end + test_len))))
+    return splits
+
+
+# --- WORKER SIDE ---
+# Each worker attaches to the shared OHLCV block once; nothing but configs and
+# result rows cross the process boundary.
+
+_WORKER = {}
+
+
+def _init_worker(shm_name, length):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER['shm'] = shm
+    block = np.ndarray((len(OHLCV_COLUMNS), length), dtype=np.float64, buffer=shm.buf)
+    _WORKER['data'] = {column: block[i] for i, column in enumerate(OHLCV_COLUMNS)}
+    _WORKER['cache'] = {}
+
+
+def _prepared(data, cache, timeframe, ema_span, base_timeframe):
+    """Resampled close + RSI + EMA for one (timeframe, ema_span), cached per worker."""
+    key = (timeframe, ema_span)
+    if key not in cache:
+        columns = data if timeframe == base_timeframe else resample_ohlcv(data, timeframe)
+        close = pd.Series(columns['close'])
+        cache[key] = (np.asarray(columns['timestamp']), close.to_numpy(),
+                      wilder_rsi(close).to_numpy(), ema(close, ema_span).to_numpy())
+    return cache[key]
+
+
+def evaluate(data, config, splits=None, base_timeframe='1m', cache=None, **backtest_kwargs):
+    """
+    Backtests one config and returns one result row per segment.
+    Indicators are causal, so they are computed once on the full series and
+    each segment only restricts where trades may happen.
+    """
+    config = {**DEFAULT_CONFIG, **config}
+    ts, close, rsi, ema_fast = _prepared(data, {} if cache is None else cache,
+                                         config['timeframe'], int(config['ema_span']), base_timeframe)
+
+    if splits:
+        segments = []
+        for fold, (train_start, train_end, test_end) in enumerate(splits):
+            segments.append((fold, 'train', train_start, train_end))
+            segments.append((fold, 'test', train_end, test_end))
+    else:
+        segments = [(None, 'full', ts[0], ts[-1] + 1)]
+
+    rows = []
+    for fold, segment, seg_start, seg_end in segments:
+        lo, hi = np.searchsorted(ts, [seg_start, seg_end])
+        entries, exits, reasons = rebound_trades(close[lo:hi], rsi[lo:hi], ema_fast[lo:hi],
+                                                 sl=config['sl'], tp=config['tp'],
+                                                 rsi_threshold=config['rsi_threshold'])
+        result = build_result(ts[lo:hi], close[lo:hi], entries, exits, reasons, **backtest_kwargs)
+        rows.append({**config, 'fold': fold, 'segment': segment, 'bars': int(hi - lo), **result.stats})
+    return rows
+
+
+def _evaluate_batch(configs, splits, base_timeframe, backtest_kwargs):
+    rows = []
+    for config in configs:
+        rows.extend(evaluate(_WORKER['data'], config, splits, base_timeframe, _WORKER['cache'], **backtest_kwargs))
+    return rows
+
+
+# --- DRIVER ---
+
+def run_sweep(data, configs, results_path, workers=None, splits=None, base_timeframe='1m',
+              batch_size=None, **backtest_kwargs):
+    """
+    Evaluates `configs` across a process pool.
+    The OHLCV arrays are copied once into shared memory; workers map them read-only.
+    `batch_size` defaults to about BATCHES_PER_WORKER batches per worker.
+    Rows are appended to `results_path` (JSON lines) as batches complete.
+    Returns the number of rows written.
+    """
+    df = to_frame(data)
+    length = len(df)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(OHLCV_COLUMNS) * length * 8))
+    try:
+        block = np.ndarray((len(OHLCV_COLUMNS), length), dtype=np.float64, buffer=shm.buf)
+        for i, column in enumerate(OHLCV_COLUMNS):
+            block[i] = df[column].to_numpy(dtype=np.float64)
+        del block
+
+        workers = workers or os.cpu_count() or 1
+        if batch_size is None:
+            batch_size = max(1, math.ceil(len(configs) / (workers * BATCHES_PER_WORKER)))
+        batches = [configs[i:i + batch_size] for i in range(0, len(configs), batch_size)]
+        written = 0
+        started = time.perf_counter()
+        print(f"🧪 [SWEEP] {len(configs)} configs | {length:,} bars | {workers} workers")
+
+        with open(results_path, 'a') as out, ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(shm.name, length)) as pool:
+            futures = [pool.submit(_evaluate_batch, batch, splits, base_timeframe, backtest_kwargs)
+                       for batch in batches]
+            for done, future in enumerate(as_completed(futures), 1):
+                for row in future.result():
+                    out.write(json.dumps(row) + "\n")
+                    written += 1
+                out.flush()
+                print(f"\r🧪 [SWEEP] {done}/{len(batches)} batches | {time.perf_counter() - started:.1f}s", end='')
+
+        print(f"\n✅ [SWEEP] {written} rows -> {results_path}")
+        return written
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def load_results(results_path):
+    """Reads a sweep results file into a DataFrame."""
+    return pd.read_json(results_path, lines=True)
@@ -1,6 +1,43 @@
+import threading
 import time
-from core.exchange import BinanceClient
-from logic.indicators import add_indicators
+from core.metrics import Metrics, PrometheusExporter, SummaryExporter
+from core.scheduler import PollScheduler
+from logic.indicators import IndicatorEngine
+from logic.strategy import TrailingPosition, rebound_signal
+
+WARMUP_BARS = 1000  # Enough history for the EMA 200 to settle
+
+
+def load_warmup(client_manager, store, symbol, tf):
+    """
+    Warm-up history: closed candles from the local store (topped up with only the
+    missing range) followed by the live candle. Without a store, one REST call.
+    """
+    if store is None:
+        return client_manager.get_ohlcv(symbol, tf, limit=WARMUP_BARS)
+
+    tf_ms = client_manager.exchange.parse_timeframe(tf) * 1000
+    client_manager.sync_history(store, symbol, tf, since=client_manager.server_time_ms() - WARMUP_BARS * tf_ms)
+    bars = store.rows(symbol, tf, WARMUP_BARS)
+    since = bars[-1][0] + tf_ms if bars else None
+    return bars + (client_manager.get_ohlcv(symbol, tf, limit=None, since=since) or [])
+
+
+def start_stream(client_manager, transport, symbol, tf, since):
+    """Opens the push feed for one symbol/timeframe, backfilling from `since`."""
+    from core.stream import MarketStream
+
+    stream = MarketStream(transport, rest_client=client_manager)
+    stream.subscribe_klines(symbol, tf, since=since)
+    stream.subscribe_ticker(symbol)
+    return stream.start()
+
+
+def print_latency(client_manager, metrics=None):
+    summary = client_manager.latency_summary(metrics)
+    if summary:
+        last, p50, worst = summary
+        print(f"⏱️ SIGNAL -> SUBMIT: {last:.2f} ms | P50: {p50:.2f} ms | MAX: {worst:.2f} ms")
 
 
 # --- CORE ENGINE FUNCTION ---
@@ -20,14 +57,49 @@ def run_bot(config):
     mode = config.get('mode', 'testnet')
     gui_instance = config.get('instance')
 
-    rsi_threshold = 40.0
+    # Stop signal: a threading.Event (headless / API) and/or the GUI's bot_running flag
+    stop_event = config.get('stop_event') or threading.Event()
+
+    def is_running():
+        if stop_event.is_set():
+            return False
+        return gui_instance is None or gui_instance.bot_running
+
+    engine = config.get('indicator_engine') or IndicatorEngine()
+    feed_mode = config.get('feed', 'stream')  # 'stream' (websocket) or 'rest' (polling)
+    stream_max_failures = int(config.get('stream_max_failures', 5))  # Failed reconnects in a row before REST
+    stream_timeout = float(config.get('stream_timeout', 120.0))  # Seconds without a push before REST
+    store_dir = config.get('store_dir', 'data/ohlcv')  # None disables the local candle store
+    journal_dir = config.get('journal_dir', 'data/journal')  # None disables the position journal
+    bot_id = config.get('bot_id') or f"{mode}-{symbol}-{tf}"  # Journal key: same id -> same position
+    metrics = config.get('metrics') or Metrics()
+    metrics_port = config.get('metrics_port')  # Prometheus text endpoint, off when None
+    metrics_summary = config.get('metrics_summary')  # Seconds between summary dumps, off when None
+    poll_interval = config.get('poll_interval')  # Forming-candle REST cadence (s); None -> timeframe / 60, min 1 s
+    shared_feed = config.get('shared_feed')  # Name of a core.fanout ring; replaces the own fetch + indicators
+    async_orders = config.get('async_orders', True)  # False: orders execute inside the loop (simulations)
+
+    rsi_threshold = float(config.get('rsi_threshold', 40.0))
     sep = "=" * 45
 
+    # Whatever is started below is stopped in the finally block, also after a critical error
+    client_manager = executor = journal = stream = subscriber = None
+    own_client = own_journal = False
+    exporters = []
+
     try:
         # Initializing connection
-        client_manager = BinanceClient(api_key=api_key, secret_key=secret_key, mode=mode)
+        client_manager = config.get('client')
+        if client_manager is None:
+            # ccxt is imported here, not at module level, so importing the engine stays cheap
+            from core.exchange import BinanceClient
+            client_manager = BinanceClient(api_key=api_key, secret_key=secret_key, mode=mode, metrics=metrics)
+            own_client = True
         current_bal = client_manager.get_balance("USDT")
 
+        # REST waits: aligned to candle closes (server time), jittered backoff on errors
+        scheduler = PollScheduler.for_client(client_manager, tf, forming_interval=poll_interval)
+
         # Startup Header
         print(f"\n{sep}")
         print("✅ AUTHENTICATION SUCCESSFUL")
@@ -40,37 +112,177 @@ def run_bot(config):
         print(f"🛡️ SL (Trailing Gap): {user_sl} % | 🎯 TP Activation: {user_tp} %")
         print(f"{sep}\n")
 
-        # Position state variables
-        in_position = False
-        entry_price = 0
-        max_price = 0
-        trailing_activated = False
+        # Position state (None while flat), restored from the journal after a crash or STOP/START
+        position = None
+        journal = config.get('journal')
+        own_journal = journal is None and bool(journal_dir)
+        if own_journal:
+            from core.journal import PositionJournal
+            journal = PositionJournal.for_bot(journal_dir, bot_id)
+        reconciler = None
+        if journal is not None:
+            saved = journal.position
+            if saved is not None:
+                position = TrailingPosition(saved['entry_price'], user_sl, user_tp, saved['max_price'],
+                                            saved['trailing_activated'], saved['quantity'])
+                print(f"♻️ POSITION RESTORED @ {position.entry_price:,.2f} | MAX: {position.max_price:,.2f} | "
+                      f"{position.status} ({journal.restore_ms:.1f} ms)")
+            # Checked against the exchange in the background; the loop starts right away
+            from core.journal import Reconciler
+            reconciler = Reconciler(client_manager, symbol, journal, usd_amount).start()
+
+        # Orders go through a worker: the loop keeps reading prices while they are in flight
+        from core.orders import OrderExecutor
+        executor = OrderExecutor(client_manager, journal=journal, asynchronous=async_orders, wait=stop_event.wait,
+                                 metrics=metrics)
+        pending = None
+
+        # Indicator state lives across ticks: full history once, then only new bars
+        state = engine.get_state(symbol, tf)
+        store = None
+        if store_dir and not shared_feed:
+            from core.store import OHLCVStore
+            store = OHLCVStore(store_dir)
+        if shared_feed:
+            from core.fanout import FeedSubscriber
+            subscriber = FeedSubscriber(shared_feed)
+
+        # Optional exporters
+        if metrics_port:
+            exporters.append(PrometheusExporter(metrics, port=metrics_port).start())
+        if metrics_summary:
+            exporters.append(SummaryExporter(metrics, interval=metrics_summary).start())
+        last_iteration = None
 
         # Main Trading Loop
-        while gui_instance.bot_running:
+        while is_running():
             try:
-                # 1. Fetch data and calculate indicators
-                df = client_manager.get_klines(symbol, tf)
-                if df is None or df.empty:
-                    time.sleep(2)
-                    continue
+                # Loop timing: interval between iterations and jitter vs the poll target
+                iteration_start = time.perf_counter()
+                if last_iteration is not None:
+                    interval = iteration_start - last_iteration
+                    metrics.observe('loop_interval', interval)
+                    if stream is None and subscriber is None:
+                        metrics.observe('loop_jitter', abs(interval - scheduler.last_delay))
+                last_iteration = iteration_start
+                metrics.profiler.tick()
+
+                if reconciler is not None and reconciler.verdict and not reconciler.handled:
+                    reconciler.handled = True
+                    if reconciler.verdict == 'missing' and position is not None:
+                        print(f"\n⚠️ RESTORED POSITION NOT FOUND ON EXCHANGE ({symbol}) - DROPPED")
+                        journal.close_position(None, 'reconcile')
+                        position = None
+                    if reconciler.open_orders:
+                        print(f"\n⚠️ {len(reconciler.open_orders)} OPEN ORDER(S) ON EXCHANGE FOR {symbol}")
+                    finished = [executor.adopt(record, found) for record, found in reconciler.resolved]
+                else:
+                    finished = executor.poll()
+
+                # Apply fills (order results; orders interrupted by a crash come back via the reconciler)
+                for order in finished:
+                    if order is pending:
+                        pending = None
+                    if order.status == 'unknown':
+                        # Sent, but the exchange could not be asked about it: never resend, look again
+                        print(f"\n⚠️ {order.side.upper()} ORDER {order.client_id} UNCONFIRMED ({order.error}) "
+                              f"- CHECKING AGAIN")
+                        pending = executor.recheck(order)
+                        continue
+                    if order.side == 'buy' and order.filled and position is None:
+                        position = TrailingPosition(order.average, user_sl, user_tp, quantity=order.net_quantity)
+                        if journal is not None:
+                            journal.open_position(position, order.client_id)
+                        print(f"\n🟢 BOUGHT {order.describe()}")
+                        print_latency(client_manager, metrics)
+                    elif order.side == 'sell' and order.filled and position is not None:
+                        remaining = (position.quantity or order.quantity) - order.filled
+                        if order.status == 'partial' and remaining > 0:
+                            position.quantity = remaining
+                            if journal is not None:
+                                journal.open_position(position, order.client_id)
+                            print(f"\n🟠 PARTIAL SELL {order.describe()} | LEFT: {remaining:g}")
+                        else:
+                            if journal is not None:
+                                journal.close_position(order.average, order.reason)
+                            position = None
+                            print(f"\n✅ POSITION CLOSED {order.describe()}")
+                            print_latency(client_manager, metrics)
+                            print(f"{sep}\n")
+                    elif order.side == 'sell' and order.status == 'rejected' and position is not None:
+                        # Left-over below the exchange's min qty / min notional: nothing sellable remains
+                        print(f"\n⚠️ REMAINING POSITION NOT SELLABLE ({order.error}) - CLOSED")
+                        if journal is not None:
+                            journal.close_position(None, 'dust')
+                        position = None
+                    elif not order.filled:
+                        print(f"\n❌ {order.side.upper()} ORDER FAILED: {order.error}")
+                    if journal is not None and order.journaled:
+                        journal.settle_order(order)
 
-                df = add_indicators(df)
-                rsi_val = df['rsi'].iloc[-1]
-                ema_9_v = df['ema9'].iloc[-1]
-                current_price = df['close'].iloc[-1]
+                # 1. Fetch data and update indicators incrementally
+                if subscriber is not None:
+                    # Candles and indicators come ready-made from the shared feed process
+                    with metrics.timer('feed_wait'):
+                        values = subscriber.next_values(timeout=1.0)
+                    if values is None:
+                        continue
+                else:
+                    if state.live_ts is None:
+                        with metrics.timer('warmup'):
+                            bars = load_warmup(client_manager, store, symbol, tf)
+                    elif stream is not None and (not stream.alive or stream.failures >= stream_max_failures
+                                                 or stream.silent_for() > stream_timeout):
+                        # Dead feed: REST polling from the live candle on, for the rest of the session
+                        print(f"\n⚠️ STREAM DOWN ({stream.failures} failed reconnects, silent for "
+                              f"{stream.silent_for():.0f}s) - FALLING BACK TO REST POLLING")
+                        metrics.inc('stream_fallbacks')
+                        stream.stop()
+                        stream = None
+                        feed_mode = 'rest'
+                        continue
+                    elif stream is not None:
+                        # Pushed candles; waits at most 1 s so STOP stays responsive
+                        with metrics.timer('stream_wait'):
+                            events = stream.poll(timeout=1.0)
+                        bars = [e.data for e in events
+                                if e.kind == 'kline' and e.symbol == symbol and e.timeframe == tf]
+                        if not bars:
+                            continue
+                    else:
+                        # Everything from the live candle onwards (covers missed candles too)
+                        bars = client_manager.get_ohlcv(symbol, tf, limit=None, since=state.live_ts)
+                    if not bars:
+                        stop_event.wait(scheduler.failure())
+                        continue
+
+                    with metrics.timer('indicators'):
+                        values = state.feed(bars)
+                    if store is not None:
+                        # Persist candles that are now closed (a candle closes when the next one starts)
+                        with metrics.timer('store'):
+                            store.append(symbol, tf, state.take_closed())
+                    if feed_mode == 'stream' and stream is None:
+                        transport = config.get('transport')
+                        if transport is None:
+                            from core.stream import CcxtProTransport
+                            transport = CcxtProTransport(api_key, secret_key, mode)
+                        stream = start_stream(client_manager, transport, symbol, tf, state.live_ts)
+
+                rsi_val = values['rsi']
+                ema_9_v = values['ema9']
+                current_price = values['close']
 
                 # 2. Entry Logic (If not in a trade)
-                if not in_position:
-                    if rsi_val <= rsi_threshold and current_price > ema_9_v:
+                if position is None:
+                    with metrics.timer('decision'):
+                        entry_signal = rebound_signal(rsi_val, current_price, ema_9_v, rsi_threshold)
+                    if entry_signal and pending is None:
+                        signal_time = time.perf_counter()
                         print(f"\n🎯 SIGNAL DETECTED: RSI {rsi_val:.2f} | Price > EMA 9")
-                        if client_manager.create_order(symbol, 'buy', usd_amount):
-                            entry_price = current_price
-                            max_price = current_price
-                            in_position = True
-                            trailing_activated = False
-                            print(f"🟢 BOUGHT @ {entry_price:,.2f} USDT")
-                    else:
+                        pending = executor.submit(symbol, 'buy', current_price, usd_amount=usd_amount,
+                                                  signal_time=signal_time)
+                    elif pending is None:
                         # Real-time monitoring line
                         print(
                             f"\r🕒 {time.strftime('%H:%M:%S')} | {symbol} | PR: {current_price:,.2f} | RSI: {rsi_val:.2f} | WAITING...",
@@ -79,45 +291,60 @@ def run_bot(config):
                 # 3. Position Management (If in a trade)
                 else:
                     try:
-                        # Update maximum price reached for trailing calculation
-                        if current_price > max_price:
-                            max_price = current_price
-
-                        # Calculate PnL and Drawdown from peak
-                        profit_pct = ((current_price - entry_price) / entry_price) * 100
-                        drawdown = ((max_price - current_price) / max_price) * 100
+                        # Update peak, PnL and drawdown from peak
+                        status_msg = position.status
+                        with metrics.timer('decision'):
+                            profit_pct, drawdown = position.update(current_price)
 
                         # Status update while in position
-                        status_msg = "TRAILING ACTIVE" if trailing_activated else "WAITING TP"
                         print(
-                            f"\r📈 POS: {profit_pct:+.2f}% | MAX: {max_price:,.2f} | DD: {drawdown:.2f}% | {status_msg}",
+                            f"\r📈 POS: {profit_pct:+.2f}% | MAX: {position.max_price:,.2f} | DD: {drawdown:.2f}% | {status_msg}",
                             end='')
 
                         # Step A: Check for Trailing Activation (Take Profit reached)
-                        if not trailing_activated and profit_pct >= user_tp:
-                            trailing_activated = True
+                        if position.check_activation():
                             print(f"\n🎯 TP REACHED! Trailing Stop Activated at {user_tp}% profit.")
+                        if journal is not None:
+                            journal.track(position)
 
                         # Step B: Check for Exit (Stop Loss or Trailing Stop hit)
-                        if drawdown >= user_sl:
-                            reason = "TRAILING STOP" if trailing_activated else "STOP LOSS"
-                            print(f"\n🔴 SELLING: {reason} | Final PnL: {profit_pct:.2f}%")
-                            if client_manager.create_order(symbol, 'sell', usd_amount):
-                                in_position = False
-                                trailing_activated = False
-                                print(f"✅ POSITION CLOSED @ {current_price:,.2f} USDT")
-                                print(f"{sep}\n")
+                        if position.hit_stop() and pending is None:
+                            signal_time = time.perf_counter()
+                            print(f"\n🔴 SELLING: {position.exit_reason} | Final PnL: {profit_pct:.2f}%")
+                            # Sells exactly the held quantity (older journals lack it: estimate from the entry)
+                            quantity = position.quantity or usd_amount / position.entry_price
+                            pending = executor.submit(symbol, 'sell', current_price, quantity=quantity,
+                                                      signal_time=signal_time, reason=position.exit_reason)
 
                     except Exception as pos_err:
                         print(f"\n⚠️ POSITION MGMT ERROR: {pos_err}")
 
-                time.sleep(1)  # 1-second scanning frequency
+                metrics.observe('iteration', time.perf_counter() - iteration_start)
+                if stream is None and subscriber is None:
+                    # Fast cadence while a stop has to be watched or an order settles
+                    stop_event.wait(scheduler.next_delay(active=position is not None or pending is not None))
 
             except Exception as loop_err:
+                metrics.inc('loop_errors')
                 print(f"\n⚠️ LOOP ERROR: {loop_err}")
-                time.sleep(5)  # Wait before retrying on connection errors
+                stop_event.wait(scheduler.failure(loop_err))  # Backs off while errors repeat
 
+        print("\n" + metrics.summary_text())
         print("\n🛑 BOT STOPPED BY USER.")
 
     except Exception as crit_err:
-        print(f"\n❌ CRITICAL ERROR: {crit_err}")
\ No newline at end of file
+        print(f"\n❌ CRITICAL ERROR: {crit_err}")
+
+    finally:
+        if stream is not None:
+            stream.stop()
+        if subscriber is not None:
+            subscriber.close()
+        for exporter in exporters:
+            exporter.stop()
+        if executor is not None:
+            executor.close()
+        if own_journal and journal is not None:
+            journal.close()
+        if own_client:
+            client_manager.close()
\ No newline at end of file
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import synthetic_ohlcv
+from logic.backtest import rebound_trades
+from logic.indicators import ema, wilder_rsi
+from logic.strategy import TrailingPosition
+
+
+def replay(close, rsi, ema_fast, sl, tp, rsi_threshold):
+    """run_bot's loop, one bar at a time: enter on the signal, then TrailingPosition decides the exit."""
+    entries, exits, reasons = [], [], []
+    position = None
+    exited_at = None
+    for i, price in enumerate(close):
+        if position is None:
+            if i != exited_at and rsi[i] <= rsi_threshold and price > ema_fast[i]:
+                position = TrailingPosition(price, sl, tp)
+                entries.append(i)
+            continue
+        position.update(price)
+        position.check_activation()
+        if position.hit_stop():
+            exits.append(i)
+            reasons.append(position.exit_reason)
+            position, exited_at = None, i
+    if position is not None:
+        exits.append(len(close) - 1)
+        reasons.append('END')
+    return entries, exits, reasons
+
+
+@pytest.mark.parametrize('seed, sl, tp, rsi_threshold', [
+    (1, 0.5, 1.0, 40.0),
+    (2, 1.5, 3.0, 45.0),
+    (3, 4.0, 2.0, 40.0),  # Wide stop: trades outlive the first 256-bar scan window and several doublings
+])
+def test_rebound_trades_match_trailing_position(seed, sl, tp, rsi_threshold):
+    close = pd.Series(synthetic_ohlcv(20_000, seed=seed)['close'])
+    rsi, ema_fast = wilder_rsi(close).to_numpy(), ema(close, 9).to_numpy()
+    close = close.to_numpy()
+
+    entries, exits, reasons = rebound_trades(close, rsi, ema_fast, sl=sl, tp=tp, rsi_threshold=rsi_threshold)
+    expected = replay(close, rsi, ema_fast, sl, tp, rsi_threshold)
+
+    assert len(entries) > 5
+    assert entries.tolist() == expected[0]
+    assert exits.tolist() == expected[1]
+    assert reasons == expected[2]
+    assert {'STOP LOSS', 'TRAILING STOP'} <= set(reasons)
+    if sl > 2:
+        assert np.max(exits - entries) > 256
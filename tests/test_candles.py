@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from benchmarks.fakes import synthetic_frame, synthetic_ohlcv, to_rows
+from core.candles import CandleBuffer
+from logic.indicators import DEVIATION_TOLERANCE, add_indicators
+from logic.strategy import calculate_indicators
+
+CAPACITY = 300
+FRAME = synthetic_frame(2000)
+ROWS = to_rows(synthetic_ohlcv(2000))
+
+
+def fill(buffer, indicators, chunk):
+    """
+    Feeds ROWS `chunk` candles at a time, the last one of each chunk first in a forming
+    state, and recomputes the indicators after every update of that live candle.
+    """
+    for lo in range(0, len(ROWS), chunk):
+        batch = ROWS[lo:lo + chunk]
+        ts, open_, high, low, close, volume = batch[-1]
+        buffer.extend(batch[:-1] + [[ts, open_, high, low, (open_ + close) / 2, volume / 2]])
+        indicators(buffer)
+        buffer.update(batch[-1])
+        indicators(buffer)
+
+
+def deviation(buffer, reference, columns):
+    """Largest absolute difference per column over the rows still in the buffer (NaN == NaN)."""
+    tail = reference.iloc[-len(buffer):]
+    result = {}
+    for column in columns:
+        got, expected = buffer[column], tail[column].to_numpy()
+        assert np.array_equal(np.isnan(got), np.isnan(expected)), column
+        result[column] = float(np.nanmax(np.abs(got - expected), initial=0.0))
+    return result
+
+
+@pytest.mark.parametrize('chunk', [1, 7, 250])
+def test_compacted_buffer_matches_add_indicators(chunk):
+    buffer = CandleBuffer(CAPACITY)
+    fill(buffer, add_indicators, chunk)
+
+    assert len(buffer) == CAPACITY
+    assert buffer.rows() == ROWS[-CAPACITY:]
+    # Indicators seeded before a compaction carry on from the full history
+    result = deviation(buffer, add_indicators(FRAME.copy()), ('ema9', 'ema50', 'ema200', 'rsi', 'vol_avg'))
+    assert max(result.values()) < DEVIATION_TOLERANCE, result
+
+
+@pytest.mark.parametrize('chunk', [1, 250])
+def test_compacted_buffer_matches_calculate_indicators(chunk):
+    buffer = CandleBuffer(CAPACITY)
+    fill(buffer, calculate_indicators, chunk)
+
+    result = deviation(buffer, calculate_indicators(FRAME.copy()), ('ema50', 'rsi'))
+    assert max(result.values()) < DEVIATION_TOLERANCE, result
@@ -0,0 +1,99 @@
+import pytest
+
+from benchmarks.fakes import synthetic_ohlcv, to_rows
+from core.explorer import MarketExplorer, signal_state
+
+PAIRS = ['BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'XRP/USDT']
+ROWS = to_rows(synthetic_ohlcv(100))
+
+
+class TickerExchange:
+    """fetch_tickers() over scripted last prices; candles from the fakes for every pair."""
+
+    def __init__(self, prices, listed=PAIRS):
+        self.prices = dict(prices)
+        self.listed = listed
+        self.candle_calls = []
+
+    def load_markets(self):
+        return {pair: {} for pair in self.listed}
+
+    def milliseconds(self):
+        return ROWS[-1][0] + 30_000
+
+    def fetch_tickers(self, symbols):
+        return {pair: {'last': self.prices[pair], 'percentage': 1.5, 'timestamp': self.milliseconds()}
+                for pair in symbols if pair in self.prices}
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None):
+        self.candle_calls.append((symbol, timeframe, limit))
+        return [list(row) for row in ROWS[-limit:]]
+
+
+@pytest.mark.parametrize('rsi, price, ema9, expected', [
+    (35.0, 101.0, 100.0, 'BUY'),
+    (40.0, 101.0, 100.0, 'BUY'),
+    (35.0, 99.0, 100.0, 'OVERSOLD'),
+    (55.0, 101.0, 100.0, ''),
+    (float('nan'), 101.0, 100.0, ''),
+    (None, 101.0, 100.0, ''),
+    (35.0, 101.0, None, ''),
+])
+def test_signal_state(rsi, price, ema9, expected):
+    assert signal_state(rsi, price, ema9) == expected
+
+
+def test_cycle_respects_the_weight_budget():
+    explorer = MarketExplorer(PAIRS, interval=0.5, weight_budget=60, candles_per_cycle=3)
+    # Tickers for 4 pairs weigh 2, each 100-candle load 2: 8 weight per cycle, 60 per minute
+    assert explorer.cycle_seconds == pytest.approx(8.0)
+    assert MarketExplorer(PAIRS, interval=10.0).cycle_seconds == 10.0
+
+
+def test_due_loads_missing_then_visible_then_stale(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('core.explorer.time.monotonic', lambda: now[0])
+    explorer = MarketExplorer(PAIRS, candles_per_cycle=2, resync_every=600)
+    explorer.focus(['SOL/USDT', 'XRP/USDT'])
+    tickers = dict.fromkeys(PAIRS)
+
+    assert explorer._due({}, {}, tickers) == ['SOL/USDT', 'XRP/USDT']
+    states = dict.fromkeys(['SOL/USDT', 'XRP/USDT'], object())
+    synced = {'SOL/USDT': 900.0, 'XRP/USDT': 950.0}
+    assert explorer._due(states, synced, tickers) == ['BTC/USDT', 'ETH/USDT']
+
+    states.update(dict.fromkeys(['BTC/USDT', 'ETH/USDT'], object()))
+    synced.update({'BTC/USDT': 700.0, 'ETH/USDT': 800.0})
+    assert explorer._due(states, synced, tickers) == []
+    now[0] = 1520.0  # All but XRP out of date: the visible one first, then the oldest
+    assert explorer._due(states, synced, tickers) == ['SOL/USDT', 'BTC/USDT']
+
+
+def test_changes_reports_only_updated_rows():
+    exchange = TickerExchange({'BTC/USDT': 30_000.0, 'ETH/USDT': 2_000.0, 'SOL/USDT': 100.0},
+                              listed=['BTC/USDT', 'ETH/USDT', 'SOL/USDT'])
+    explorer = MarketExplorer(PAIRS, candles_per_cycle=3, exchange=exchange)
+    explorer.poll_once()
+
+    version, quotes = explorer.changes(0)
+    assert set(quotes) == {'BTC/USDT', 'ETH/USDT', 'SOL/USDT'}  # XRP is not listed
+    assert quotes['BTC/USDT'].last == 30_000.0
+    assert quotes['BTC/USDT'].rsi is not None and quotes['BTC/USDT'].ema9 is not None
+    assert exchange.candle_calls == [(pair, '1m', 100) for pair in ('BTC/USDT', 'ETH/USDT', 'SOL/USDT')]
+    assert explorer.changes(version) == (version, {})
+
+    exchange.prices['ETH/USDT'] = 2_010.0
+    explorer.poll_once()
+    version, quotes = explorer.changes(version)
+    assert list(quotes) == ['ETH/USDT']
+    assert quotes['ETH/USDT'].last == 2_010.0
+
+
+def test_timeframe_switch_starts_over():
+    exchange = TickerExchange(dict.fromkeys(PAIRS, 1.0))
+    explorer = MarketExplorer(PAIRS, candles_per_cycle=4, exchange=exchange)
+    explorer.poll_once()
+    explorer.set_timeframe('1h')
+    assert explorer._states == {} and explorer._synced == {}
+    explorer.poll_once()
+    assert [call[1] for call in exchange.candle_calls] == ['1m'] * 4 + ['1h'] * 4
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from benchmarks.fakes import FakeExchange, synthetic_ohlcv, to_rows
+from core.exchange import BinanceClient
+from headless import BotRunner
+
+ROWS = to_rows(synthetic_ohlcv(100))
+
+
+@pytest.fixture
+def built(monkeypatch):
+    """Every BinanceClient the runner builds, each over its own FakeExchange instead of ccxt.binance."""
+    clients = []
+
+    def build(api_key="", secret_key="", mode="testnet"):
+        client = BinanceClient(exchange=FakeExchange(ROWS))
+        clients.append((api_key, secret_key, mode, client))
+        return client
+
+    monkeypatch.setattr('core.exchange.BinanceClient', build)
+    yield clients
+    for *_, client in clients:
+        client.close()
+
+
+def bot(api_key, mode='testnet'):
+    return {'symbol': 'BTC/USDT', 'api_key': api_key, 'secret_key': f"{api_key}-secret", 'mode': mode}
+
+
+def test_bots_on_one_account_share_a_client(built):
+    runner = BotRunner()
+    first = runner.client_for(bot('alice'))
+    assert runner.client_for(bot('alice')) is first
+    assert runner.client_for(bot('bob')) is not first
+    # Same keys on the real exchange are a different account than on the testnet
+    assert runner.client_for(bot('alice', mode='real')) is not first
+    assert [entry[:3] for entry in built] == [('alice', 'alice-secret', 'testnet'), ('bob', 'bob-secret', 'testnet'),
+                                              ('alice', 'alice-secret', 'real')]
+
+
+def test_concurrent_bots_build_one_client_per_account(built):
+    runner = BotRunner()
+    barrier = threading.Barrier(8)
+    clients = [None] * 8
+
+    def start(i):
+        barrier.wait()
+        clients[i] = runner.client_for(bot('alice' if i % 2 else 'bob'))
+
+    threads = [threading.Thread(target=start, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 2
+    assert len({id(client) for client in clients[1::2]}) == 1
+    assert len({id(client) for client in clients[0::2]}) == 1
+    assert clients[0] is not clients[1]
+
+
+def test_stop_closes_the_shared_clients(built):
+    runner = BotRunner()
+    client = runner.client_for(bot('alice'))
+    runner.stop()
+    assert runner.clients == {}
+    assert client.markets._stop.is_set()
@@ -0,0 +1,26 @@
+import pytest
+
+from benchmarks.fakes import synthetic_frame
+from logic.indicators import DEVIATION_TOLERANCE, IndicatorState, max_deviation
+
+
+@pytest.mark.parametrize('bars', [30, 250, 2000])
+def test_incremental_matches_pandas(bars):
+    deviation = max_deviation(synthetic_frame(bars))
+    assert max(deviation.values()) < DEVIATION_TOLERANCE, deviation
+
+
+def test_live_candle_revisions_do_not_drift():
+    df = synthetic_frame(400)
+    rows = df.reset_index()[['timestamp', 'open', 'high', 'low', 'close', 'volume']].values.tolist()
+
+    batch = IndicatorState().feed(rows)
+    state = IndicatorState()
+    for row in rows:
+        # Each candle is pushed twice while forming, then in its final form
+        for close in (row[1], (row[1] + row[4]) / 2):
+            state.update([row[0], row[1], row[2], row[3], close, row[5] / 2])
+        values = state.update(row)
+
+    for column in ('ema9', 'ema50', 'ema200', 'rsi', 'vol_avg'):
+        assert values[column] == pytest.approx(batch[column], abs=DEVIATION_TOLERANCE)
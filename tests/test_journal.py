@@ -0,0 +1,115 @@
+import os
+
+from benchmarks.fakes import synthetic_ohlcv, to_rows
+from core.exchange import BinanceClient
+from core.journal import PositionJournal, Reconciler
+from core.orders import Order
+from core.simulator import SimulatedExchange
+from logic.strategy import TrailingPosition
+
+
+def reopen(journal):
+    journal.close()
+    return PositionJournal(journal.path, snapshot_every=journal.snapshot_every)
+
+
+def test_replay_restores_position_and_peak(tmp_path):
+    journal = PositionJournal(str(tmp_path / 'bot'))
+    position = TrailingPosition(100.0, 1.5, 3.0, quantity=0.5)
+    journal.open_position(position)
+    position.max_price = 104.0
+    position.trailing_activated = True
+    journal.track(position)
+
+    journal = reopen(journal)
+    assert journal.position['entry_price'] == 100.0
+    assert journal.position['quantity'] == 0.5
+    assert journal.position['max_price'] == 104.0
+    assert journal.position['trailing_activated'] is True
+
+    journal.close_position(103.0, 'trailing')
+    assert reopen(journal).position is None
+
+
+def test_torn_tail_is_cut_off(tmp_path):
+    journal = PositionJournal(str(tmp_path / 'bot'))
+    journal.open_position(TrailingPosition(100.0, 1.5, 3.0, quantity=0.5))
+    journal.close()
+    intact = os.path.getsize(journal.log_path)
+    with open(journal.log_path, 'ab') as f:
+        f.write(b'0badc0de {"seq":2,"type":"clo')  # Crash in the middle of a write
+
+    journal = PositionJournal(journal.path)
+    assert journal.position['entry_price'] == 100.0
+    assert os.path.getsize(journal.log_path) == intact
+    journal.close_position(101.0, 'stop')  # Appends after the cut, not after the garbage
+    assert reopen(journal).position is None
+
+
+def test_checksum_mismatch_ends_replay(tmp_path):
+    journal = PositionJournal(str(tmp_path / 'bot'))
+    journal.open_position(TrailingPosition(100.0, 1.5, 3.0, quantity=0.5))
+    journal.close_position(101.0, 'stop')
+    journal.close()
+    with open(journal.log_path, 'rb') as f:
+        first, second = f.readlines()
+    with open(journal.log_path, 'wb') as f:
+        f.write(first + second.replace(b'"stop"', b'"STOP"'))  # Bit rot: CRC no longer matches
+
+    journal = PositionJournal(journal.path)
+    assert journal.position is not None
+    assert os.path.getsize(journal.log_path) == len(first)
+
+
+def test_snapshot_then_log(tmp_path):
+    journal = PositionJournal(str(tmp_path / 'bot'), snapshot_every=3)
+    position = TrailingPosition(100.0, 1.5, 3.0, quantity=0.5)
+    journal.open_position(position)
+    for peak in (101.0, 102.0, 103.0, 104.0):
+        position.max_price = peak
+        journal.track(position)
+    assert os.path.exists(journal.snap_path)
+
+    journal = reopen(journal)
+    assert journal.position['max_price'] == 104.0
+    assert journal.seq == 5
+
+
+def test_unsettled_orders_survive_restart(tmp_path):
+    journal = PositionJournal(str(tmp_path / 'bot'))
+    settled = Order('BTC/USDT', 'buy', 100.0, quantity=0.5)
+    in_flight = Order('BTC/USDT', 'sell', 100.0, quantity=0.5)
+    journal.submit_order(settled)
+    journal.submit_order(in_flight)
+    settled.status = 'filled'
+    journal.settle_order(settled)
+
+    journal = reopen(journal)
+    assert [record['client_id'] for record in journal.pending_orders] == [in_flight.client_id]
+    journal.close()
+
+
+def reconcile(journal, exchange):
+    client = BinanceClient(exchange=exchange)
+    reconciler = Reconciler(client, 'BTC/USDT', journal)
+    reconciler._run()
+    client.close()
+    return reconciler.verdict
+
+
+def test_reconciler_checks_journaled_order_ids(tmp_path):
+    exchange = SimulatedExchange(to_rows(synthetic_ohlcv(50)), balances={'USDT': 1000.0, 'BTC': 5.0})
+    journal = PositionJournal(str(tmp_path / 'bot'))
+    entry = exchange.create_order('BTC/USDT', 'market', 'buy', 0.01, params={'newClientOrderId': 'zv-entry'})
+    journal.open_position(TrailingPosition(entry['average'], 1.5, 3.0, quantity=0.01), 'zv-entry')
+    # Other bots' sells on the same symbol and unrelated holdings do not matter
+    exchange.create_order('BTC/USDT', 'market', 'sell', 0.01, params={'newClientOrderId': 'zv-other-bot'})
+    assert reconcile(journal, exchange) == 'ok'
+
+    exchange.create_order('BTC/USDT', 'market', 'sell', 0.01, params={'newClientOrderId': 'web_manual'})
+    assert reconcile(journal, exchange) == 'missing'
+
+    journal.close_position(None, 'reconcile')
+    journal.open_position(TrailingPosition(100.0, 1.5, 3.0, quantity=0.01), 'zv-never-sent')
+    assert reconcile(journal, exchange) == 'missing'
+    journal.close()
@@ -0,0 +1,45 @@
+from core.logsink import LogSink
+
+
+def test_carriage_returns_collapse_into_the_current_line():
+    sink = LogSink()
+    sink.write("price 1")
+    sink.write("\rprice 2")
+    sink.write("\rprice 3")
+    assert sink.drain() == ([], "price 3", True)
+    assert sink.drain() == ([], "price 3", False)
+
+    sink.write("\rprice 4\nBOUGHT\n\rprice 5")
+    assert sink.drain() == (["price 4", "BOUGHT"], "price 5", True)
+
+
+def test_lines_split_across_writes():
+    sink = LogSink()
+    for piece in ("BOU", "GHT 0.1", " @ 100\nSO", "LD\n"):
+        sink.write(piece)
+    assert sink.drain() == (["BOUGHT 0.1 @ 100", "SOLD"], "", True)
+
+
+def test_dropped_lines_are_reported_once():
+    sink = LogSink(max_pending=3)
+    for i in range(5):
+        sink.write(f"line {i}\n")
+    committed, current, changed = sink.drain()
+    assert committed == ["⚠️ [LOG] 2 lines dropped (written faster than displayed)", "line 2", "line 3", "line 4"]
+    assert sink.dropped == 2
+
+    sink.write("line 5\n")
+    assert sink.drain()[0] == ["line 5"]
+
+
+def test_close_flushes_pending_lines_to_the_file(tmp_path):
+    path = tmp_path / 'bot.log'
+    sink = LogSink(file_path=str(path))
+    sink.write("first\n")
+    sink.drain()
+    sink.write("second\n\rstatus 1\rstatus 2\nthird\n")
+    sink.close()
+    sink.close()  # Closing twice is harmless
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [line.split(" ", 2)[2] for line in lines] == ["first", "second", "status 2", "third"]
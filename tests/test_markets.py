@@ -0,0 +1,80 @@
+import ccxt
+import pytest
+
+from core.markets import AboveMaximum, BelowMinimum, MarketCache
+
+
+class MarketsExchange:
+    """load_markets() over fixed per-symbol rules, counting the calls."""
+
+    precisionMode = ccxt.TICK_SIZE
+
+    def __init__(self, markets):
+        self.markets = markets
+        self.loads = 0
+
+    def load_markets(self, reload=False):
+        self.loads += 1
+        return self.markets
+
+
+def market(step, min_qty=None, max_qty=None, min_notional=None):
+    return {'precision': {'amount': step, 'price': 0.01},
+            'limits': {'amount': {'min': min_qty, 'max': max_qty}, 'cost': {'min': min_notional}}}
+
+
+@pytest.fixture
+def cache():
+    exchange = MarketsExchange({'BTC/USDT': market(1e-05, min_qty=1e-05, max_qty=9000.0, min_notional=5.0),
+                                'ETH/USDT': market(0.001, min_qty=0.001, max_qty=2.0, min_notional=5.0),
+                                'DOGE/USDT': market(0.005)})
+    cache = MarketCache(exchange)
+    cache.refresh()
+    return cache
+
+
+@pytest.mark.parametrize('symbol, amount, expected', [
+    # Exact multiples that float division floors one step short
+    ('BTC/USDT', 0.0003, 0.0003),
+    ('BTC/USDT', 0.00029, 0.00029),
+    ('ETH/USDT', 1.015, 1.015),
+    ('DOGE/USDT', 1.015, 1.015),
+    # Anything in between goes down to the step below
+    ('BTC/USDT', 0.000299999, 0.00029),
+    ('ETH/USDT', 0.2999, 0.299),
+    ('DOGE/USDT', 1.0149, 1.01),
+])
+def test_amount_floored_to_step(cache, symbol, amount, expected):
+    assert cache.normalize_amount(symbol, amount) == expected
+
+
+def test_below_min_qty(cache):
+    with pytest.raises(BelowMinimum, match="below minimum"):
+        cache.normalize_amount('ETH/USDT', 0.0009)
+
+
+def test_below_min_notional(cache):
+    assert cache.normalize_amount('BTC/USDT', 0.0002, price=30_000.0) == 0.0002
+    with pytest.raises(BelowMinimum, match="min notional"):
+        cache.normalize_amount('BTC/USDT', 0.00016, price=30_000.0)
+
+
+def test_above_max_qty_raises(cache):
+    assert cache.normalize_amount('ETH/USDT', 2.0009) == 2.0
+    with pytest.raises(AboveMaximum) as raised:
+        cache.normalize_amount('ETH/USDT', 2.001)
+    assert raised.value.maximum == 2.0
+
+
+def test_unknown_market_is_loaded_once_until_the_next_refresh(cache):
+    loads = cache.exchange.loads
+    for _ in range(3):
+        with pytest.raises(ValueError, match="Unknown market"):
+            cache.get('SOL/USDT')
+    assert cache.exchange.loads == loads + 1
+
+    # Listed by the next (scheduled) load
+    cache.exchange.markets['SOL/USDT'] = market(0.01)
+    cache.refresh()
+    assert cache.get('SOL/USDT').step == 0.01
+    assert cache.exchange.loads == loads + 2
@@ -0,0 +1,162 @@
+import ccxt
+import pytest
+
+from benchmarks.fakes import synthetic_ohlcv, to_rows
+from core.exchange import BinanceClient
+from core.orders import OrderExecutor
+from core.simulator import SimulatedExchange
+
+MAX_RETRIES = 3
+LOOKUPS = MAX_RETRIES + 1  # Lookups one _lookup() makes before it gives up
+
+
+class FlakyExchange(SimulatedExchange):
+    """
+    SimulatedExchange with scripted network failures:
+    - `lost_answers`: create_order calls that are executed but whose answer times out
+    - `lost_requests`: create_order calls that time out before reaching the exchange
+    - `lookup_failures`: fetch_order calls that fail with a NetworkError
+    """
+
+    def __init__(self, *args, lost_answers=0, lost_requests=0, lookup_failures=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lost_answers = lost_answers
+        self.lost_requests = lost_requests
+        self.lookup_failures = lookup_failures
+        self.create_calls = 0
+
+    def create_order(self, symbol, order_type, side, amount, price=None, params=None):
+        self.create_calls += 1
+        if self.lost_requests:
+            self.lost_requests -= 1
+            raise ccxt.RequestTimeout("simulated: request lost")
+        order = super().create_order(symbol, order_type, side, amount, price, params)
+        if self.lost_answers:
+            self.lost_answers -= 1
+            raise ccxt.RequestTimeout("simulated: answer lost")
+        return order
+
+    def fetch_order(self, order_id, symbol=None, params=None):
+        if self.lookup_failures:
+            self.lookup_failures -= 1
+            raise ccxt.NetworkError("simulated: lookup failed")
+        return super().fetch_order(order_id, symbol, params)
+
+
+@pytest.fixture
+def make_executor():
+    clients = []
+
+    def make(**exchange_kwargs):
+        exchange = FlakyExchange(to_rows(synthetic_ohlcv(100)), **exchange_kwargs)
+        client = BinanceClient(exchange=exchange)
+        clients.append(client)
+        executor = OrderExecutor(client, max_retries=MAX_RETRIES, asynchronous=False, wait=lambda seconds: None)
+        return executor, exchange
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def buy(executor, exchange):
+    order = executor.submit('BTC/USDT', 'buy', exchange.price(), usd_amount=100.0)
+    finished = executor.poll()
+    assert finished == [order]
+    return order
+
+
+def test_clean_fill(make_executor):
+    executor, exchange = make_executor()
+    order = buy(executor, exchange)
+    assert order.status == 'filled'
+    assert order.filled == pytest.approx(order.quantity)
+    assert len(exchange.orders) == 1
+
+
+def test_timeout_after_acceptance_is_found_not_resent(make_executor):
+    executor, exchange = make_executor(lost_answers=1)
+    order = buy(executor, exchange)
+    assert order.status == 'filled'
+    assert exchange.create_calls == 1
+    assert len(exchange.orders) == 1
+    assert next(iter(exchange.orders.values()))['clientOrderId'] == order.client_id
+
+
+def test_lost_request_is_resent_under_the_same_id(make_executor):
+    executor, exchange = make_executor(lost_requests=2)
+    order = buy(executor, exchange)
+    assert order.status == 'filled'
+    assert order.attempts == 3
+    assert [o['clientOrderId'] for o in exchange.orders.values()] == [order.client_id]
+
+
+def test_retries_used_up_is_failed(make_executor):
+    executor, exchange = make_executor(lost_requests=10)
+    order = buy(executor, exchange)
+    assert order.status == 'failed'
+    assert exchange.create_calls == executor.max_retries + 1
+    assert not exchange.orders
+
+
+def test_failing_lookups_end_unknown_without_resend(make_executor):
+    executor, exchange = make_executor(lost_answers=1, lookup_failures=100)
+    order = buy(executor, exchange)
+    assert order.status == 'unknown'
+    assert not order.done
+    assert exchange.create_calls == 1
+    assert len(exchange.orders) == 1
+
+
+def test_recheck_settles_unknown_order(make_executor):
+    executor, exchange = make_executor(lost_answers=1, lookup_failures=LOOKUPS)
+    order = buy(executor, exchange)
+    assert order.status == 'unknown'
+
+    # Still unreachable: stays unknown, nothing is sent
+    exchange.lookup_failures = LOOKUPS
+    executor.recheck(order)
+    assert executor.poll() == [order]
+    assert order.status == 'unknown'
+
+    executor.recheck(order)
+    assert executor.poll() == [order]
+    assert order.status == 'filled'
+    assert order.filled == pytest.approx(order.quantity)
+    assert exchange.create_calls == 1
+
+
+def test_recheck_of_an_order_never_received_fails(make_executor):
+    executor, exchange = make_executor(lost_requests=1, lookup_failures=LOOKUPS)
+    order = buy(executor, exchange)
+    assert order.status == 'unknown'
+    executor.recheck(order)
+    executor.poll()
+    assert order.status == 'failed'
+    assert not exchange.orders
+
+
+def test_partial_fill(make_executor):
+    executor, exchange = make_executor(partial_fill_prob=1.0, min_fill_ratio=0.5)
+    order = buy(executor, exchange)
+    assert order.status == 'partial'
+    assert 0 < order.filled < order.quantity
+
+
+def test_below_minimum_is_rejected_unsent(make_executor):
+    executor, exchange = make_executor()
+    order = executor.submit('BTC/USDT', 'buy', exchange.price(), usd_amount=1.0)
+    executor.poll()
+    assert order.status == 'rejected'
+    assert exchange.create_calls == 0
+
+
+def test_above_maximum_is_capped_and_partial(make_executor):
+    executor, exchange = make_executor()
+    exchange.market['limits']['amount']['max'] = 0.002
+    executor.client_manager.markets.refresh()
+    order = buy(executor, exchange)
+    assert order.status == 'partial'
+    assert order.quantity == order.filled == 0.002
+    assert order.requested > 0.002
+    assert "above maximum" in order.error
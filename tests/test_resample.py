@@ -0,0 +1,62 @@
+import pytest
+
+from benchmarks.fakes import synthetic_ohlcv, to_rows
+from logic.backtest import resample_ohlcv
+from logic.indicators import DEVIATION_TOLERANCE, IndicatorEngine, IndicatorState
+from logic.resample import CandleAggregator, Resampler, bucket_start
+
+# 1m candles on whole minutes (the fakes' fixed epoch is 20 s past one), a little over two weeks
+COLUMNS = synthetic_ohlcv(22_000)
+COLUMNS['timestamp'] = COLUMNS['timestamp'] - COLUMNS['timestamp'][0] % 60_000
+
+
+def forming(row):
+    """The pushes a stream sends for one candle: two revisions, then the final candle."""
+    ts, open_, high, low, close, volume = row
+    return [[ts, open_, max(open_, close), min(open_, close), (open_ + close) / 2, volume / 3],
+            [ts, open_, high, min(open_, close), close, volume / 2],
+            row]
+
+
+@pytest.mark.parametrize('timeframe', ['5m', '15m', '1h', '4h', '1d', '1w'])
+def test_aggregator_matches_vectorized_resample(timeframe):
+    expected = to_rows(resample_ohlcv(COLUMNS, timeframe))
+    aggregator = CandleAggregator(timeframe)
+    buckets = {}
+    for row in to_rows(COLUMNS):
+        for push in forming(row):
+            bar = aggregator.update(push)
+            buckets[bar[0]] = bar
+
+    assert list(buckets) == [bar[0] for bar in expected]
+    for got, want in zip(buckets.values(), expected):
+        assert got[:5] == want[:5]
+        assert got[5] == pytest.approx(want[5])
+
+
+def test_weekly_buckets_open_on_monday():
+    monday = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+    week = 7 * 86_400_000
+    assert bucket_start(monday + 3 * 86_400_000, week, 4 * 86_400_000) == monday
+    assert to_rows(resample_ohlcv({'timestamp': [monday - 60_000, monday], 'open': [1, 2], 'high': [1, 2],
+                                   'low': [1, 2], 'close': [1, 2], 'volume': [1, 1]}, '1w'))[1][0] == monday
+
+
+def test_resampler_indicators_match_exchange_candles():
+    rows = to_rows(COLUMNS)
+    engine = IndicatorEngine()
+    resampler = Resampler(engine, 'BTC/USDT', ['15m', '1h'])
+    split = 15_000
+    for timeframe in resampler.timeframes:
+        # Exchange history up to the split (last one still forming), then the 1m stream takes over
+        resampler.seed(timeframe, to_rows(resample_ohlcv({k: v[:split] for k, v in COLUMNS.items()}, timeframe)))
+    since = resampler.base_since()
+    resampler.feed([row for row in rows[:split] if row[0] >= since])
+    for row in rows[split:]:
+        for push in forming(row):
+            changed = resampler.update(push)
+
+    for timeframe, values in changed.items():
+        reference = IndicatorState().feed(to_rows(resample_ohlcv(COLUMNS, timeframe)))
+        for column in ('ema9', 'ema50', 'ema200', 'rsi', 'vol_avg'):
+            assert values[column] == pytest.approx(reference[column], abs=DEVIATION_TOLERANCE), (timeframe, column)
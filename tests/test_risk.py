@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from core.risk import StopBook
+from logic.strategy import TrailingPosition
+
+
+def reference_exit(entry_price, sl, tp, prices):
+    """(activation tick, exit tick, exit reason) the way run_bot drives a TrailingPosition."""
+    position = TrailingPosition(entry_price, sl, tp)
+    activated_at = None
+    for tick, price in enumerate(prices):
+        position.update(price)
+        if position.check_activation():
+            activated_at = tick
+        if position.hit_stop():
+            return activated_at, tick, position.exit_reason
+    return activated_at, None, None
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_stop_book_matches_trailing_position(seed):
+    rng = random.Random(seed)
+    price = 100.0
+    prices = []
+    for _ in range(3000):
+        price *= 1 + rng.gauss(0, 0.004)
+        prices.append(price)
+
+    book = StopBook()
+    expected = {}
+    opened = {}
+    for tick, price in enumerate(prices):
+        activated, exits = book.on_price('BTC/USDT', price)
+        for position in activated:
+            opened[position.pid][0] = tick
+        for position in exits:
+            opened[position.pid][1:] = [tick, position.exit_reason]
+
+        if tick < 2000 and rng.random() < 0.1:
+            sl, tp = rng.choice([0.5, 1.0, 1.5, 3.0]), rng.choice([0.5, 2.0, 3.0])
+            position = book.add_trailing('BTC/USDT', price, sl, tp)
+            # Entered at this tick's price: both models start watching on the next one
+            activated_at, exit_at, reason = reference_exit(price, sl, tp, prices[tick + 1:])
+            expected[position.pid] = (None if activated_at is None else activated_at + tick + 1,
+                                      None if exit_at is None else exit_at + tick + 1, reason)
+            opened[position.pid] = [None, None, None]
+
+    assert len(expected) > 100
+    assert {pid: tuple(result) for pid, result in opened.items()} == expected
+
+
+def test_peak_survives_restore():
+    book = StopBook()
+    position = book.add_trailing('ETH/USDT', 100.0, 2.0, 3.0)
+    for price in (101.0, 104.0, 103.0):
+        book.on_price('ETH/USDT', price)
+    book.refresh(position)
+    assert position.max_price == 104.0
+    assert position.trailing_activated
+
+    # Re-added from a journal with its peak and activation: the stop stays 2 % under 104
+    book.remove(position.pid)
+    restored = book.add_trailing('ETH/USDT', 100.0, 2.0, 3.0, max_price=104.0, trailing_activated=True)
+    assert book.on_price('ETH/USDT', 102.0) == ([], [])
+    _, exits = book.on_price('ETH/USDT', 101.9)
+    assert exits == [restored] and restored.exit_reason == "TRAILING STOP"
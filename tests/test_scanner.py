@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from core.markets import MarketCache
+from core.scanner import MarketScanner, WeightBudget, kline_weight
+
+
+class FakeAsyncExchange:
+    """ccxt async stand-in: scripted candles per symbol, every response carries a used-weight header."""
+
+    def __init__(self, candles, used_weight=None):
+        self.candles = candles
+        self.used_weight = used_weight
+        self.calls = []
+
+    def on_rest_response(self, status, reason, url, method, headers, body, *args):
+        return body
+
+    async def fetch_ohlcv(self, symbol, timeframe=None, since=None, limit=None):
+        self.calls.append(symbol)
+        await asyncio.sleep(0)
+        bars = self.candles[symbol]
+        if isinstance(bars, Exception):
+            raise bars
+        headers = {'x-mbx-used-weight-1m': str(self.used_weight)} if self.used_weight is not None else {}
+        self.on_rest_response(200, 'OK', 'klines', 'GET', headers, '[]')
+        return bars.pop(0) if len(bars) > 1 else bars[0]
+
+
+def scanner_over(exchange, symbols, **kwargs):
+    scanner = MarketScanner(symbols, interval=0.0, **kwargs)
+    scanner.exchange = exchange
+    scanner._watch_weight()
+    scanner.budget = WeightBudget(scanner.weight_per_minute)
+    scanner.markets = MarketCache(exchange)
+    return scanner
+
+
+async def scan_for(scanner, seconds):
+    scanner._semaphore = asyncio.Semaphore(scanner.max_concurrency)
+
+    async def stop_later():
+        await asyncio.sleep(seconds)
+        scanner.stop()
+
+    await asyncio.gather(stop_later(), *(scanner._scan_symbol(symbol) for symbol in scanner.symbols))
+
+
+def test_kline_weight_table():
+    assert [kline_weight(limit) for limit in (None, 1, 99, 100, 499, 500, 1000)] == [10, 1, 1, 2, 2, 5, 10]
+
+
+def test_budget_spends_then_waits_for_refill(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('core.scanner.time.monotonic', lambda: now[0])
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr('core.scanner.asyncio.sleep', fake_sleep)
+    budget = WeightBudget(60)  # 1 weight per second
+
+    async def spend():
+        await budget.acquire(50)
+        await budget.acquire(10)
+        await budget.acquire(5)
+
+    asyncio.run(spend())
+    assert slept == [pytest.approx(5.0)]
+    assert budget.waited == pytest.approx(5.0)
+    assert budget.tokens == pytest.approx(0.0)
+
+
+def test_budget_follows_exchange_used_weight(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('core.scanner.time.monotonic', lambda: now[0])
+    budget = WeightBudget(1200)
+    budget.sync_used('900')
+    assert budget.tokens == pytest.approx(300.0)
+    # The exchange reporting less than we assumed never hands out extra tokens
+    budget.sync_used(0)
+    assert budget.tokens == pytest.approx(300.0)
+    now[0] += 6.0
+    budget._refill()
+    assert budget.tokens == pytest.approx(420.0)
+
+
+def test_weight_synced_from_each_response():
+    bars = [[0, 1.0, 1.0, 1.0, 1.0, 1.0]]
+    scanner = scanner_over(FakeAsyncExchange({'BTC/USDT': [bars]}, used_weight=1100), ['BTC/USDT'])
+    asyncio.run(scan_for(scanner, 0.05))
+    assert scanner.budget.tokens <= 1200 - 1100 + 5
+
+
+def test_one_symbol_error_does_not_stop_the_others(capsys):
+    bars = [[0, 1.0, 1.0, 1.0, 1.0, 1.0]]
+    exchange = FakeAsyncExchange({'BTC/USDT': KeyError('boom'), 'ETH/USDT': [bars]})
+    scanner = scanner_over(exchange, ['BTC/USDT', 'ETH/USDT'])
+    asyncio.run(scan_for(scanner, 0.05))
+
+    assert scanner.status['BTC/USDT']['state'] == 'ERROR'
+    assert scanner.status['ETH/USDT']['state'] == 'WAITING'
+    assert exchange.calls.count('ETH/USDT') > 1
+    assert capsys.readouterr().out.count("SCAN ERROR") == 1
@@ -0,0 +1,80 @@
+import random
+
+import ccxt
+import pytest
+
+from core.scheduler import PollScheduler
+
+MINUTE = 60_000
+HOUR = 60 * MINUTE
+START = 1_704_067_200_000  # 2024-01-01 00:00 UTC, a candle boundary on every timeframe
+
+
+class Clock:
+    """Injected server clock (ms) plus a used-weight reading."""
+
+    def __init__(self, now=START, used=None):
+        self.now = now
+        self.used = used
+
+    def scheduler(self, timeframe_ms, **kwargs):
+        return PollScheduler(timeframe_ms, server_time=lambda: self.now, used_weight=lambda: self.used,
+                             rng=random.Random(1), **kwargs)
+
+
+def test_default_cadence_follows_the_timeframe():
+    clock = Clock()
+    assert clock.scheduler(MINUTE).forming_interval == 1.0
+    assert clock.scheduler(HOUR).forming_interval == 60.0
+
+
+@pytest.mark.parametrize('offset_s, expected', [
+    (0.0, 60.0),                # Just after the close: the full cadence
+    (3540.0, 60.0),             # 60 s before the close, the close poll and the cadence coincide
+    (3570.0, 30.25),            # 30 s before the close: wake just after it
+    (3599.9, 0.35),
+])
+def test_next_wake_lands_just_after_the_candle_close(offset_s, expected):
+    clock = Clock(START + int(offset_s * 1000))
+    scheduler = clock.scheduler(HOUR)
+    assert scheduler.next_delay() == pytest.approx(expected)
+    assert scheduler.until_close() == pytest.approx(3600.0 - offset_s)
+
+
+def test_open_position_polls_faster_but_still_at_the_close():
+    clock = Clock(START + 10 * 1000)
+    scheduler = clock.scheduler(HOUR, active_interval=2.0)
+    assert scheduler.next_delay(active=True) == 2.0
+    clock.now = START + HOUR - 500
+    assert scheduler.next_delay(active=True) == pytest.approx(0.75)
+
+
+def test_backoff_doubles_up_to_the_cap_and_resets():
+    clock = Clock(START + 1000)
+    scheduler = clock.scheduler(HOUR, base_backoff=1.0, max_backoff=8.0)
+    ceilings = [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+    for ceiling in ceilings:
+        # Jittered within the upper half of the current ceiling
+        assert ceiling / 2 <= scheduler.failure(ccxt.NetworkError("down")) <= ceiling
+    assert scheduler.failures == len(ceilings)
+
+    scheduler.next_delay()
+    assert scheduler.failures == 0
+    assert scheduler.failure() <= 1.0
+
+
+def test_rate_limit_waits_for_the_weight_window():
+    clock = Clock(START + 45_000)
+    scheduler = clock.scheduler(MINUTE)
+    # 15 s left in the weight minute, plus up to 1 s of jitter
+    assert 15.0 <= scheduler.failure(ccxt.RateLimitExceeded("429")) <= 16.0
+
+
+def test_weight_pressure_stretches_then_pauses():
+    clock = Clock(START + 1000, used=600)
+    scheduler = clock.scheduler(HOUR)
+    assert scheduler.next_delay() == pytest.approx(60.0)
+    clock.used = 900  # Half way from pressure_from to the limit: 2x slower
+    assert scheduler.next_delay() == pytest.approx(120.0)
+    clock.used = 1100  # Above pause_from: not before the next weight minute
+    assert 59.0 <= clock.scheduler(MINUTE).next_delay() <= 60.0
@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+
+from benchmarks.fakes import FakeExchange, synthetic_ohlcv, to_rows
+from core.exchange import BinanceClient
+from core.store import OHLCVStore
+
+ROWS = to_rows(synthetic_ohlcv(1200))
+
+
+class RecordingExchange(FakeExchange):
+    """FakeExchange that remembers the `since=` of every candle request."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.since = []
+
+    def fetch_ohlcv(self, symbol, timeframe='1m', since=None, limit=None):
+        self.since.append(since)
+        return super().fetch_ohlcv(symbol, timeframe, since, limit)
+
+
+def test_append_then_reopen(tmp_path):
+    store = OHLCVStore(root=str(tmp_path))
+    assert store.append('BTC/USDT', '1m', ROWS[:300]) == 300
+    # Overlapping and duplicated rows only add what is new
+    assert store.append('BTC/USDT', '1m', ROWS[250:400] + ROWS[399:400]) == 100
+
+    reopened = OHLCVStore(root=str(tmp_path))
+    assert reopened.count('BTC/USDT', '1m') == 400
+    assert reopened.last_timestamp('BTC/USDT', '1m') == ROWS[399][0]
+    assert reopened.rows('BTC/USDT', '1m', 50) == ROWS[350:400]
+    tail = reopened.tail('BTC/USDT', '1m', 10)
+    assert isinstance(tail['close'], np.memmap)
+    assert tail['timestamp'].tolist() == [row[0] for row in ROWS[390:400]]
+    window = reopened.read('BTC/USDT', '1m', start=ROWS[100][0], end=ROWS[110][0])
+    assert window['open'].tolist() == [row[1] for row in ROWS[100:110]]
+
+
+def test_repair_cuts_a_torn_append_back_to_whole_rows(tmp_path):
+    store = OHLCVStore(root=str(tmp_path))
+    store.append('BTC/USDT', '1m', ROWS[:200])
+    store.append('BTC/USDT', '1m', ROWS[200:260])
+
+    # Crash during the second append: every value column made it, the timestamp column only partly
+    path = store._path('BTC/USDT', '1m', 'timestamp')
+    with open(path, 'r+b') as f:
+        f.truncate(230 * 8 + 3)
+
+    reopened = OHLCVStore(root=str(tmp_path))
+    assert reopened.count('BTC/USDT', '1m') == 230
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        assert os.path.getsize(reopened._path('BTC/USDT', '1m', column)) == 230 * 8
+    assert reopened.rows('BTC/USDT', '1m', 230) == ROWS[:230]
+    # Appending carries on from the last consistent row
+    assert reopened.append('BTC/USDT', '1m', ROWS[:300]) == 70
+    assert reopened.rows('BTC/USDT', '1m', 300) == ROWS[:300]
+
+
+def test_sync_history_fetches_only_missing_closed_bars(tmp_path):
+    store = OHLCVStore(root=str(tmp_path))
+    store.append('BTC/USDT', '1m', ROWS[:900])
+    exchange = RecordingExchange(ROWS, reveal=1000)
+    client = BinanceClient(exchange=exchange)
+    try:
+        # The fetch reveals one more candle; everything up to it has closed by the fake's clock
+        assert client.sync_history(store, 'BTC/USDT', '1m') == 101
+        assert exchange.since == [ROWS[900][0]]
+        assert store.rows('BTC/USDT', '1m', 1001) == ROWS[:1001]
+
+        assert client.sync_history(store, 'BTC/USDT', '1m') == 1
+        assert exchange.since[-1] == ROWS[1001][0]
+        assert store.count('BTC/USDT', '1m') == 1002
+    finally:
+        client.close()
+
+
+def test_sync_history_skips_the_forming_candle(tmp_path):
+    store = OHLCVStore(root=str(tmp_path))
+    exchange = FakeExchange(ROWS, reveal=500)
+    exchange.milliseconds = lambda: ROWS[exchange.visible - 1][0] + 30_000
+    client = BinanceClient(exchange=exchange)
+    try:
+        assert client.sync_history(store, 'BTC/USDT', '1m', since=ROWS[0][0]) == 500
+        assert store.last_timestamp('BTC/USDT', '1m') == ROWS[499][0]
+    finally:
+        client.close()
@@ -0,0 +1,60 @@
+import time
+
+from core.stream import MarketStream, ReplayTransport, StreamEvent
+
+MINUTE = 60_000
+BARS = [[i * MINUTE, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 1.0] for i in range(2600)]
+
+
+class FakeRest:
+    """get_ohlcv over BARS: up to 1000 rows per call (500 without a limit), like Binance klines."""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.calls = []
+
+    def get_ohlcv(self, symbol, timeframe, limit=100, since=None):
+        self.calls.append((since, limit))
+        # Before the disconnect only the first candle exists; after it, all of them
+        visible = BARS[:1] if self.transport.connects <= 1 else BARS
+        rows = [bar for bar in visible if since is None or bar[0] >= since]
+        return [list(bar) for bar in rows[:min(limit or 500, 1000)]]
+
+
+def kline(bar):
+    return StreamEvent('kline', 'BTC/USDT', '1m', list(bar))
+
+
+def run_until(stream, done, timeout=5.0):
+    stream.start()
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stream.stop()
+
+
+def test_reconnect_backfills_a_gap_longer_than_one_page():
+    # Live candle 0, the socket drops, and the next push is 2599 candles later
+    transport = ReplayTransport([kline(BARS[0]), None, kline(BARS[-1])])
+    rest = FakeRest(transport)
+    stream = MarketStream(transport, rest_client=rest, reconnect_delay=0.01)
+    stream.subscribe_klines('BTC/USDT', '1m', since=0)
+    seen = set()
+    stream.add_listener(lambda event: seen.add(event.data[0]))
+
+    run_until(stream, lambda: len(seen) == len(BARS))
+
+    assert transport.connects == 2
+    assert seen == {bar[0] for bar in BARS}
+    assert len(rest.calls) > 3  # The outage needed several pages
+    assert stream.last_kline_ts[('BTC/USDT', '1m')] == BARS[-1][0]
+    assert stream.failures == 0
+
+
+def test_failures_count_connections_that_deliver_nothing():
+    transport = ReplayTransport([None, None, None])
+    stream = MarketStream(transport, reconnect_delay=0.01, max_reconnect_delay=0.01)
+    run_until(stream, lambda: stream.failures >= 3)
+    assert stream.failures == 3
+    assert not stream.alive
+    assert stream.last_event is None
@@ -0,0 +1,27 @@
+import pytest
+
+from benchmarks.fakes import synthetic_ohlcv
+from logic.backtest import run_backtest
+from logic.sweep import grid, load_results, run_sweep
+
+DATA = synthetic_ohlcv(5000, seed=7)
+CONFIGS = grid(rsi_threshold=[35.0, 45.0], sl=[0.5, 1.5], tp=[1.0, 3.0], ema_span=[9, 21])
+
+
+def test_sweep_rows_match_direct_backtests(tmp_path, capsys):
+    path = tmp_path / 'sweep.jsonl'
+    assert run_sweep(DATA, CONFIGS, str(path), workers=2) == len(CONFIGS)
+    # 16 configs over 2 workers: 4 batches each, of 2 configs
+    assert "8/8 batches" in capsys.readouterr().out
+
+    results = load_results(str(path))
+    assert len(results) == len(CONFIGS)
+    traded = 0
+    for config in CONFIGS:
+        row = results[(results[list(config)] == list(config.values())).all(axis=1)]
+        assert len(row) == 1, config
+        stats = run_backtest(DATA, **config).stats
+        traded += stats['trades'] > 0
+        for key, value in stats.items():
+            assert row.iloc[0][key] == pytest.approx(value), (config, key)
+    assert traded  # The comparison covered actual trades